@@ -6,21 +6,26 @@ Provides workflow execution, state management, and integration patterns.
 """
 
 from .runner import WorkflowRunner
+from .async_runner import AsyncWorkflowRunner
 from .state import WorkflowState
 from .rules import WorkflowRule, RuleRegistry
+from .rule_watcher import RuleWatcher
 from .validation import FileValidator
-from .exceptions import WorkflowError, ValidationError, StateError
+from .exceptions import WorkflowError, ValidationError, StateError, LeaseLostError
 
 __version__ = "1.0.0"
 __author__ = "DOX Infrastructure Team"
 
 __all__ = [
     "WorkflowRunner",
+    "AsyncWorkflowRunner",
     "WorkflowState",
     "WorkflowRule",
     "RuleRegistry",
+    "RuleWatcher",
     "FileValidator",
     "WorkflowError",
     "ValidationError",
-    "StateError"
+    "StateError",
+    "LeaseLostError"
 ]
\ No newline at end of file
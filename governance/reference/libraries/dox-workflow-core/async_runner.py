@@ -0,0 +1,256 @@
+"""
+Asyncio workflow execution engine.
+
+Runs workflows on a background event loop so API_CALL steps wait on a shared
+async HTTP client instead of blocking the calling thread.
+"""
+
+import asyncio
+import threading
+from typing import Dict, Any, Optional, Set
+from datetime import datetime
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+from .runner import WorkflowRunner
+from .retry import RetryPolicy
+from .rules import WorkflowRule, WorkflowStep, ActionType
+from .exceptions import IntegrationError, ConfigurationError
+
+
+class AsyncWorkflowRunner(WorkflowRunner):
+    """Workflow runner that keeps many workflows in flight on one event loop."""
+
+    def __init__(self, service_name: str, memory_bank_path: str = None,
+                 max_connections: int = 1000, max_keepalive_connections: int = 100,
+                 max_parallel_branches: int = 32, checkpoint_store: Any = None,
+                 retry_policy: Optional[RetryPolicy] = None):
+        """Initialize async workflow runner."""
+        if not HTTPX_AVAILABLE:
+            raise ConfigurationError("AsyncWorkflowRunner requires httpx. Install with: pip install httpx")
+
+        super().__init__(service_name, memory_bank_path, max_parallel_branches,
+                         checkpoint_store=checkpoint_store, retry_policy=retry_policy)
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+        self._http_client = None
+        # The loop only holds weak references to tasks; keep pending retries alive
+        self._retry_tasks: Set[asyncio.Task] = set()
+
+    def start_workflow(self, rule_name: str, context: Dict[str, Any],
+                      workflow_id: Optional[str] = None) -> str:
+        """Start a workflow and return immediately; steps run on the event loop."""
+        workflow_id, rule = self._prepare_workflow(rule_name, context, workflow_id)
+
+        future = asyncio.run_coroutine_threadsafe(
+            self._run_steps_async(workflow_id, rule, rule.compile().entry),
+            self._ensure_loop()
+        )
+        future.add_done_callback(lambda f: self._report_background_error(workflow_id, f))
+
+        return workflow_id
+
+    async def run_workflow(self, rule_name: str, context: Dict[str, Any],
+                           workflow_id: Optional[str] = None) -> str:
+        """Start a workflow from a coroutine and wait for it to stop."""
+        workflow_id, rule = await self._run_blocking(self._prepare_workflow, rule_name, context, workflow_id)
+        await self._run_steps_async(workflow_id, rule, rule.compile().entry)
+        return workflow_id
+
+    def _resume_workflow(self, workflow_id: str, rule: WorkflowRule,
+                         next_step: Optional[WorkflowStep]) -> None:
+        """Continue a restored workflow on the event loop."""
+        future = asyncio.run_coroutine_threadsafe(
+            self._run_steps_async(workflow_id, rule, next_step),
+            self._ensure_loop()
+        )
+        future.add_done_callback(lambda f: self._report_background_error(workflow_id, f))
+
+    def _schedule_retry(self, delay: float, workflow_id: str, rule: WorkflowRule, step: WorkflowStep) -> None:
+        """Re-run the failed step from an event loop timer after the backoff delay."""
+        loop = self._ensure_loop()
+        loop.call_soon_threadsafe(
+            loop.call_later, delay, self._start_retry_task, workflow_id, rule, step
+        )
+
+    def _start_retry_task(self, workflow_id: str, rule: WorkflowRule, step: WorkflowStep) -> None:
+        """Start a due retry as a task tracked until it finishes; runs on the loop."""
+        task = asyncio.ensure_future(self._retry_step_async(workflow_id, rule, step))
+        self._retry_tasks.add(task)
+
+        def on_done(finished: asyncio.Task) -> None:
+            self._retry_tasks.discard(finished)
+            self._report_background_error(workflow_id, finished)
+
+        task.add_done_callback(on_done)
+
+    async def _retry_step_async(self, workflow_id: str, rule: WorkflowRule, step: WorkflowStep) -> None:
+        """Re-run a failed step and continue the workflow from it on the loop."""
+        if self._resume_retry(workflow_id) and await self._save_checkpoint_async(workflow_id, step):
+            await self._run_steps_async(workflow_id, rule, step)
+
+    async def _run_steps_async(self, workflow_id: str, rule: WorkflowRule,
+                               next_step: Optional[WorkflowStep]) -> None:
+        """Iteratively dispatch steps, awaiting I/O-bound steps."""
+        workflow_info = self.active_workflows[workflow_id]
+        graph = rule.compile()
+
+        while next_step is not None:
+            try:
+                workflow_info["current_step"] = next_step.name
+                result = await self._execute_step_async(workflow_id, next_step, workflow_info["context"])
+                workflow_info["step_results"][next_step.name] = result
+
+            except Exception as e:
+                next_step = await self._handle_step_failure_async(workflow_id, rule, next_step, e)
+                if next_step is None:
+                    return
+                continue
+
+            next_step = graph.on_success[next_step.name]
+            if not await self._save_checkpoint_async(workflow_id, next_step):
+                return
+
+        await self._complete_workflow_async(workflow_id, rule)
+
+    async def _run_blocking(self, fn, *args):
+        """Call something that checkpoints; checkpoint writes block, so run it off the loop."""
+        if self.checkpoint_store is None:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    async def _save_checkpoint_async(self, workflow_id: str, next_step: Optional[WorkflowStep]) -> bool:
+        """Checkpoint without blocking the loop; False if the workflow was taken over."""
+        return await self._run_blocking(self._save_checkpoint, workflow_id, next_step)
+
+    async def _handle_step_failure_async(self, workflow_id: str, rule: WorkflowRule,
+                                         step: WorkflowStep, error: Exception) -> Optional[WorkflowStep]:
+        """Handle a step failure, whose retry or final checkpoint runs off the loop."""
+        return await self._run_blocking(self._handle_step_failure, workflow_id, rule, step, error)
+
+    async def _complete_workflow_async(self, workflow_id: str, rule: WorkflowRule) -> None:
+        """Complete a workflow, writing its final checkpoint off the loop."""
+        await self._run_blocking(self._complete_workflow, workflow_id, rule)
+
+    async def _execute_step_async(self, workflow_id: str, step: WorkflowStep,
+                                  context: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a single workflow step without blocking the loop on HTTP."""
+        if step.action == ActionType.PARALLEL:
+            handler = self._execute_parallel_async(workflow_id, step, context)
+        elif step.action == ActionType.API_CALL:
+            handler = self._execute_api_call_async(step, context)
+        else:
+            # Non-I/O actions are cheap and run inline
+            return self._execute_step(workflow_id, step, context)
+
+        step_start_time = datetime.utcnow()
+
+        try:
+            result = await handler
+
+            step_duration = (datetime.utcnow() - step_start_time).total_seconds()
+            self._log_step_execution(workflow_id, step, "success", step_duration, result)
+
+            return result
+
+        except Exception as e:
+            step_duration = (datetime.utcnow() - step_start_time).total_seconds()
+            self._log_step_execution(workflow_id, step, "failed", step_duration, {"error": str(e)})
+            raise
+
+    async def _execute_parallel_async(self, workflow_id: str, step: WorkflowStep,
+                                      context: Dict[str, Any]) -> Dict[str, Any]:
+        """Run parallel step branches as concurrent tasks and join their results."""
+        pending = {
+            asyncio.ensure_future(self._execute_step_async(workflow_id, branch, context)): branch
+            for branch in step.branches
+        }
+        succeeded: Dict[str, Dict[str, Any]] = {}
+        failed: Dict[str, str] = {}
+
+        while pending and step.join_outcome(len(succeeded), len(failed)) is None:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                branch = pending.pop(task)
+                try:
+                    succeeded[branch.name] = task.result()
+                except Exception as e:
+                    failed[branch.name] = str(e)
+
+        for task in pending:
+            task.cancel()
+
+        return self._join_branches(workflow_id, step, succeeded, failed,
+                                   [branch.name for branch in pending.values()])
+
+    async def _execute_api_call_async(self, step: WorkflowStep, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute API call step through the shared async HTTP client."""
+        api_request = self._build_api_request(step, context)
+        service = api_request.pop("service")
+
+        try:
+            response = await self._get_http_client().request(**api_request)
+
+            response.raise_for_status()
+            return response.json()
+
+        except httpx.HTTPError as e:
+            raise IntegrationError(
+                f"API call failed: {e}",
+                service_name=service,
+                http_status=e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+            )
+
+    def _get_http_client(self) -> "httpx.AsyncClient":
+        """Get the HTTP client shared by all workflows on the loop."""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections
+                )
+            )
+        return self._http_client
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background event loop on first use."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name=f"{self.service_name}-workflow-loop",
+                    daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
+
+    def _report_background_error(self, workflow_id: str, future) -> None:
+        """Log errors that escaped step failure handling."""
+        if not future.cancelled() and future.exception():
+            print(f"Workflow {workflow_id} aborted: {future.exception()}")
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Close the HTTP client and stop the background loop."""
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+
+        if loop is None:
+            return
+
+        if self._http_client is not None:
+            asyncio.run_coroutine_threadsafe(self._http_client.aclose(), loop).result(timeout)
+            self._http_client = None
+        # The loop only holds weak references to tasks; keep pending retries alive
+        self._retry_tasks: Set[asyncio.Task] = set()
+
+        loop.call_soon_threadsafe(loop.stop)
+        self._loop_thread.join(timeout)
+        loop.close()
@@ -0,0 +1,87 @@
+"""
+Precompiled workflow rule bundles.
+
+Caches parsed, validated and compiled rules in a pickle keyed by each YAML
+file's content hash, so a cold start only re-parses files that changed.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+# Bump when the bundle layout changes; rule class changes are caught by the code fingerprint
+BUNDLE_FORMAT_VERSION = 1
+
+# Modules whose classes are pickled into the bundle
+_PICKLED_MODULES = ("rules.py", "templates.py")
+
+
+def content_hash(data: bytes) -> str:
+    """Hash rule file contents for bundle lookups."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _code_fingerprint() -> str:
+    """Hash the source of the pickled rule classes so stale layouts are rejected."""
+    digest = hashlib.sha256()
+    package_dir = Path(__file__).parent
+    for module in _PICKLED_MODULES:
+        digest.update((package_dir / module).read_bytes())
+    return digest.hexdigest()
+
+
+class RuleBundle:
+    """Maps rule file names to (content hash, compiled rule) pairs."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.entries: Dict[str, Tuple[str, Any]] = {}
+        self.fingerprint = _code_fingerprint()
+
+    def load(self) -> int:
+        """Load entries from disk; a missing, stale or corrupt bundle loads empty."""
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return 0
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable rule bundle {self.path}: {e}")
+            return 0
+
+        if (not isinstance(data, dict)
+                or data.get("format") != BUNDLE_FORMAT_VERSION
+                or data.get("fingerprint") != self.fingerprint):
+            return 0
+
+        self.entries = data.get("entries", {})
+        return len(self.entries)
+
+    def get(self, file_name: str, file_hash: str) -> Optional[Any]:
+        """Get the compiled rule for a file if its contents are unchanged."""
+        entry = self.entries.get(file_name)
+        if entry and entry[0] == file_hash:
+            return entry[1]
+        return None
+
+    def save(self, entries: Dict[str, Tuple[str, Any]]) -> None:
+        """Atomically replace the bundle on disk."""
+        self.entries = entries
+        data = {
+            "format": BUNDLE_FORMAT_VERSION,
+            "fingerprint": self.fingerprint,
+            "entries": entries
+        }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
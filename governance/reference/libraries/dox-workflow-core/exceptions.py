@@ -52,6 +52,11 @@ class StateError(WorkflowError):
     pass
 
 
+class LeaseLostError(StateError):
+    """Exception raised when another instance has taken over a workflow's lease."""
+    pass
+
+
 class RuleError(WorkflowError):
     """Exception raised when workflow rule validation fails."""
     pass
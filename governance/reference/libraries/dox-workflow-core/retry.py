@@ -0,0 +1,94 @@
+"""
+Step retry policy and delayed-retry scheduling.
+
+Waiting retries sit in a priority queue ordered by due time; a single timer
+thread hands due retries to a small worker pool, so no thread is held while
+a retry waits out its backoff.
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with jitter: base_delay * factor ** (attempt - 1)."""
+    max_attempts: int = 3
+    base_delay_seconds: float = 0.1
+    factor: float = 3.0
+    max_delay_seconds: float = 30.0
+    jitter: float = 0.2
+
+    def delay_for(self, attempt: int) -> float:
+        """Backoff before retry number ``attempt`` (1-based), with +/- jitter."""
+        delay = min(self.base_delay_seconds * self.factor ** (attempt - 1), self.max_delay_seconds)
+        # Jitter spreads retries of workflows that failed together
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+class RetryScheduler:
+    """Runs callables after a delay from a heap-ordered timer queue."""
+
+    def __init__(self, max_workers: int = 8, name: str = "workflow-retry"):
+        self.name = name
+        self._heap: List[Tuple[float, int, Callable, tuple]] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def schedule(self, delay_seconds: float, fn: Callable, *args: Any) -> None:
+        """Run ``fn(*args)`` on a worker once ``delay_seconds`` have passed.
+
+        ``fn`` should return quickly; the few workers are shared by every
+        retry, so long-running work belongs on another executor.
+        """
+        due = time.monotonic() + delay_seconds
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("Retry scheduler is shut down")
+
+            heapq.heappush(self._heap, (due, next(self._counter), fn, args))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"{self.name}-timer", daemon=True)
+                self._thread.start()
+            # Wake the timer in case this retry is due before the current head
+            self._condition.notify()
+
+    def _run(self) -> None:
+        """Sleep until the earliest retry is due, then dispatch it."""
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+                    wait_seconds = self._heap[0][0] - time.monotonic()
+                    if wait_seconds <= 0:
+                        break
+                    self._condition.wait(wait_seconds)
+
+                if self._stopped:
+                    return
+                _, _, fn, args = heapq.heappop(self._heap)
+
+            self._executor.submit(fn, *args)
+
+    def pending_count(self) -> int:
+        """Number of retries waiting for their due time."""
+        return len(self._heap)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Drop waiting retries and stop the timer and workers."""
+        with self._condition:
+            self._stopped = True
+            self._heap.clear()
+            self._condition.notify()
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,75 @@
+"""
+Workflow rule hot reload.
+
+Polls a rules directory and swaps a freshly validated registry snapshot in
+whenever a YAML file is added, changed or removed.
+"""
+
+import os
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+from .rules import RuleRegistry
+
+
+class RuleWatcher:
+    """Background poller that hot-reloads rules into a RuleRegistry."""
+
+    def __init__(self, registry: RuleRegistry, directory: str,
+                 interval_seconds: float = 5.0, bundle_path: Optional[str] = None):
+        self.registry = registry
+        self.directory = directory
+        self.interval_seconds = interval_seconds
+        self.bundle_path = bundle_path
+        self._signature: Optional[Tuple] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Record the current file state and start polling."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._signature = self._directory_signature()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="rule-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop polling."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        """Check for changes every interval until stopped."""
+        while not self._stop_event.wait(self.interval_seconds):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"Warning: Rule reload failed: {e}")
+
+    def check(self) -> Optional[Dict[str, Any]]:
+        """Reload the registry if any rule file changed; returns the reload summary."""
+        signature = self._directory_signature()
+        if signature == self._signature:
+            return None
+
+        result = self.registry.reload_from_directory(self.directory, self.bundle_path)
+        self._signature = signature
+        print(f"Reloaded workflow rules (registry version {result['version']}): "
+              f"added={result['added']} updated={result['updated']} "
+              f"removed={result['removed']} failed={result['failed']}")
+        return result
+
+    def _directory_signature(self) -> Tuple:
+        """Cheap change detector: name, size and mtime of every YAML file."""
+        try:
+            with os.scandir(self.directory) as entries:
+                return tuple(sorted(
+                    (entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+                    for entry in entries if entry.name.endswith(".yaml") and entry.is_file()
+                ))
+        except FileNotFoundError:
+            return ()
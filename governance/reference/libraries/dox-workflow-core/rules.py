@@ -4,14 +4,24 @@ Workflow rule definitions and registry.
 Defines workflow rules structure and provides rule loading/management.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Mapping, Tuple, Set
 from dataclasses import dataclass, field
 from enum import Enum
+from types import MappingProxyType
+import threading
 import yaml
 import json
 from pathlib import Path
 
+# Prefer the LibYAML-backed loader; fall back to the pure-Python one
+try:
+    from yaml import CSafeLoader as YAMLLoader
+except ImportError:
+    from yaml import SafeLoader as YAMLLoader
+
+from .bundle import RuleBundle, content_hash
 from .exceptions import RuleError, ConfigurationError
+from .templates import compile_template
 
 
 class TriggerType(Enum):
@@ -35,6 +45,14 @@ class ActionType(Enum):
     CUSTOM_LOGIC = "custom_logic"
     CONDITIONAL_BRANCH = "conditional_branch"
     MANUAL_INTERVENTION = "manual_intervention"
+    PARALLEL = "parallel"
+
+
+class JoinPolicy(Enum):
+    """Join policies for parallel steps."""
+    ALL = "all"
+    ANY = "any"
+    QUORUM = "quorum"
 
 
 class ErrorHandlingType(Enum):
@@ -57,6 +75,72 @@ class WorkflowStep:
     error_message: Optional[str] = None
     timeout_seconds: int = 30
     retry_attempts: int = 0
+    branches: List["WorkflowStep"] = field(default_factory=list)
+    join_policy: JoinPolicy = JoinPolicy.ALL
+    quorum: Optional[int] = None
+    _compiled_params: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+
+    def compile_params(self) -> Dict[str, Any]:
+        """Compile (once) and return params with string values parsed into templates."""
+        if self._compiled_params is None:
+            self._compiled_params = compile_template(self.params)
+        return self._compiled_params
+
+    def required_successes(self) -> int:
+        """Number of successful branches needed to satisfy the join policy."""
+        if self.join_policy == JoinPolicy.ANY:
+            return 1
+        if self.join_policy == JoinPolicy.QUORUM:
+            return self.quorum or 0
+        return len(self.branches)
+
+    def join_outcome(self, succeeded: int, failed: int) -> Optional[bool]:
+        """Evaluate the join: True when satisfied, False when unreachable, None while pending."""
+        required = self.required_successes()
+        if succeeded >= required:
+            return True
+        if len(self.branches) - failed < required:
+            return False
+        return None
+
+    def iter_steps(self):
+        """Yield this step followed by all nested branch steps."""
+        yield self
+        for branch in self.branches:
+            yield from branch.iter_steps()
+
+
+@dataclass(frozen=True)
+class StepGraph:
+    """Compiled step graph with name index and precomputed transition edges."""
+    entry: WorkflowStep
+    steps: Dict[str, WorkflowStep]
+    on_success: Dict[str, Optional[WorkflowStep]]
+    on_failure: Dict[str, Optional[WorkflowStep]]
+
+    @classmethod
+    def from_steps(cls, steps: List[WorkflowStep]) -> "StepGraph":
+        """Build graph from an ordered list of steps."""
+        if not steps:
+            raise ConfigurationError("Cannot compile an empty step list")
+
+        # Branch steps are indexed for lookup but only top-level steps get edges
+        index = {nested.name: nested for step in steps for nested in step.iter_steps()}
+        # Parse param templates at load time rather than on every execution
+        for step in index.values():
+            step.compile_params()
+        return cls(
+            entry=steps[0],
+            steps=index,
+            on_success={step.name: index.get(step.on_success) if step.on_success else None
+                        for step in steps},
+            on_failure={step.name: index.get(step.on_failure) if step.on_failure else None
+                        for step in steps}
+        )
+
+    def get_step(self, name: str) -> Optional[WorkflowStep]:
+        """Get step by name in O(1)."""
+        return self.steps.get(name)
 
 
 @dataclass
@@ -87,6 +171,13 @@ class WorkflowRule:
     error_handling: Dict[str, ErrorHandlingType] = field(default_factory=dict)
     memory_bank_updates: List[Dict[str, Any]] = field(default_factory=list)
     configuration: Dict[str, Any] = field(default_factory=dict)
+    _step_graph: Optional[StepGraph] = field(default=None, init=False, repr=False, compare=False)
+
+    def compile(self) -> StepGraph:
+        """Compile (once) and return the step graph used for dispatch."""
+        if self._step_graph is None:
+            self._step_graph = StepGraph.from_steps(self.steps)
+        return self._step_graph
 
     def validate(self) -> None:
         """Validate workflow rule structure."""
@@ -102,82 +193,278 @@ class WorkflowRule:
         if not self.steps:
             raise ConfigurationError("Workflow must have at least one step")
 
-        # Validate step names are unique
-        step_names = [step.name for step in self.steps]
-        if len(step_names) != len(set(step_names)):
+        # Validate step names are unique, including parallel branches
+        all_step_names = [nested.name for step in self.steps for nested in step.iter_steps()]
+        if len(all_step_names) != len(set(all_step_names)):
             raise ConfigurationError("Step names must be unique within workflow")
 
+        for step in self.steps:
+            for nested in step.iter_steps():
+                self._validate_parallel_step(nested)
+
         # Validate on_success/on_failure references
-        step_names_set = set(step_names)
+        step_names_set = {step.name for step in self.steps}
         for step in self.steps:
             if step.on_success and step.on_success not in step_names_set:
                 raise ConfigurationError(f"Step '{step.name}' references unknown success step: {step.on_success}")
             if step.on_failure and step.on_failure not in step_names_set:
                 raise ConfigurationError(f"Step '{step.name}' references unknown failure step: {step.on_failure}")
 
+    def _validate_parallel_step(self, step: WorkflowStep) -> None:
+        """Validate branch and join configuration of a parallel step."""
+        if step.action != ActionType.PARALLEL:
+            if step.branches:
+                raise ConfigurationError(f"Step '{step.name}' declares branches but is not a parallel step")
+            return
+
+        if not step.branches:
+            raise ConfigurationError(f"Parallel step '{step.name}' must declare at least one branch")
+
+        for branch in step.branches:
+            # Nested joins would wait on the same bounded branch pool as their parent
+            if branch.action == ActionType.PARALLEL:
+                raise ConfigurationError(
+                    f"Branch '{branch.name}' of parallel step '{step.name}' cannot itself be a parallel step"
+                )
+            if branch.on_success or branch.on_failure:
+                raise ConfigurationError(
+                    f"Branch '{branch.name}' of parallel step '{step.name}' cannot declare on_success/on_failure"
+                )
+
+        if step.join_policy == JoinPolicy.QUORUM:
+            if not step.quorum or not 1 <= step.quorum <= len(step.branches):
+                raise ConfigurationError(
+                    f"Parallel step '{step.name}' quorum must be between 1 and {len(step.branches)}"
+                )
+
+
+@dataclass(frozen=True)
+class RegistrySnapshot:
+    """Immutable view of the registered rules; replaced wholesale on every change."""
+    version: int
+    rules: Mapping[str, WorkflowRule]
+    rules_by_service: Mapping[str, Tuple[str, ...]]
+    # Rule name -> (source file, content hash) for rules loaded from YAML
+    sources: Mapping[str, Tuple[str, str]]
+
+    @classmethod
+    def build(cls, version: int, rules: Dict[str, WorkflowRule],
+              sources: Dict[str, Tuple[str, str]]) -> "RegistrySnapshot":
+        """Build a read-only snapshot from plain dicts."""
+        by_service: Dict[str, List[str]] = {}
+        for name, rule in rules.items():
+            by_service.setdefault(rule.service, []).append(name)
+
+        return cls(
+            version=version,
+            rules=MappingProxyType(dict(rules)),
+            rules_by_service=MappingProxyType({service: tuple(names) for service, names in by_service.items()}),
+            sources=MappingProxyType(dict(sources))
+        )
+
 
 class RuleRegistry:
-    """Registry for managing workflow rules."""
+    """Registry for managing workflow rules.
+
+    Readers always see one consistent snapshot; writers build a new snapshot
+    and swap it in, so rules can be reloaded while workflows are running.
+    """
 
     def __init__(self):
-        self.rules: Dict[str, WorkflowRule] = {}
-        self.rules_by_service: Dict[str, List[str]] = {}
+        self._snapshot = RegistrySnapshot.build(0, {}, {})
+        self._write_lock = threading.Lock()
+
+    @property
+    def rules(self) -> Mapping[str, WorkflowRule]:
+        """Rules in the current snapshot, by name."""
+        return self._snapshot.rules
+
+    @property
+    def rules_by_service(self) -> Mapping[str, Tuple[str, ...]]:
+        """Rule names in the current snapshot, by service."""
+        return self._snapshot.rules_by_service
+
+    def snapshot(self) -> RegistrySnapshot:
+        """Get the current immutable registry snapshot."""
+        return self._snapshot
 
     def register_rule(self, rule: WorkflowRule) -> None:
         """Register a workflow rule."""
         rule.validate()
+        rule.compile()
 
-        if rule.name in self.rules:
-            raise RuleError(f"Rule '{rule.name}' already registered")
+        with self._write_lock:
+            snapshot = self._snapshot
+            if rule.name in snapshot.rules:
+                raise RuleError(f"Rule '{rule.name}' already registered")
 
-        self.rules[rule.name] = rule
+            self._swap({**snapshot.rules, rule.name: rule}, dict(snapshot.sources))
 
-        if rule.service not in self.rules_by_service:
-            self.rules_by_service[rule.service] = []
-        self.rules_by_service[rule.service].append(rule.name)
+    def _swap(self, rules: Dict[str, WorkflowRule], sources: Dict[str, Tuple[str, str]]) -> None:
+        """Publish a new snapshot; callers hold the write lock."""
+        self._snapshot = RegistrySnapshot.build(self._snapshot.version + 1, rules, sources)
 
     def get_rule(self, name: str) -> Optional[WorkflowRule]:
         """Get workflow rule by name."""
-        return self.rules.get(name)
+        return self._snapshot.rules.get(name)
 
     def get_rules_for_service(self, service: str) -> List[WorkflowRule]:
         """Get all rules for a specific service."""
-        rule_names = self.rules_by_service.get(service, [])
-        return [self.rules[name] for name in rule_names]
+        snapshot = self._snapshot
+        rule_names = snapshot.rules_by_service.get(service, ())
+        return [snapshot.rules[name] for name in rule_names]
 
     def list_rules(self) -> List[str]:
         """List all registered rule names."""
-        return list(self.rules.keys())
+        return list(self._snapshot.rules.keys())
 
     def load_rules_from_yaml(self, yaml_path: str) -> int:
         """Load workflow rules from YAML file."""
         try:
-            with open(yaml_path, 'r', encoding='utf-8') as f:
-                yaml_data = yaml.safe_load(f)
-
-            rule = self._parse_yaml_rule(yaml_data)
-            self.register_rule(rule)
+            with open(yaml_path, 'rb') as f:
+                self.register_rule(self._load_yaml_rule(yaml_path, f.read()))
             return 1
 
         except FileNotFoundError:
             raise ConfigurationError(f"YAML file not found: {yaml_path}")
-        except yaml.YAMLError as e:
-            raise ConfigurationError(f"Invalid YAML in {yaml_path}: {e}")
+        except ConfigurationError:
+            raise
         except Exception as e:
             raise ConfigurationError(f"Error loading rule from {yaml_path}: {e}")
 
-    def load_rules_from_directory(self, directory: str) -> int:
-        """Load all workflow rules from YAML files in directory."""
-        loaded_count = 0
-        yaml_files = Path(directory).glob("*.yaml")
+    def _load_yaml_rule(self, yaml_path: str, content: bytes) -> WorkflowRule:
+        """Parse rule file contents into a validated, compiled WorkflowRule."""
+        try:
+            yaml_data = yaml.load(content, Loader=YAMLLoader)
+        except yaml.YAMLError as e:
+            raise ConfigurationError(f"Invalid YAML in {yaml_path}: {e}")
 
+        rule = self._parse_yaml_rule(yaml_data)
+        rule.validate()
+        rule.compile()
+        return rule
+
+    def load_rules_from_directory(self, directory: str, bundle_path: Optional[str] = None,
+                                  use_bundle: bool = True) -> int:
+        """Load all workflow rules from YAML files in directory.
+
+        Compiled rules are cached in a bundle (``.rules.bundle`` in the
+        directory by default) keyed by file content hash; only new or
+        changed files are parsed and validated again.
+        """
+        loaded, _ = self._read_rule_directory(directory, bundle_path, use_bundle)
+
+        with self._write_lock:
+            snapshot = self._snapshot
+            rules = dict(snapshot.rules)
+            sources = dict(snapshot.sources)
+
+            for path, (file_hash, rule) in loaded.items():
+                if rule.name in rules:
+                    print(f"Warning: Failed to load rule from {path}: Rule '{rule.name}' already registered")
+                    continue
+                rules[rule.name] = rule
+                sources[rule.name] = (path, file_hash)
+
+            self._swap(rules, sources)
+            return len(rules) - len(snapshot.rules)
+
+    def reload_from_directory(self, directory: str, bundle_path: Optional[str] = None) -> Dict[str, Any]:
+        """Re-read a rules directory and atomically swap in the result.
+
+        Changed files are re-validated; a file that no longer loads keeps
+        serving its previous rule. Rules from deleted files are removed.
+        Workflows already running keep the rule object they started with.
+        """
+        loaded, failed = self._read_rule_directory(directory, bundle_path)
+        directory_path = Path(directory)
+
+        with self._write_lock:
+            snapshot = self._snapshot
+            rules: Dict[str, WorkflowRule] = {}
+            sources: Dict[str, Tuple[str, str]] = {}
+
+            for name, rule in snapshot.rules.items():
+                source = snapshot.sources.get(name)
+                # Keep rules registered in code or from other directories, and last good versions
+                if source is None or Path(source[0]).parent != directory_path or source[0] in failed:
+                    rules[name] = rule
+                    if source:
+                        sources[name] = source
+
+            for path, (file_hash, rule) in loaded.items():
+                if rule.name in rules:
+                    print(f"Warning: Failed to reload rule from {path}: Rule '{rule.name}' already registered")
+                    continue
+                rules[rule.name] = rule
+                sources[rule.name] = (path, file_hash)
+
+            added = sorted(rules.keys() - snapshot.rules.keys())
+            removed = sorted(snapshot.rules.keys() - rules.keys())
+            updated = sorted(name for name, rule in rules.items()
+                             if name in snapshot.rules and snapshot.rules[name] is not rule)
+
+            if added or removed or updated:
+                self._swap(rules, sources)
+
+            return {
+                "version": self._snapshot.version,
+                "added": added,
+                "updated": updated,
+                "removed": removed,
+                "failed": sorted(failed)
+            }
+
+    def _read_rule_directory(self, directory: str, bundle_path: Optional[str] = None,
+                             use_bundle: bool = True) -> Tuple[Dict[str, Tuple[str, WorkflowRule]], Set[str]]:
+        """Load every YAML file in a directory into validated, compiled rules.
+
+        Unchanged files reuse the rule already in the current snapshot, then
+        the bundle; only the rest are parsed. Returns ``{path: (hash, rule)}``
+        and the set of paths that failed to load.
+        """
+        yaml_files = sorted(Path(directory).glob("*.yaml"))
+        snapshot = self._snapshot
+        current = {source: (file_hash, snapshot.rules[name])
+                   for name, (source, file_hash) in snapshot.sources.items()}
+
+        bundle = None
+        if use_bundle:
+            bundle = RuleBundle(bundle_path or str(Path(directory) / ".rules.bundle"))
+            bundle.load()
+
+        loaded: Dict[str, Tuple[str, WorkflowRule]] = {}
+        failed: Set[str] = set()
         for yaml_file in yaml_files:
+            path = str(yaml_file)
             try:
-                loaded_count += self.load_rules_from_yaml(str(yaml_file))
+                content = yaml_file.read_bytes()
+                file_hash = content_hash(content)
+
+                rule = None
+                if path in current and current[path][0] == file_hash:
+                    rule = current[path][1]
+                elif bundle:
+                    # Bundled rules were validated and compiled when they were cached
+                    rule = bundle.get(yaml_file.name, file_hash)
+                if rule is None:
+                    rule = self._load_yaml_rule(path, content)
+
+                loaded[path] = (file_hash, rule)
+
             except Exception as e:
+                failed.add(path)
                 print(f"Warning: Failed to load rule from {yaml_file}: {e}")
 
-        return loaded_count
+        if bundle:
+            entries = {Path(path).name: entry for path, entry in loaded.items()}
+            if {name: h for name, (h, _) in entries.items()} != {name: h for name, (h, _) in bundle.entries.items()}:
+                try:
+                    bundle.save(entries)
+                except Exception as e:
+                    print(f"Warning: Failed to write rule bundle {bundle.path}: {e}")
+
+        return loaded, failed
 
     def _parse_yaml_rule(self, yaml_data: Dict[str, Any]) -> WorkflowRule:
         """Parse YAML data into WorkflowRule object."""
@@ -198,19 +485,7 @@ class RuleRegistry:
                 ))
 
             # Parse steps
-            steps = []
-            for step_data in yaml_data["steps"]:
-                step = WorkflowStep(
-                    name=step_data["name"],
-                    action=ActionType(step_data["action"]),
-                    params=step_data.get("params", {}),
-                    on_success=step_data.get("on_success"),
-                    on_failure=step_data.get("on_failure"),
-                    error_message=step_data.get("error_message"),
-                    timeout_seconds=step_data.get("timeout_seconds", 30),
-                    retry_attempts=step_data.get("retry_attempts", 0)
-                )
-                steps.append(step)
+            steps = [self._parse_yaml_step(step_data) for step_data in yaml_data["steps"]]
 
             # Parse error handling
             error_handling = {}
@@ -236,16 +511,34 @@ class RuleRegistry:
         except Exception as e:
             raise ConfigurationError(f"Error parsing workflow rule: {e}")
 
+    def _parse_yaml_step(self, step_data: Dict[str, Any]) -> WorkflowStep:
+        """Parse YAML step data, including nested parallel branches."""
+        return WorkflowStep(
+            name=step_data["name"],
+            action=ActionType(step_data["action"]),
+            params=step_data.get("params", {}),
+            on_success=step_data.get("on_success"),
+            on_failure=step_data.get("on_failure"),
+            error_message=step_data.get("error_message"),
+            timeout_seconds=step_data.get("timeout_seconds", 30),
+            retry_attempts=step_data.get("retry_attempts", 0),
+            branches=[self._parse_yaml_step(branch) for branch in step_data.get("branches", [])],
+            join_policy=JoinPolicy(step_data.get("join", JoinPolicy.ALL.value)),
+            quorum=step_data.get("quorum")
+        )
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert registry to dictionary."""
+        snapshot = self._snapshot
         return {
-            "rules_count": len(self.rules),
+            "registry_version": snapshot.version,
+            "rules_count": len(snapshot.rules),
             "rules": {name: {
                 "name": rule.name,
                 "service": rule.service,
                 "version": rule.version,
                 "priority": rule.priority,
                 "steps_count": len(rule.steps)
-            } for name, rule in self.rules.items()},
-            "services": list(self.rules_by_service.keys())
+            } for name, rule in snapshot.rules.items()},
+            "services": list(snapshot.rules_by_service.keys())
         }
\ No newline at end of file
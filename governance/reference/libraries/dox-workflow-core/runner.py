@@ -5,41 +5,81 @@ Coordinates workflow execution, step processing, and state management.
 """
 
 import uuid
-from typing import Dict, Any, Optional, List
+from collections import ChainMap
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 import json
 import requests
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
 
 from .state import WorkflowState, StateManager
-from .rules import WorkflowRule, WorkflowStep, ActionType, RuleRegistry
+from .rules import WorkflowRule, WorkflowStep, ActionType, ErrorHandlingType, RuleRegistry
+from .retry import RetryPolicy, RetryScheduler
+from .templates import render_template
 from .validation import FileValidator
-from .exceptions import WorkflowError, ValidationError, IntegrationError, StateError
+from .exceptions import WorkflowError, ValidationError, IntegrationError, StateError, LeaseLostError
 
 
 class WorkflowRunner:
     """Main workflow execution engine."""
 
-    def __init__(self, service_name: str, memory_bank_path: str = None):
-        """Initialize workflow runner."""
+    def __init__(self, service_name: str, memory_bank_path: str = None,
+                 max_parallel_branches: int = 32, http_client: Any = None,
+                 checkpoint_store: Any = None, retry_policy: Optional[RetryPolicy] = None,
+                 max_background_workflows: int = 32):
+        """Initialize workflow runner.
+
+        ``http_client`` is any object exposing ``request(method, url, **kwargs)``
+        like the ``requests`` module (the default), e.g. a pooled session.
+
+        ``checkpoint_store`` optionally persists progress after every step. It
+        must expose ``save_checkpoint(checkpoint) -> bool`` and
+        ``load_checkpoints(service) -> list`` of previously saved checkpoints.
+        ``save_checkpoint`` raises LeaseLostError once another instance has
+        taken the workflow over; the runner then drops the workflow.
+
+        ``retry_policy`` sets the backoff for failed steps; a step's
+        ``retry_attempts`` overrides the policy's attempt count. Up to
+        ``max_background_workflows`` retried or recovered workflows run at once.
+        """
         self.service_name = service_name
         self.state_manager = StateManager()
         self.rule_registry = RuleRegistry()
         self.memory_bank_path = memory_bank_path or "strategy/memory-banks"
         self.active_workflows: Dict[str, Dict[str, Any]] = {}
-
-    def load_rules_from_directory(self, workflow_directory: str) -> int:
+        self.max_parallel_branches = max_parallel_branches
+        self._branch_executor: Optional[ThreadPoolExecutor] = None
+        self.http_client = http_client or requests
+        self.checkpoint_store = checkpoint_store
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._retry_scheduler: Optional[RetryScheduler] = None
+        self.max_background_workflows = max_background_workflows
+        self._background_executor: Optional[ThreadPoolExecutor] = None
+
+    def load_rules_from_directory(self, workflow_directory: str, bundle_path: Optional[str] = None) -> int:
         """Load workflow rules from directory."""
-        return self.rule_registry.load_rules_from_directory(workflow_directory)
+        return self.rule_registry.load_rules_from_directory(workflow_directory, bundle_path)
 
     def start_workflow(self, rule_name: str, context: Dict[str, Any],
                       workflow_id: Optional[str] = None) -> str:
         """Start a new workflow execution."""
+        workflow_id, rule = self._prepare_workflow(rule_name, context, workflow_id)
+
+        # Execute first step
+        self._execute_next_step(workflow_id, rule)
+
+        return workflow_id
+
+    def _prepare_workflow(self, rule_name: str, context: Dict[str, Any],
+                          workflow_id: Optional[str] = None) -> Tuple[str, WorkflowRule]:
+        """Validate, register and transition a new workflow to running."""
         if workflow_id is None:
             workflow_id = str(uuid.uuid4())
 
-        # Get workflow rule
-        rule = self.rule_registry.get_rule(rule_name)
+        # Get workflow rule; the workflow stays pinned to this object across reloads
+        snapshot = self.rule_registry.snapshot()
+        rule = snapshot.rules.get(rule_name)
         if not rule:
             raise WorkflowError(f"Workflow rule '{rule_name}' not found")
 
@@ -54,87 +94,77 @@ class WorkflowRunner:
         # Store workflow metadata
         self.active_workflows[workflow_id] = {
             "rule_name": rule_name,
+            "rule_version": rule.version,
+            "registry_version": snapshot.version,
             "service": self.service_name,
             "start_time": datetime.utcnow().isoformat(),
-            "context": context.copy(),
+            # Copy-on-write view: step writes land in the overlay, the caller's dict is shared
+            "context": ChainMap({}, context),
             "current_step": None,
             "step_results": {},
+            "attempts": {},
             "status": WorkflowState.RUNNING.value
         }
 
         # Transition to running state
         self.state_manager.transition_state(workflow_id, WorkflowState.RUNNING, "workflow_started")
+        self._save_checkpoint(workflow_id, rule.compile().entry)
 
-        # Execute first step
-        self._execute_next_step(workflow_id, rule)
-
-        return workflow_id
+        return workflow_id, rule
 
     def _execute_next_step(self, workflow_id: str, rule: WorkflowRule,
                           current_step_name: Optional[str] = None) -> None:
-        """Execute the next step in workflow."""
+        """Execute the steps following current_step_name until the workflow stops."""
         workflow_info = self.active_workflows.get(workflow_id)
         if not workflow_info:
             raise WorkflowError(f"Workflow '{workflow_id}' not found")
 
+        graph = rule.compile()
+
         # Determine next step
         if current_step_name is None:
             # Start with first step
-            next_step = rule.steps[0]
+            next_step = graph.entry
         else:
-            # Find the step that follows current step
-            current_step = next((s for s in rule.steps if s.name == current_step_name), None)
-            if not current_step:
+            # Edges exist only for top-level steps; graph.steps also indexes branches
+            if current_step_name not in graph.on_success:
                 raise WorkflowError(f"Step '{current_step_name}' not found in workflow")
-
-            if current_step.on_success:
-                next_step = next((s for s in rule.steps if s.name == current_step.on_success), None)
-            else:
-                # No next step, workflow complete
-                self._complete_workflow(workflow_id, rule)
-                return
-
-            if not next_step:
-                # Workflow complete
-                self._complete_workflow(workflow_id, rule)
+            next_step = graph.on_success[current_step_name]
+
+        self._run_steps(workflow_id, rule, next_step)
+
+    def _run_steps(self, workflow_id: str, rule: WorkflowRule,
+                   next_step: Optional[WorkflowStep]) -> None:
+        """Iteratively dispatch steps along the compiled graph edges."""
+        workflow_info = self.active_workflows[workflow_id]
+        graph = rule.compile()
+
+        while next_step is not None:
+            try:
+                workflow_info["current_step"] = next_step.name
+                result = self._execute_step(workflow_id, next_step, workflow_info["context"])
+                workflow_info["step_results"][next_step.name] = result
+
+            except Exception as e:
+                # Handle step failure; the handler decides whether execution continues
+                next_step = self._handle_step_failure(workflow_id, rule, next_step, e)
+                if next_step is None:
+                    return
+                continue
+
+            next_step = graph.on_success[next_step.name]
+            if not self._save_checkpoint(workflow_id, next_step):
                 return
 
-        # Execute step
-        try:
-            workflow_info["current_step"] = next_step.name
-            result = self._execute_step(workflow_id, next_step, workflow_info["context"])
-            workflow_info["step_results"][next_step.name] = result
-
-            # Continue to next step
-            self._execute_next_step(workflow_id, rule, next_step.name)
-
-        except Exception as e:
-            # Handle step failure
-            self._handle_step_failure(workflow_id, rule, next_step, e)
+        # No next step, workflow complete
+        self._complete_workflow(workflow_id, rule)
 
     def _execute_step(self, workflow_id: str, step: WorkflowStep, context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a single workflow step."""
         step_start_time = datetime.utcnow()
 
         try:
-            if step.action == ActionType.API_CALL:
-                result = self._execute_api_call(step, context)
-            elif step.action == ActionType.DATA_TRANSFORM:
-                result = self._execute_data_transform(step, context)
-            elif step.action == ActionType.STORE_RESULT:
-                result = self._execute_store_result(step, context)
-            elif step.action == ActionType.PUBLISH_EVENT:
-                result = self._execute_publish_event(step, context)
-            elif step.action == ActionType.UPDATE_MEMORY:
-                result = self._execute_update_memory(step, context)
-            elif step.action == ActionType.CUSTOM_LOGIC:
-                result = self._execute_custom_logic(step, context)
-            elif step.action == ActionType.CONDITIONAL_BRANCH:
-                result = self._execute_conditional_branch(step, context)
-            elif step.action == ActionType.MANUAL_INTERVENTION:
-                result = self._execute_manual_intervention(step, context)
-            else:
-                raise WorkflowError(f"Unsupported action type: {step.action}")
+            result = self._dispatch_step(workflow_id, step, context)
 
             # Log step execution
             step_duration = (datetime.utcnow() - step_start_time).total_seconds()
@@ -148,32 +178,55 @@ class WorkflowRunner:
             self._log_step_execution(workflow_id, step, "failed", step_duration, {"error": str(e)})
             raise
 
-    def _execute_api_call(self, step: WorkflowStep, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute API call step."""
-        params = step.params.copy()
+    def _dispatch_step(self, workflow_id: str, step: WorkflowStep, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the handler for the step's action type."""
+        if step.action == ActionType.PARALLEL:
+            return self._execute_parallel(workflow_id, step, context)
+        elif step.action == ActionType.API_CALL:
+            return self._execute_api_call(step, context)
+        elif step.action == ActionType.DATA_TRANSFORM:
+            return self._execute_data_transform(step, context)
+        elif step.action == ActionType.STORE_RESULT:
+            return self._execute_store_result(step, context)
+        elif step.action == ActionType.PUBLISH_EVENT:
+            return self._execute_publish_event(step, context)
+        elif step.action == ActionType.UPDATE_MEMORY:
+            return self._execute_update_memory(step, context)
+        elif step.action == ActionType.CUSTOM_LOGIC:
+            return self._execute_custom_logic(step, context)
+        elif step.action == ActionType.CONDITIONAL_BRANCH:
+            return self._execute_conditional_branch(step, context)
+        elif step.action == ActionType.MANUAL_INTERVENTION:
+            return self._execute_manual_intervention(step, context)
+        else:
+            raise WorkflowError(f"Unsupported action type: {step.action}")
 
-        # Substitute context variables
-        service = self._substitute_variables(params.get("service", ""), context)
+    def _build_api_request(self, step: WorkflowStep, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Resolve an API_CALL step into request arguments."""
+        # Single-pass render of the templates compiled at rule-load time
+        params = render_template(step.compile_params(), context)
+
+        service = params.get("service", "")
         method = params.get("method", "GET")
-        endpoint = self._substitute_variables(params.get("endpoint", ""), context)
+        endpoint = params.get("endpoint", "")
         body = params.get("body", {})
 
-        # Handle body substitution
-        if isinstance(body, str):
-            body = self._substitute_variables(body, context)
-        elif isinstance(body, dict):
-            body = self._substitute_dict_variables(body, context)
+        return {
+            "service": service,
+            "method": method,
+            "url": f"http://{service}{endpoint}",
+            "json": body if method in ["POST", "PUT", "PATCH"] else None,
+            "params": body if method == "GET" else None,
+            "timeout": step.timeout_seconds
+        }
 
-        url = f"http://{service}{endpoint}"
+    def _execute_api_call(self, step: WorkflowStep, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute API call step."""
+        api_request = self._build_api_request(step, context)
+        service = api_request.pop("service")
 
         try:
-            response = requests.request(
-                method=method,
-                url=url,
-                json=body if method in ["POST", "PUT", "PATCH"] else None,
-                params=body if method == "GET" else None,
-                timeout=step.timeout_seconds
-            )
+            response = self.http_client.request(**api_request)
 
             response.raise_for_status()
             return response.json()
@@ -185,6 +238,66 @@ class WorkflowRunner:
                 http_status=getattr(e.response, 'status_code', None) if hasattr(e, 'response') else None
             )
 
+    def _execute_parallel(self, workflow_id: str, step: WorkflowStep, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute parallel step branches concurrently and join their results."""
+        executor = self._get_branch_executor()
+        pending = {
+            executor.submit(self._execute_step, workflow_id, branch, context): branch
+            for branch in step.branches
+        }
+        succeeded: Dict[str, Dict[str, Any]] = {}
+        failed: Dict[str, str] = {}
+
+        # Stop waiting as soon as the join policy is decided
+        while pending and step.join_outcome(len(succeeded), len(failed)) is None:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                branch = pending.pop(future)
+                try:
+                    succeeded[branch.name] = future.result()
+                except Exception as e:
+                    failed[branch.name] = str(e)
+
+        for future in pending:
+            future.cancel()
+
+        return self._join_branches(workflow_id, step, succeeded, failed,
+                                   [branch.name for branch in pending.values()])
+
+    def _join_branches(self, workflow_id: str, step: WorkflowStep, succeeded: Dict[str, Dict[str, Any]],
+                       failed: Dict[str, str], abandoned: List[str]) -> Dict[str, Any]:
+        """Record branch results and apply the parallel step's join policy."""
+        workflow_info = self.active_workflows.get(workflow_id)
+        if workflow_info:
+            workflow_info["step_results"].update(succeeded)
+
+        join_result = {
+            "join_policy": step.join_policy.value,
+            "required_successes": step.required_successes(),
+            "succeeded": list(succeeded.keys()),
+            "failed": failed,
+            "abandoned": abandoned
+        }
+
+        if not step.join_outcome(len(succeeded), len(failed)):
+            raise WorkflowError(
+                f"Parallel step '{step.name}' did not satisfy join policy '{step.join_policy.value}'",
+                workflow_id=workflow_id,
+                step_name=step.name,
+                details=join_result
+            )
+
+        return join_result
+
+    def _get_branch_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool shared by parallel step branches."""
+        if self._branch_executor is None:
+            self._branch_executor = ThreadPoolExecutor(
+                max_workers=self.max_parallel_branches,
+                thread_name_prefix=f"{self.service_name}-branch"
+            )
+        return self._branch_executor
+
     def _execute_data_transform(self, step: WorkflowStep, context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute data transform step."""
         # For now, return transformed data based on params
@@ -192,7 +305,7 @@ class WorkflowRunner:
         return {
             "transformed": True,
             "transformation_type": step.params.get("type", "unknown"),
-            "input_data": context
+            "input_data": dict(context)
         }
 
     def _execute_store_result(self, step: WorkflowStep, context: Dict[str, Any]) -> Dict[str, Any]:
@@ -259,29 +372,100 @@ class WorkflowRunner:
         }
 
     def _handle_step_failure(self, workflow_id: str, rule: WorkflowRule,
-                           step: WorkflowStep, error: Exception) -> None:
-        """Handle workflow step failure."""
+                           step: WorkflowStep, error: Exception) -> Optional[WorkflowStep]:
+        """Handle workflow step failure.
+
+        Returns the step to continue with, or None when execution stops here.
+        """
         workflow_info = self.active_workflows.get(workflow_id)
         if not workflow_info:
-            return
+            return None
 
         # Determine error handling strategy
-        error_handling = rule.error_handling.get("general_failure", "escalate")
-
-        if error_handling == "retry":
-            # Retry logic would go here
-            self.state_manager.transition_state(workflow_id, WorkflowState.RETRY, "step_failed", {"error": str(error)})
-        elif error_handling == "skip_step":
-            # Continue to next step
-            if step.on_failure:
-                self._execute_next_step(workflow_id, rule, step.on_failure)
-            else:
-                self._complete_workflow(workflow_id, rule, failed=True)
+        strategy = rule.error_handling.get("general_failure", ErrorHandlingType.ESCALATE)
+        if not isinstance(strategy, ErrorHandlingType):
+            strategy = ErrorHandlingType(strategy)
+
+        max_retries = self._max_retries(step, strategy)
+        attempt = workflow_info["attempts"].get(step.name, 0) + 1
+
+        if attempt <= max_retries:
+            # Park the step in the delayed-retry queue; no thread waits on it
+            workflow_info["attempts"][step.name] = attempt
+            workflow_info["status"] = WorkflowState.RETRY.value
+            delay = self.retry_policy.delay_for(attempt)
+            self.state_manager.transition_state(workflow_id, WorkflowState.RETRY, "step_failed", {
+                "error": str(error), "step": step.name, "attempt": attempt, "delay_seconds": round(delay, 3)
+            })
+            # Recovery re-runs the failed step
+            if self._save_checkpoint(workflow_id, step):
+                self._schedule_retry(delay, workflow_id, rule, step)
+        elif strategy == ErrorHandlingType.SKIP_STEP:
+            # Continue with the failure branch
+            failure_step = rule.compile().on_failure[step.name]
+            if failure_step:
+                return failure_step
+            self._complete_workflow(workflow_id, rule, failed=True)
         else:
-            # Escalate
+            # Escalate, including retries that ran out
             self.state_manager.transition_state(workflow_id, WorkflowState.ESCALATED, "step_failed", {"error": str(error)})
             self._complete_workflow(workflow_id, rule, failed=True)
 
+        return None
+
+    def _max_retries(self, step: WorkflowStep, strategy: ErrorHandlingType) -> int:
+        """Retries allowed for a step: its own retry_attempts, else the policy's for RETRY rules."""
+        if step.retry_attempts:
+            return step.retry_attempts
+        if strategy == ErrorHandlingType.RETRY:
+            return self.retry_policy.max_attempts
+        return 0
+
+    def _schedule_retry(self, delay: float, workflow_id: str, rule: WorkflowRule, step: WorkflowStep) -> None:
+        """Run the failed step again after the backoff delay."""
+        self._get_retry_scheduler().schedule(delay, self._retry_step, workflow_id, rule, step)
+
+    def _resume_retry(self, workflow_id: str) -> bool:
+        """Move a workflow waiting on a retry back to running; False if it moved on meanwhile."""
+        workflow_info = self.active_workflows.get(workflow_id)
+        if not workflow_info or self.state_manager.get_state(workflow_id) != WorkflowState.RETRY:
+            return False  # Cancelled or otherwise resolved while waiting
+
+        workflow_info["status"] = WorkflowState.RUNNING.value
+        self.state_manager.transition_state(workflow_id, WorkflowState.RUNNING, "retry_attempt")
+        return True
+
+    def _retry_step(self, workflow_id: str, rule: WorkflowRule, step: WorkflowStep) -> None:
+        """Hand a due retry to the execution pool, which re-runs the step and continues from it.
+
+        The rest of the workflow runs off the retry scheduler's workers, so
+        long workflows never hold up other due retries.
+        """
+        if self._resume_retry(workflow_id):
+            self._get_background_executor().submit(self._continue_workflow, workflow_id, rule, step)
+
+    def _continue_workflow(self, workflow_id: str, rule: WorkflowRule,
+                           next_step: Optional[WorkflowStep]) -> None:
+        """Run a workflow on from next_step, unless it was taken over while queued."""
+        # Renews the lease, which a retry backoff or a queue wait may have run down
+        if self._save_checkpoint(workflow_id, next_step):
+            self._run_steps(workflow_id, rule, next_step)
+
+    def _get_retry_scheduler(self) -> RetryScheduler:
+        """Get the delayed-retry queue shared by all workflows."""
+        if self._retry_scheduler is None:
+            self._retry_scheduler = RetryScheduler(name=f"{self.service_name}-retry")
+        return self._retry_scheduler
+
+    def _get_background_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool that runs workflows continuing after a retry or recovery."""
+        if self._background_executor is None:
+            self._background_executor = ThreadPoolExecutor(
+                max_workers=self.max_background_workflows,
+                thread_name_prefix=f"{self.service_name}-workflow"
+            )
+        return self._background_executor
+
     def _complete_workflow(self, workflow_id: str, rule: WorkflowRule, failed: bool = False) -> None:
         """Complete workflow execution."""
         workflow_info = self.active_workflows.get(workflow_id)
@@ -294,6 +478,8 @@ class WorkflowRunner:
         # Update workflow state
         final_state = WorkflowState.FAILED if failed else WorkflowState.SUCCESS
         self.state_manager.transition_state(workflow_id, final_state, "workflow_completed")
+        if not self._save_checkpoint(workflow_id, None):
+            return
 
         # Update memory banks with final status
         self._update_workflow_memory_banks(workflow_id, rule, workflow_info, failed)
@@ -301,30 +487,120 @@ class WorkflowRunner:
         # Clean up active workflow
         del self.active_workflows[workflow_id]
 
+    def _build_checkpoint(self, workflow_id: str, next_step: Optional[WorkflowStep]) -> Dict[str, Any]:
+        """Snapshot everything needed to resume a workflow at next_step."""
+        workflow_info = self.active_workflows[workflow_id]
+        return {
+            "workflow_id": workflow_id,
+            "rule_name": workflow_info["rule_name"],
+            "rule_version": workflow_info["rule_version"],
+            "service": self.service_name,
+            "state": self.state_manager.get_state(workflow_id).value,
+            "start_time": workflow_info["start_time"],
+            "context": dict(workflow_info["context"]),
+            "step_results": workflow_info["step_results"],
+            "attempts": workflow_info["attempts"],
+            "next_step": next_step.name if next_step else None
+        }
+
+    def _save_checkpoint(self, workflow_id: str, next_step: Optional[WorkflowStep]) -> bool:
+        """Persist progress so a restarted process can resume at next_step.
+
+        Returns False if another instance has taken the workflow over; it is
+        then dropped here and must not run any further steps.
+        """
+        if self.checkpoint_store is None:
+            return True
+
+        try:
+            self.checkpoint_store.save_checkpoint(self._build_checkpoint(workflow_id, next_step))
+        except LeaseLostError as e:
+            print(f"Workflow {workflow_id} taken over by another instance: {e}")
+            self._abandon_workflow(workflow_id)
+            return False
+        except Exception as e:
+            print(f"Failed to checkpoint workflow {workflow_id}: {e}")
+        return True
+
+    def _abandon_workflow(self, workflow_id: str) -> None:
+        """Forget a workflow now owned by another instance, without recording an outcome."""
+        self.active_workflows.pop(workflow_id, None)
+        if self.state_manager.get_state(workflow_id) is not None:
+            self.state_manager._remove_workflow(workflow_id)
+
+    def recover_workflows(self) -> List[str]:
+        """Resume RUNNING/RETRY workflows from their last checkpoint.
+
+        Completed steps are not replayed; each workflow continues with the
+        step after the last one that succeeded (or re-runs the failed step
+        for RETRY). The checkpoint store only hands out workflows whose
+        owner's lease has expired, so this is safe to call periodically.
+        Returns the IDs of resumed workflows.
+        """
+        if self.checkpoint_store is None:
+            return []
+
+        resumed = []
+        for checkpoint in self.checkpoint_store.load_checkpoints(self.service_name):
+            workflow_id = checkpoint["workflow_id"]
+            try:
+                rule, next_step = self._restore_workflow(checkpoint)
+            except Exception as e:
+                print(f"Cannot recover workflow {workflow_id}: {e}")
+                continue
+
+            self._resume_workflow(workflow_id, rule, next_step)
+            resumed.append(workflow_id)
+
+        return resumed
+
+    def _restore_workflow(self, checkpoint: Dict[str, Any]) -> Tuple[WorkflowRule, Optional[WorkflowStep]]:
+        """Rebuild in-memory workflow state from a checkpoint."""
+        workflow_id = checkpoint["workflow_id"]
+        snapshot = self.rule_registry.snapshot()
+        rule = snapshot.rules.get(checkpoint["rule_name"])
+        if not rule:
+            raise WorkflowError(f"Workflow rule '{checkpoint['rule_name']}' not found", workflow_id=workflow_id)
+        if rule.version != checkpoint.get("rule_version"):
+            print(f"Workflow {workflow_id} resumes on rule version {rule.version} "
+                  f"(started on {checkpoint.get('rule_version')})")
+
+        next_step = None
+        if checkpoint.get("next_step"):
+            next_step = rule.compile().get_step(checkpoint["next_step"])
+            if next_step is None:
+                raise WorkflowError(f"Step '{checkpoint['next_step']}' not found in workflow", workflow_id=workflow_id)
+
+        saved_state = WorkflowState(checkpoint["state"])
+        if not self.state_manager.create_workflow(workflow_id, saved_state):
+            raise WorkflowError(f"Workflow '{workflow_id}' already exists", workflow_id=workflow_id)
+        if saved_state != WorkflowState.RUNNING:
+            self.state_manager.transition_state(workflow_id, WorkflowState.RUNNING, "workflow_recovered")
+
+        self.active_workflows[workflow_id] = {
+            "rule_name": rule.name,
+            "rule_version": rule.version,
+            "registry_version": snapshot.version,
+            "service": self.service_name,
+            "start_time": checkpoint.get("start_time"),
+            "context": ChainMap({}, checkpoint.get("context") or {}),
+            "current_step": None,
+            "step_results": checkpoint.get("step_results") or {},
+            "attempts": checkpoint.get("attempts") or {},
+            "status": WorkflowState.RUNNING.value
+        }
+        return rule, next_step
+
+    def _resume_workflow(self, workflow_id: str, rule: WorkflowRule,
+                         next_step: Optional[WorkflowStep]) -> None:
+        """Continue a restored workflow on the background pool."""
+        self._get_background_executor().submit(self._continue_workflow, workflow_id, rule, next_step)
+
     def _validate_conditions(self, rule: WorkflowRule, context: Dict[str, Any]) -> bool:
         """Validate workflow execution conditions."""
         # Mock implementation - would actually validate conditions
         return True
 
-    def _substitute_variables(self, text: str, context: Dict[str, Any]) -> str:
-        """Substitute variables in text with context values."""
-        for key, value in context.items():
-            placeholder = f"{{{{{key}}}}}"
-            text = text.replace(placeholder, str(value))
-        return text
-
-    def _substitute_dict_variables(self, data: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
-        """Substitute variables in dictionary with context values."""
-        result = {}
-        for key, value in data.items():
-            if isinstance(value, str):
-                result[key] = self._substitute_variables(value, context)
-            elif isinstance(value, dict):
-                result[key] = self._substitute_dict_variables(value, context)
-            else:
-                result[key] = value
-        return result
-
     def _update_memory_bank(self, update_spec: Dict[str, Any], context: Dict[str, Any]) -> None:
         """Update memory bank file."""
         # Mock implementation - would update JSON files in memory-banks directory
@@ -371,7 +647,8 @@ class WorkflowRunner:
                 "status": workflow_info["status"],
                 "current_step": workflow_info["current_step"],
                 "start_time": workflow_info["start_time"],
-                "steps_completed": len(workflow_info["step_results"])
+                "steps_completed": len(workflow_info["step_results"]),
+                "rule_version": workflow_info["rule_version"]
             }
 
         # Check state manager for completed workflows
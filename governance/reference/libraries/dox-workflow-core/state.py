@@ -5,9 +5,13 @@ Defines workflow states and provides state transition logic.
 """
 
 from enum import Enum
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import datetime, timezone
+import heapq
 import json
+import sys
+import threading
+import time
 
 
 class WorkflowState(Enum):
@@ -23,54 +27,111 @@ class WorkflowState(Enum):
     CANCELLED = "cancelled"
 
 
+TERMINAL_STATES = frozenset({WorkflowState.SUCCESS, WorkflowState.FAILED, WorkflowState.CANCELLED})
+
+
+class StateTransition:
+    """Compact state history entry: shared enum, epoch-float timestamp, interned reason."""
+
+    __slots__ = ("state", "timestamp", "reason", "details")
+
+    def __init__(self, state: WorkflowState, timestamp: float, reason: str,
+                 details: Optional[Dict[str, Any]] = None):
+        self.state = state
+        self.timestamp = timestamp
+        self.reason = sys.intern(reason)
+        # Most transitions carry no details; don't allocate an empty dict for each
+        self.details = details or None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the dict form used by the history API and persistence."""
+        return {
+            "state": self.state.value,
+            "timestamp": datetime.fromtimestamp(self.timestamp, timezone.utc).replace(tzinfo=None).isoformat(),
+            "reason": self.reason,
+            "details": self.details or {}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StateTransition":
+        """Create a transition from its dict form (naive timestamps are UTC)."""
+        timestamp = datetime.fromisoformat(data["timestamp"])
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return cls(WorkflowState(data["state"]), timestamp.timestamp(),
+                   data.get("reason", "state_change"), data.get("details"))
+
+
 class StateManager:
     """Manages workflow state transitions and persistence."""
 
     def __init__(self):
-        self.state_history: Dict[str, list] = {}
+        self.state_history: Dict[str, List[StateTransition]] = {}
         self.current_states: Dict[str, WorkflowState] = {}
+        # Insertion-ordered membership per state, so counts and lookups skip the full scan
+        self._members: Dict[WorkflowState, Dict[str, None]] = {state: {} for state in WorkflowState}
+        # Min-heap of (terminal_time, workflow_id); stale entries are skipped on pop
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._terminal_at: Dict[str, float] = {}
+        # Workflows change state from request, branch, retry and background threads
+        self._lock = threading.RLock()
+
+    def _set_state(self, workflow_id: str, new_state: WorkflowState, timestamp: float) -> None:
+        """Update current state and keep the indexes in step; caller holds the lock."""
+        old_state = self.current_states.get(workflow_id)
+        if old_state is not None:
+            self._members[old_state].pop(workflow_id, None)
+
+        self.current_states[workflow_id] = new_state
+        self._members[new_state][workflow_id] = None
+
+        if new_state in TERMINAL_STATES:
+            self._terminal_at[workflow_id] = timestamp
+            heapq.heappush(self._expiry_heap, (timestamp, workflow_id))
+
+    def _remove_workflow(self, workflow_id: str) -> None:
+        """Drop a workflow and its index entries."""
+        with self._lock:
+            state = self.current_states.pop(workflow_id)
+            self._members[state].pop(workflow_id, None)
+            self._terminal_at.pop(workflow_id, None)
+            self.state_history.pop(workflow_id, None)
 
     def create_workflow(self, workflow_id: str, initial_state: WorkflowState = WorkflowState.PENDING) -> bool:
         """Create a new workflow instance."""
-        if workflow_id in self.current_states:
-            return False
+        with self._lock:
+            if workflow_id in self.current_states:
+                return False
 
-        self.current_states[workflow_id] = initial_state
-        self.state_history[workflow_id] = [{
-            "state": initial_state.value,
-            "timestamp": datetime.utcnow().isoformat(),
-            "reason": "workflow_created"
-        }]
-        return True
+            now = time.time()
+            self._set_state(workflow_id, initial_state, now)
+            self.state_history[workflow_id] = [StateTransition(initial_state, now, "workflow_created")]
+            return True
 
     def transition_state(self, workflow_id: str, new_state: WorkflowState,
                         reason: str = "state_change", details: Optional[Dict[str, Any]] = None) -> bool:
         """Transition workflow to a new state."""
-        if workflow_id not in self.current_states:
-            raise StateError(f"Workflow {workflow_id} not found")
+        with self._lock:
+            if workflow_id not in self.current_states:
+                raise StateError(f"Workflow {workflow_id} not found")
 
-        current_state = self.current_states[workflow_id]
+            current_state = self.current_states[workflow_id]
 
-        # Validate state transition
-        if not self._is_valid_transition(current_state, new_state):
-            raise StateError(
-                f"Invalid state transition from {current_state.value} to {new_state.value}",
-                workflow_id=workflow_id
-            )
+            # Validate state transition
+            if not self._is_valid_transition(current_state, new_state):
+                raise StateError(
+                    f"Invalid state transition from {current_state.value} to {new_state.value}",
+                    workflow_id=workflow_id
+                )
 
-        # Update state
-        self.current_states[workflow_id] = new_state
+            # Update state
+            now = time.time()
+            self._set_state(workflow_id, new_state, now)
 
-        # Record state change
-        state_entry = {
-            "state": new_state.value,
-            "timestamp": datetime.utcnow().isoformat(),
-            "reason": reason,
-            "details": details or {}
-        }
-        self.state_history[workflow_id].append(state_entry)
+            # Record state change
+            self.state_history[workflow_id].append(StateTransition(new_state, now, reason, details))
 
-        return True
+            return True
 
     def _is_valid_transition(self, from_state: WorkflowState, to_state: WorkflowState) -> bool:
         """Check if state transition is valid."""
@@ -98,44 +159,70 @@ class StateManager:
 
     def get_state_history(self, workflow_id: str) -> list:
         """Get full state history for workflow."""
+        return [entry.to_dict() for entry in self.state_history.get(workflow_id, [])]
+
+    def get_state_transitions(self, workflow_id: str) -> List[StateTransition]:
+        """Get state history records without converting them to dicts."""
         return self.state_history.get(workflow_id, [])
 
     def get_workflows_by_state(self, state: WorkflowState) -> list:
         """Get all workflows in a specific state."""
-        return [wf_id for wf_id, wf_state in self.current_states.items() if wf_state == state]
+        with self._lock:
+            return list(self._members[state])
+
+    def count_by_state(self, state: WorkflowState) -> int:
+        """Count workflows in a specific state."""
+        return len(self._members[state])
+
+    def state_counts(self) -> Dict[str, int]:
+        """Count workflows in every state."""
+        with self._lock:
+            return {state.value: len(members) for state, members in self._members.items()}
 
     def cleanup_completed_workflows(self, older_than_hours: int = 24) -> int:
         """Remove completed workflows older than specified hours."""
-        cutoff_time = datetime.utcnow().timestamp() - (older_than_hours * 3600)
+        cutoff_time = time.time() - (older_than_hours * 3600)
         removed_count = 0
 
-        for workflow_id in list(self.current_states.keys()):
-            state = self.current_states[workflow_id]
-            if state in [WorkflowState.SUCCESS, WorkflowState.FAILED, WorkflowState.CANCELLED]:
-                history = self.state_history[workflow_id]
-                last_update = datetime.fromisoformat(history[-1]["timestamp"]).timestamp()
+        # Only expired heap entries are touched; live workflows are never visited
+        with self._lock:
+            while self._expiry_heap and self._expiry_heap[0][0] < cutoff_time:
+                terminal_at, workflow_id = heapq.heappop(self._expiry_heap)
+                if self._terminal_at.get(workflow_id) != terminal_at:
+                    continue  # Removed or re-created since this entry was pushed
 
-                if last_update < cutoff_time:
-                    del self.current_states[workflow_id]
-                    del self.state_history[workflow_id]
-                    removed_count += 1
+                self._remove_workflow(workflow_id)
+                removed_count += 1
 
         return removed_count
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert state manager to dictionary for persistence."""
-        return {
-            "current_states": {k: v.value for k, v in self.current_states.items()},
-            "state_history": self.state_history,
-            "workflow_count": len(self.current_states)
-        }
+        with self._lock:
+            return {
+                "current_states": {k: v.value for k, v in self.current_states.items()},
+                "state_history": {
+                    k: [entry.to_dict() for entry in history] for k, history in self.state_history.items()
+                },
+                "workflow_count": len(self.current_states)
+            }
 
     def from_dict(self, data: Dict[str, Any]) -> None:
         """Restore state manager from dictionary."""
-        self.current_states = {
-            k: WorkflowState(v) for k, v in data.get("current_states", {}).items()
-        }
-        self.state_history = data.get("state_history", {})
+        with self._lock:
+            self.current_states = {}
+            self._members = {state: {} for state in WorkflowState}
+            self._expiry_heap = []
+            self._terminal_at = {}
+            self.state_history = {
+                k: [StateTransition.from_dict(entry) for entry in history]
+                for k, history in data.get("state_history", {}).items()
+            }
+
+            for workflow_id, value in data.get("current_states", {}).items():
+                history = self.state_history.get(workflow_id)
+                timestamp = history[-1].timestamp if history else time.time()
+                self._set_state(workflow_id, WorkflowState(value), timestamp)
 
 
 class StateError(Exception):
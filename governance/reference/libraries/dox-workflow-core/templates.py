@@ -0,0 +1,69 @@
+"""
+Compiled variable-substitution templates.
+
+Step params are parsed once into templates with placeholder slots, so each
+execution renders in a single pass instead of scanning every context key.
+"""
+
+import re
+from typing import Dict, Any, List, Mapping
+
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{([^{}]+)\}\}")
+
+
+class Template:
+    """String with ``{{key}}`` placeholders split into literal and slot parts."""
+
+    __slots__ = ("source", "_literals", "_names")
+
+    def __init__(self, source: str):
+        self.source = source
+        # split() alternates literal, name, literal, ... and always starts and ends with a literal
+        parts = PLACEHOLDER_PATTERN.split(source)
+        self._literals: List[str] = parts[0::2]
+        self._names: List[str] = parts[1::2]
+
+    def render(self, context: Mapping[str, Any]) -> str:
+        """Fill placeholders from context; unknown placeholders are kept as written."""
+        literals = self._literals
+        parts = [literals[0]]
+        for name, literal in zip(self._names, literals[1:]):
+            if name in context:
+                parts.append(str(context[name]))
+            else:
+                parts.append(f"{{{{{name}}}}}")
+            parts.append(literal)
+        return "".join(parts)
+
+    def __getstate__(self):
+        # Plain tuple state keeps rule bundles fast to unpickle
+        return self.source, self._literals, self._names
+
+    def __setstate__(self, state) -> None:
+        self.source, self._literals, self._names = state
+
+    def __repr__(self) -> str:
+        return f"Template({self.source!r})"
+
+
+def compile_template(value: Any) -> Any:
+    """Compile strings (recursively through dicts and lists) into templates."""
+    if isinstance(value, str):
+        return Template(value) if PLACEHOLDER_PATTERN.search(value) else value
+    if isinstance(value, dict):
+        return {key: compile_template(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [compile_template(item) for item in value]
+    return value
+
+
+def render_template(compiled: Any, context: Mapping[str, Any]) -> Any:
+    """Render a structure produced by compile_template against a context."""
+    if isinstance(compiled, Template):
+        return compiled.render(context)
+    if isinstance(compiled, dict):
+        return {key: render_template(item, context) for key, item in compiled.items()}
+    if isinstance(compiled, list):
+        return [render_template(item, context) for item in compiled]
+    return compiled
@@ -6,7 +6,9 @@ and security validation for all DOX platform uploads.
 """
 
 from .app import create_app
-from .validators import FileValidator, VirusScanner, RateLimiter
+from .validators import (
+    FileValidator, VirusScanner, RateLimiter, SlidingWindowRateLimiter, create_rate_limiter
+)
 from .config import Config
 
 __version__ = "1.0.0"
@@ -17,5 +19,7 @@ __all__ = [
     "FileValidator",
     "VirusScanner",
     "RateLimiter",
+    "SlidingWindowRateLimiter",
+    "create_rate_limiter",
     "Config"
 ]
\ No newline at end of file
@@ -5,7 +5,6 @@ Provides REST API for file validation, virus scanning, and rate limiting.
 """
 
 import os
-import tempfile
 import logging
 from datetime import datetime
 from functools import wraps
@@ -15,9 +14,11 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 import redis
 import werkzeug.utils
+from werkzeug.formparser import parse_form_data
 
 from .config import Config
 from .validators import FileValidator
+from .scan_scheduler import ScanQueueFullError
 
 
 def create_app(config_name: str = "default"):
@@ -146,6 +147,16 @@ def create_app(config_name: str = "default"):
             "timestamp": datetime.utcnow().isoformat()
         }), 429
 
+    def scan_queue_full(error: ScanQueueFullError):
+        response = jsonify({
+            "error": "Scan capacity exceeded",
+            "message": str(error),
+            "retry_after": error.retry_after,
+            "timestamp": datetime.utcnow().isoformat()
+        })
+        response.headers["Retry-After"] = str(error.retry_after)
+        return response, 429
+
     @app.errorhandler(500)
     def internal_error(error):
         logger.error(f"Internal server error: {error}")
@@ -193,10 +204,10 @@ def create_app(config_name: str = "default"):
 
         Request body:
         {
-            "file_path": "/path/to/file",
-            "file_hash": "sha256:...",
-            "file_size": 12345
+            "file_path": "/path/to/file"
         }
+
+        The file is hashed here; any file_hash or file_size sent is ignored.
         """
         try:
             data = request.get_json()
@@ -207,12 +218,10 @@ def create_app(config_name: str = "default"):
                 }), 400
 
             file_path = data.get("file_path")
-            file_hash = data.get("file_hash")
-            file_size = data.get("file_size")
 
-            if not all([file_path, file_hash, file_size]):
+            if not file_path:
                 return jsonify({
-                    "error": "file_path, file_hash, and file_size are required",
+                    "error": "file_path is required",
                     "timestamp": datetime.utcnow().isoformat()
                 }), 400
 
@@ -225,7 +234,7 @@ def create_app(config_name: str = "default"):
                 }), 404
 
             # Perform virus scan
-            is_clean, scan_result = file_validator.virus_scanner.scan_file(file_path, file_hash, file_size)
+            is_clean, scan_result = file_validator.virus_scanner.scan_file(file_path)
 
             response = {
                 "success": is_clean,
@@ -236,6 +245,9 @@ def create_app(config_name: str = "default"):
             status_code = 200 if is_clean else 419
             return jsonify(response), status_code
 
+        except ScanQueueFullError as e:
+            return scan_queue_full(e)
+
         except Exception as e:
             logger.error(f"File scan failed: {e}")
             return jsonify({
@@ -314,16 +326,46 @@ def create_app(config_name: str = "default"):
         - user_id: User ID (optional)
         - account_id: Account ID (optional)
         - skip_rate_limit: Skip rate limiting (optional)
+
+        Headers (optional, take precedence over the form fields):
+        - X-User-Id, X-Account-Id: checked against the rate limits before the
+          body is read, so a limited client is refused before any virus scan
+        - X-Skip-Rate-Limit: Skip rate limiting
         """
+        sinks = []
+
+        def stream_factory(total_content_length, content_type, filename, content_length=None):
+            # Inspect the first file part as it arrives; any extra parts are only hashed
+            sink = file_validator.create_upload_sink(filename, inspect=not sinks)
+            sinks.append(sink)
+            return sink
+
         try:
+            # Form fields arrive only after the body has streamed through clamd, so check header identity first
+            user_id = request.headers.get('X-User-Id')
+            account_id = request.headers.get('X-Account-Id')
+            skip_rate_limit = request.headers.get('X-Skip-Rate-Limit', 'false').lower() == 'true'
+            rate_limit_info = None
+            if user_id and account_id and not skip_rate_limit:
+                within_limit, rate_limit_info = file_validator.check_upload_rate_limit(user_id, account_id)
+                if not within_limit:
+                    return jsonify({
+                        "success": False,
+                        "validation_result": file_validator.rate_limited_result(rate_limit_info),
+                        "timestamp": datetime.utcnow().isoformat()
+                    }), 400
+
+            # Parse the body ourselves so the upload streams through the sink instead of a temp file
+            _, form, files = parse_form_data(request.environ, stream_factory=stream_factory)
+
             # Check if file was uploaded
-            if 'file' not in request.files:
+            if 'file' not in files:
                 return jsonify({
                     "error": "No file provided",
                     "timestamp": datetime.utcnow().isoformat()
                 }), 400
 
-            file = request.files['file']
+            file = files['file']
             if file.filename == '':
                 return jsonify({
                     "error": "No file selected",
@@ -331,37 +373,28 @@ def create_app(config_name: str = "default"):
                 }), 400
 
             # Get form data
-            user_id = request.form.get('user_id')
-            account_id = request.form.get('account_id')
-            skip_rate_limit = request.form.get('skip_rate_limit', 'false').lower() == 'true'
-
-            # Save file temporarily
-            with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
-                file.save(tmp_file.name)
-                tmp_path = tmp_file.name
-
-            try:
-                # Perform complete validation
-                validation_result = file_validator.validate_file(
-                    tmp_path, file.filename, user_id, account_id, skip_rate_limit
-                )
-
-                # Clean up temporary file
-                os.unlink(tmp_path)
+            if not (user_id and account_id):
+                user_id = form.get('user_id')
+                account_id = form.get('account_id')
+            skip_rate_limit = skip_rate_limit or form.get('skip_rate_limit', 'false').lower() == 'true'
+
+            # Perform complete validation on what was gathered while the body streamed in
+            validation_result = file_validator.validate_upload(
+                file.stream, file.filename, user_id, account_id, skip_rate_limit,
+                rate_limit_info=rate_limit_info
+            )
 
-                # Return validation result
-                status_code = 200 if validation_result["final_status"] == "valid" else 400
-                return jsonify({
-                    "success": validation_result["final_status"] == "valid",
-                    "validation_result": validation_result,
-                    "timestamp": datetime.utcnow().isoformat()
-                }), status_code
+            # Return validation result
+            status_code = 200 if validation_result["final_status"] == "valid" else 400
+            return jsonify({
+                "success": validation_result["final_status"] == "valid",
+                "validation_result": validation_result,
+                "timestamp": datetime.utcnow().isoformat()
+            }), status_code
 
-            except Exception as e:
-                # Clean up temporary file on error
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
-                raise
+        except ScanQueueFullError as e:
+            logger.warning(f"File validation rejected: {e}")
+            return scan_queue_full(e)
 
         except Exception as e:
             logger.error(f"File validation failed: {e}")
@@ -371,6 +404,10 @@ def create_app(config_name: str = "default"):
                 "timestamp": datetime.utcnow().isoformat()
             }), 500
 
+        finally:
+            for sink in sinks:
+                sink.close()
+
     @app.route('/api/v1/validate/config', methods=['GET'])
     def get_validation_config():
         """Get validation configuration."""
@@ -411,6 +448,8 @@ def create_app(config_name: str = "default"):
                 "uptime_seconds": 0,  # Would track actual uptime
                 "components": {
                     "clamav": file_validator.virus_scanner.health_check(),
+                    "scan_cache": file_validator.virus_scanner.verdict_cache.get_statistics(),
+                    "scan_scheduler": file_validator.virus_scanner.scheduler.get_statistics(),
                     "rate_limiter": file_validator.rate_limiter.health_check() if file_validator.rate_limiter else {"status": "disabled"}
                 }
             }
@@ -35,6 +35,8 @@ class Config:
     ALLOWED_EXTENSIONS = os.environ.get("ALLOWED_EXTENSIONS", "pdf,png,jpg,jpeg,tiff,tif").split(",")
     ALLOWED_MIMETYPES = os.environ.get("ALLOWED_MIMETYPES",
         "application/pdf,image/png,image/jpeg,image/tiff").split(",")
+    # Images are spooled for PIL; up to this size they stay in memory
+    UPLOAD_SPOOL_MEMORY_BYTES = int(os.environ.get("UPLOAD_SPOOL_MEMORY_MB", 1)) * 1024 * 1024
 
     # Image Validation
     IMAGE_MAX_WIDTH = int(os.environ.get("IMAGE_MAX_WIDTH", 4000))
@@ -46,15 +48,26 @@ class Config:
     CLAMAV_PORT = int(os.environ.get("CLAMAV_PORT", 3310))
     CLAMAV_TIMEOUT = int(os.environ.get("CLAMAV_TIMEOUT", 30))
     CLAMAV_MAX_FILE_SIZE = int(os.environ.get("CLAMAV_MAX_FILE_SIZE_MB", 100)) * 1024 * 1024
+    # Upload INSTREAM sessions are dropped after this long, or once past
+    # CLAMAV_TIMEOUT when averaging under the minimum rate
+    SCAN_STREAM_MAX_SECONDS = int(os.environ.get("SCAN_STREAM_MAX_SECONDS", 300))
+    SCAN_STREAM_MIN_RATE = int(os.environ.get("SCAN_STREAM_MIN_RATE_KBPS", 16)) * 1024
 
     # Rate Limiting Configuration
     RATE_LIMIT_PER_USER_PER_DAY = int(os.environ.get("RATE_LIMIT_PER_USER_PER_DAY", 100))
     RATE_LIMIT_PER_ACCOUNT_PER_DAY = int(os.environ.get("RATE_LIMIT_PER_ACCOUNT_PER_DAY", 500))
     RATE_LIMIT_WINDOW_HOURS = int(os.environ.get("RATE_LIMIT_WINDOW_HOURS", 24))
     RATE_LIMIT_BYPASS_TOKEN = os.environ.get("RATE_LIMIT_BYPASS_TOKEN", None)
+    # "sorted_set" counts every request exactly; "sliding_window" keeps a fixed
+    # number of counters per user/account and prorates the oldest one
+    RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "sorted_set")
+    RATE_LIMIT_BUCKETS = int(os.environ.get("RATE_LIMIT_BUCKETS", 24))
 
     # Cache Configuration
     SCAN_CACHE_TTL = int(os.environ.get("SCAN_CACHE_TTL", 3600))  # 1 hour
+    SCAN_CACHE_LOCAL_SIZE = int(os.environ.get("SCAN_CACHE_LOCAL_SIZE", 1024))
+    # How often to re-read the signature version that scopes cached verdicts
+    SCAN_SIGNATURE_CHECK_INTERVAL = int(os.environ.get("SCAN_SIGNATURE_CHECK_INTERVAL", 60))
     RATE_LIMIT_CACHE_TTL = int(os.environ.get("RATE_LIMIT_CACHE_TTL", 86400))  # 24 hours
 
     # Security Configuration
@@ -79,6 +92,10 @@ class Config:
     # Performance Configuration
     MAX_CONCURRENT_SCANS = int(os.environ.get("MAX_CONCURRENT_SCANS", 10))
     SCAN_QUEUE_SIZE = int(os.environ.get("SCAN_QUEUE_SIZE", 100))
+    SCAN_QUEUE_TIMEOUT = float(os.environ.get("SCAN_QUEUE_TIMEOUT", 30))
+    # Uploads up to this size are scanned ahead of larger ones
+    SCAN_SMALL_FILE_BYTES = int(os.environ.get("SCAN_SMALL_FILE_KB", 1024)) * 1024
+    SCAN_SMALL_FILE_BURST = int(os.environ.get("SCAN_SMALL_FILE_BURST", 4))
     ASYNC_SCAN_ENABLED = os.environ.get("ASYNC_SCAN_ENABLED", "false").lower() == "true"
 
     @classmethod
@@ -98,6 +115,15 @@ class Config:
         if cls.RATE_LIMIT_PER_ACCOUNT_PER_DAY <= 0:
             errors.append("RATE_LIMIT_PER_ACCOUNT_PER_DAY must be positive")
 
+        if cls.RATE_LIMIT_BACKEND not in ("sorted_set", "sliding_window"):
+            errors.append("RATE_LIMIT_BACKEND must be 'sorted_set' or 'sliding_window'")
+
+        if cls.RATE_LIMIT_BUCKETS <= 0:
+            errors.append("RATE_LIMIT_BUCKETS must be positive")
+
+        if cls.MAX_CONCURRENT_SCANS <= 0:
+            errors.append("MAX_CONCURRENT_SCANS must be positive")
+
         if cls.IMAGE_MAX_WIDTH <= 0 or cls.IMAGE_MAX_HEIGHT <= 0:
             errors.append("Image dimensions must be positive")
 
@@ -113,7 +139,9 @@ class Config:
             "per_user_per_day": cls.RATE_LIMIT_PER_USER_PER_DAY,
             "per_account_per_day": cls.RATE_LIMIT_PER_ACCOUNT_PER_DAY,
             "window_hours": cls.RATE_LIMIT_WINDOW_HOURS,
-            "cache_ttl": cls.RATE_LIMIT_CACHE_TTL
+            "cache_ttl": cls.RATE_LIMIT_CACHE_TTL,
+            "backend": cls.RATE_LIMIT_BACKEND,
+            "buckets": cls.RATE_LIMIT_BUCKETS
         }
 
     @classmethod
@@ -124,7 +152,17 @@ class Config:
             "host": cls.CLAMAV_HOST,
             "port": cls.CLAMAV_PORT,
             "timeout": cls.CLAMAV_TIMEOUT,
-            "max_file_size": cls.CLAMAV_MAX_FILE_SIZE
+            "max_file_size": cls.CLAMAV_MAX_FILE_SIZE,
+            "stream_max_seconds": cls.SCAN_STREAM_MAX_SECONDS,
+            "stream_min_rate": cls.SCAN_STREAM_MIN_RATE,
+            "cache_ttl": cls.SCAN_CACHE_TTL,
+            "cache_local_size": cls.SCAN_CACHE_LOCAL_SIZE,
+            "signature_check_interval": cls.SCAN_SIGNATURE_CHECK_INTERVAL,
+            "max_concurrent_scans": cls.MAX_CONCURRENT_SCANS,
+            "scan_queue_size": cls.SCAN_QUEUE_SIZE,
+            "scan_queue_timeout": cls.SCAN_QUEUE_TIMEOUT,
+            "small_file_bytes": cls.SCAN_SMALL_FILE_BYTES,
+            "small_file_burst": cls.SCAN_SMALL_FILE_BURST
         }
 
     @classmethod
@@ -136,5 +174,6 @@ class Config:
             "allowed_extensions": cls.ALLOWED_EXTENSIONS,
             "allowed_mimetypes": cls.ALLOWED_MIMETYPES,
             "image_max_width": cls.IMAGE_MAX_WIDTH,
-            "image_max_height": cls.IMAGE_MAX_HEIGHT
+            "image_max_height": cls.IMAGE_MAX_HEIGHT,
+            "upload_spool_memory_bytes": cls.UPLOAD_SPOOL_MEMORY_BYTES
         }
\ No newline at end of file
@@ -0,0 +1,157 @@
+"""
+Scan admission control for DOX Validation Service.
+
+At most MAX_CONCURRENT_SCANS clamd scans run at once. A slot is taken only
+once an upload has been fully received and clamd is asked for its verdict,
+so slow uploads don't hold one. Scans beyond that wait in a bounded queue,
+small files first, and are turned away with a retry hint once the queue is
+full, so a burst queues up instead of slowing every scan at once.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+
+
+class ScanQueueFullError(Exception):
+    """Raised when a scan can't be admitted; carries a Retry-After hint in seconds."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ScanSlot:
+    """A granted scan slot; released exactly once, however many times release is called."""
+
+    def __init__(self, scheduler: "ScanScheduler"):
+        self._scheduler = scheduler
+        self._granted_at = time.monotonic()
+        self._released = False
+
+    def release(self) -> None:
+        """Return the slot to the scheduler."""
+        if not self._released:
+            self._released = True
+            self._scheduler._release(time.monotonic() - self._granted_at)
+
+    def __enter__(self) -> "ScanSlot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class _Waiter:
+    __slots__ = ("granted",)
+
+    def __init__(self):
+        self.granted = False
+
+
+class ScanScheduler:
+    """Bounded scan concurrency with a small-file priority lane.
+
+    Freed slots go to waiting small files first; after ``small_burst``
+    consecutive small grants a waiting large file is served, so large files
+    are delayed under load but never starved.
+    """
+
+    SMALL = "small"
+    LARGE = "large"
+
+    def __init__(self, max_concurrent: int = 10, queue_size: int = 100,
+                 small_file_bytes: int = 1024 * 1024, max_wait: float = 30.0,
+                 small_burst: int = 4):
+        self.max_concurrent = max_concurrent
+        self.queue_size = queue_size
+        self.small_file_bytes = small_file_bytes
+        self.max_wait = max_wait
+        self.small_burst = small_burst
+        self.active = 0
+        self.stats = {"admitted": 0, "queued": 0, "rejected": 0, "timed_out": 0}
+        self._lanes = {self.SMALL: deque(), self.LARGE: deque()}
+        self._small_streak = 0
+        # Smoothed slot hold time, used to estimate Retry-After
+        self._avg_hold = 1.0
+        self._cond = threading.Condition()
+
+    def lane_for(self, size_hint: Optional[int]) -> str:
+        """Lane for an upload of the given size; unknown sizes go in the large lane."""
+        if size_hint is not None and size_hint <= self.small_file_bytes:
+            return self.SMALL
+        return self.LARGE
+
+    def acquire(self, size_hint: Optional[int] = None) -> ScanSlot:
+        """Wait for a scan slot, raising ScanQueueFullError if none can be had."""
+        lane = self.lane_for(size_hint)
+
+        with self._cond:
+            if self.active < self.max_concurrent and not self._waiting():
+                self.active += 1
+                self.stats["admitted"] += 1
+                return ScanSlot(self)
+
+            if self._waiting() >= self.queue_size:
+                self.stats["rejected"] += 1
+                raise ScanQueueFullError("Scan queue is full", self.retry_after())
+
+            waiter = _Waiter()
+            self._lanes[lane].append(waiter)
+            self.stats["queued"] += 1
+            deadline = time.monotonic() + self.max_wait
+
+            while not waiter.granted:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._lanes[lane].remove(waiter)
+                    self.stats["timed_out"] += 1
+                    raise ScanQueueFullError("Timed out waiting for a scan slot", self.retry_after())
+                self._cond.wait(remaining)
+
+            self.stats["admitted"] += 1
+            return ScanSlot(self)
+
+    def _release(self, held_for: float) -> None:
+        """Free a slot and hand it to the next waiter."""
+        with self._cond:
+            self.active -= 1
+            self._avg_hold = 0.8 * self._avg_hold + 0.2 * held_for
+            self._grant_waiters()
+            self._cond.notify_all()
+
+    def _grant_waiters(self) -> None:
+        """Grant free slots to waiters in lane priority order; caller holds the lock."""
+        small, large = self._lanes[self.SMALL], self._lanes[self.LARGE]
+        while self.active < self.max_concurrent and (small or large):
+            if small and (not large or self._small_streak < self.small_burst):
+                waiter = small.popleft()
+                self._small_streak += 1
+            else:
+                waiter = large.popleft()
+                self._small_streak = 0
+            waiter.granted = True
+            self.active += 1
+
+    def _waiting(self) -> int:
+        return len(self._lanes[self.SMALL]) + len(self._lanes[self.LARGE])
+
+    def retry_after(self) -> int:
+        """Seconds until a new scan would likely be admitted."""
+        backlog = self._waiting() + 1
+        return max(1, math.ceil(self._avg_hold * backlog / self.max_concurrent))
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get slot usage, queue depth per lane and admission counters."""
+        with self._cond:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "active": self.active,
+                "queue_size": self.queue_size,
+                "waiting_small": len(self._lanes[self.SMALL]),
+                "waiting_large": len(self._lanes[self.LARGE]),
+                "avg_scan_seconds": round(self._avg_hold, 3),
+                **self.stats
+            }
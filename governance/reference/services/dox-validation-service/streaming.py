@@ -0,0 +1,180 @@
+"""
+Single-pass upload inspection for DOX Validation Service.
+
+Upload bytes are teed, as they arrive, through the SHA-256 hasher, a header
+buffer for magic-byte sniffing and a ClamAV INSTREAM session, so a file is
+read exactly once. Only files whose format check needs the whole file
+(images, opened by PIL) are spooled.
+"""
+
+import hashlib
+import socket
+import struct
+import tempfile
+import time
+from typing import Any, Optional, Tuple, Union
+
+
+# Enough for libmagic to identify every allowed type
+HEADER_BYTES = 8192
+
+# Formats whose validation parses the whole file rather than its header
+SPOOLED_EXTENSIONS = ("png", "jpg", "jpeg", "tiff", "tif")
+
+# clamd rejects INSTREAM chunks above its StreamMaxLength; stay well below it
+MAX_INSTREAM_CHUNK = 1024 * 1024
+
+
+class ClamdStream:
+    """A ClamAV INSTREAM session fed chunk by chunk while the upload arrives.
+
+    The session holds a clamd connection for as long as the client takes to
+    upload, so it is dropped once it has been open ``max_seconds``, or once
+    it has been open ``timeout`` seconds and averaged under ``min_rate``
+    bytes per second.
+    """
+
+    def __init__(self, address: Union[str, Tuple[str, int]], timeout: float,
+                 max_seconds: float = 300.0, min_rate: int = 0):
+        self.timeout = timeout
+        self.max_seconds = max_seconds
+        self.min_rate = min_rate
+        self._opened_at = time.monotonic()
+        self._sent = 0
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        self._sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            self._sock.settimeout(timeout)
+            self._sock.connect(address)
+            self._sock.sendall(b"zINSTREAM\0")
+        except OSError:
+            self.close()
+            raise
+
+    def send(self, data: bytes) -> None:
+        """Forward a chunk as length-prefixed INSTREAM parts."""
+        self._check_pace()
+        view = memoryview(data)
+        for start in range(0, len(view), MAX_INSTREAM_CHUNK):
+            part = view[start:start + MAX_INSTREAM_CHUNK]
+            self._sock.sendall(struct.pack("!L", len(part)))
+            self._sock.sendall(part)
+        self._sent += len(data)
+
+    def _check_pace(self) -> None:
+        """Raise TimeoutError if the upload is past its deadline or below the minimum rate."""
+        elapsed = time.monotonic() - self._opened_at
+        if elapsed > self.max_seconds:
+            raise TimeoutError(f"Upload still streaming after {self.max_seconds:.0f}s")
+        if elapsed > self.timeout and self._sent < self.min_rate * elapsed:
+            raise TimeoutError(f"Upload slower than {self.min_rate} bytes/s")
+
+    def finish(self) -> str:
+        """End the stream and return clamd's verdict, e.g. ``stream: OK``."""
+        try:
+            self._sock.sendall(struct.pack("!L", 0))
+            reply = b""
+            while not reply.endswith(b"\0"):
+                data = self._sock.recv(4096)
+                if not data:
+                    break
+                reply += data
+            return reply.rstrip(b"\0").decode("utf-8", "replace").strip()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Drop the session; clamd never scans a stream that wasn't finished."""
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+class UploadInspector:
+    """Writable sink that hashes, sniffs and virus-scans bytes as they are written.
+
+    Usable as the container returned by werkzeug's ``stream_factory``, or fed
+    from a file on disk.
+    """
+
+    def __init__(self, filename: str, max_size: int, virus_scanner: Any = None,
+                 spool: bool = False, spool_max_memory: int = 1024 * 1024):
+        self.filename = filename
+        self.max_size = max_size
+        self.size = 0
+        self.header = b""
+        self.scan_error: Optional[str] = None
+        self.clamd_stream: Optional[ClamdStream] = None
+        self.spool = tempfile.SpooledTemporaryFile(max_size=spool_max_memory) if spool else None
+        self._hasher = hashlib.sha256()
+
+        if virus_scanner is not None:
+            try:
+                self.clamd_stream = virus_scanner.open_stream()
+            except Exception as e:
+                self.scan_error = f"Could not open scan stream: {e}"
+
+    @property
+    def file_hash(self) -> str:
+        """SHA-256 of everything written so far."""
+        return f"sha256:{self._hasher.hexdigest()}"
+
+    def write(self, data: bytes) -> int:
+        """Inspect one chunk of the upload."""
+        self._hasher.update(data)
+        if len(self.header) < HEADER_BYTES:
+            self.header += data[:HEADER_BYTES - len(self.header)]
+        self.size += len(data)
+
+        if self.size > self.max_size:
+            # The upload will be rejected on size; stop paying for scanning and spooling
+            self.cancel_scan()
+            self._discard_spool()
+            return len(data)
+
+        if self.spool is not None:
+            self.spool.write(data)
+
+        if self.clamd_stream is not None:
+            try:
+                self.clamd_stream.send(data)
+            except OSError as e:
+                self.scan_error = f"Scan stream failed: {e}"
+                self.cancel_scan()
+
+        return len(data)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        """Rewind the spool (werkzeug rewinds every container once a part is written)."""
+        return self.spool.seek(offset, whence) if self.spool is not None else 0
+
+    def tell(self) -> int:
+        return self.spool.tell() if self.spool is not None else self.size
+
+    def read(self, size: int = -1) -> bytes:
+        return self.spool.read(size) if self.spool is not None else b""
+
+    def finish_scan(self) -> str:
+        """Finish the INSTREAM session and return clamd's reply."""
+        if self.clamd_stream is None:
+            raise ConnectionError(self.scan_error or "Scan stream not open")
+
+        clamd_stream, self.clamd_stream = self.clamd_stream, None
+        return clamd_stream.finish()
+
+    def cancel_scan(self) -> None:
+        """Drop the scan session without asking clamd for a verdict."""
+        if self.clamd_stream is not None:
+            self.clamd_stream.close()
+            self.clamd_stream = None
+
+    def _discard_spool(self) -> None:
+        if self.spool is not None:
+            self.spool.close()
+            self.spool = None
+
+    def close(self) -> None:
+        """Release the scan session and spool."""
+        self.cancel_scan()
+        self._discard_spool()
@@ -4,14 +4,17 @@ Validation components for DOX Validation Service.
 Provides file validation, virus scanning, and rate limiting functionality.
 """
 
-import hashlib
+import json
 import redis
 import logging
 import socket
 import struct
 import os
 import tempfile
+import threading
 import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, Tuple, List
 from pathlib import Path
@@ -29,18 +32,119 @@ except ImportError:
     CLAMD_AVAILABLE = False
 
 from .config import Config
+from .streaming import ClamdStream, UploadInspector, SPOOLED_EXTENSIONS
+from .scan_scheduler import ScanScheduler, ScanQueueFullError
 
 
 logger = logging.getLogger(__name__)
 
 
+class ScanVerdictCache:
+    """Scan verdicts keyed by file hash and signature version, with a local LRU in front of Redis.
+
+    The signature version is part of the key, so a signature update makes
+    every earlier verdict unreachable without an explicit flush.
+    """
+
+    def __init__(self, redis_client=None, ttl_seconds: int = 3600, local_size: int = 1024):
+        """Initialize scan verdict cache."""
+        self.redis_client = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.local_size = local_size
+        self.stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "stores": 0}
+        # key -> (expires_at, verdict), least recently used first
+        self._local: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, file_hash: str, signature_version: str) -> str:
+        return f"scan_verdict:{signature_version}:{file_hash}"
+
+    def get(self, file_hash: str, signature_version: str) -> Optional[Dict[str, Any]]:
+        """Get the cached verdict for a file under the current signatures."""
+        key = self._key(file_hash, signature_version)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None and entry[0] > now:
+                self._local.move_to_end(key)
+                self.stats["local_hits"] += 1
+                return dict(entry[1])
+            if entry is not None:
+                del self._local[key]
+
+        if self.redis_client:
+            try:
+                data = self.redis_client.get(key)
+                if data:
+                    verdict = json.loads(data)
+                    self._remember(key, verdict, now)
+                    with self._lock:
+                        self.stats["redis_hits"] += 1
+                    return dict(verdict)
+            except Exception as e:
+                logger.error(f"Scan verdict cache read failed: {e}")
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def put(self, file_hash: str, signature_version: str, verdict: Dict[str, Any]) -> None:
+        """Cache a definitive (clean or infected) verdict."""
+        key = self._key(file_hash, signature_version)
+        self._remember(key, verdict, time.monotonic())
+
+        if self.redis_client:
+            try:
+                self.redis_client.setex(key, self.ttl_seconds, json.dumps(verdict))
+            except Exception as e:
+                logger.error(f"Scan verdict cache write failed: {e}")
+
+        with self._lock:
+            self.stats["stores"] += 1
+
+    def _remember(self, key: str, verdict: Dict[str, Any], now: float) -> None:
+        """Store a verdict in the local LRU, evicting the least recently used."""
+        with self._lock:
+            self._local[key] = (now + self.ttl_seconds, verdict)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the local LRU size."""
+        with self._lock:
+            lookups = self.stats["local_hits"] + self.stats["redis_hits"] + self.stats["misses"]
+            hits = lookups - self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "local_entries": len(self._local),
+                "ttl_seconds": self.ttl_seconds
+            }
+
+
 class VirusScanner:
     """Virus scanning using ClamAV."""
 
-    def __init__(self):
+    def __init__(self, redis_client=None):
         """Initialize virus scanner."""
         self.config = Config.get_clamav_config()
         self.clamd_conn = None
+        self.verdict_cache = ScanVerdictCache(
+            redis_client,
+            ttl_seconds=self.config["cache_ttl"],
+            local_size=self.config["cache_local_size"]
+        )
+        self.scheduler = ScanScheduler(
+            max_concurrent=self.config["max_concurrent_scans"],
+            queue_size=self.config["scan_queue_size"],
+            small_file_bytes=self.config["small_file_bytes"],
+            max_wait=self.config["scan_queue_timeout"],
+            small_burst=self.config["small_file_burst"]
+        )
+        self._signature_version: Optional[str] = None
+        self._signature_checked_at = 0.0
         self._initialize_clamav()
 
     def _initialize_clamav(self):
@@ -79,18 +183,98 @@ class VirusScanner:
                 logger.error(f"❌ Failed to connect to ClamAV: {e}")
                 self.clamd_conn = None
 
-    def scan_file(self, file_path: str, file_hash: str, file_size: int) -> Tuple[bool, Dict[str, Any]]:
+    def signature_version(self) -> Optional[str]:
+        """Engine and signature database version, e.g. ``1.0.1/26800``; re-read periodically."""
+        now = time.monotonic()
+        if self._signature_version and now - self._signature_checked_at < self.config["signature_check_interval"]:
+            return self._signature_version
+
+        try:
+            # clamd reports "ClamAV <engine>/<daily db version>/<db date>"
+            parts = self.clamd_conn.version().strip().split("/")
+            version = "/".join(parts[:2]).replace("ClamAV ", "")
+            if version != self._signature_version:
+                logger.info(f"ClamAV signature version: {version}")
+            self._signature_version = version
+        except Exception as e:
+            # Without a version we can't tell when verdicts go stale, so don't cache
+            logger.error(f"Failed to read ClamAV signature version: {e}")
+            self._signature_version = None
+
+        self._signature_checked_at = now
+        return self._signature_version
+
+    def _cached_scan(self, file_hash: str, signature_version: Optional[str]) -> Optional[Tuple[bool, Dict[str, Any]]]:
+        """Get a previous verdict for this content under the current signatures."""
+        if not signature_version:
+            return None
+
+        verdict = self.verdict_cache.get(file_hash, signature_version)
+        if verdict is None:
+            return None
+
+        logger.info(f"Virus scan verdict from cache: {file_hash} ({verdict['scan_result']})")
+        verdict["cached"] = True
+        return verdict["scan_result"] == "clean", verdict
+
+    def _remember_scan(self, signature_version: Optional[str], file_hash: str,
+                       result: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
+        """Cache a definitive verdict and pass the scan result through."""
+        if signature_version and result["scan_result"] in ("clean", "infected"):
+            self.verdict_cache.put(file_hash, signature_version, {**result, "signature_version": signature_version})
+        return result["scan_result"] == "clean", result
+
+    def scan_file(self, file_path: str) -> Tuple[bool, Dict[str, Any]]:
         """
-        Scan file for viruses.
+        Scan a file on disk for viruses.
+
+        The file is hashed here as it is streamed to ClamAV, so the verdict
+        is cached under the hash of the bytes that were actually scanned.
 
         Args:
             file_path: Path to file to scan
-            file_hash: SHA256 hash of file
-            file_size: File size in bytes
 
         Returns:
             Tuple of (is_clean, scan_result)
         """
+        upload = UploadInspector(os.path.basename(file_path), max_size=self.config["max_file_size"],
+                                 virus_scanner=self)
+        try:
+            with open(file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(64 * 1024), b""):
+                    upload.write(chunk)
+            return self.scan_stream(upload)
+        finally:
+            upload.close()
+
+    def open_stream(self) -> Optional[ClamdStream]:
+        """Open an INSTREAM session for an upload that is still arriving.
+
+        Sessions are not admission-controlled: clamd only buffers the bytes
+        until the stream is finished, and slow senders are cut off by the
+        stream's deadline and minimum rate. Scan slots are taken in
+        ``scan_stream``, when clamd actually scans.
+        """
+        if not self.clamd_conn:
+            return None
+
+        # pyclamd keeps the socket path on Unix connections
+        address = getattr(self.clamd_conn, "unix_socket", None) or (self.config["host"], self.config["port"])
+        return ClamdStream(address, self.config["timeout"],
+                           max_seconds=self.config["stream_max_seconds"],
+                           min_rate=self.config["stream_min_rate"])
+
+    def scan_stream(self, upload: UploadInspector) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Finish the scan of an upload streamed to ClamAV as it was received.
+
+        Args:
+            upload: Inspector the upload's bytes were written to
+
+        Returns:
+            Tuple of (is_clean, scan_result)
+        """
+        file_hash, file_size = upload.file_hash, upload.size
         if not self.clamd_conn:
             return True, {
                 "scan_result": "clean",
@@ -108,53 +292,51 @@ class VirusScanner:
                 "message": f"File too large for virus scan (max: {self.config['max_file_size']} bytes)"
             }
 
+        signature_version = self.signature_version()
+        cached = self._cached_scan(file_hash, signature_version)
+        if cached:
+            # Seen before: drop the stream so clamd never scans it
+            upload.cancel_scan()
+            return cached
+
         start_time = time.time()
+        scan_details = {
+            "scanner": "clamav",
+            "file_hash": file_hash,
+            "file_size": file_size,
+            "timestamp": datetime.utcnow().isoformat()
+        }
 
         try:
-            # Perform scan
-            scan_result = self.clamd_conn.scan_file(file_path)
+            # The bytes are already at clamd; the slot covers the scan and the verdict
+            with self.scheduler.acquire(file_size):
+                reply = upload.finish_scan()
             scan_time = time.time() - start_time
 
-            if scan_result is None:
-                # No threats found
+            if reply.endswith("OK"):
                 logger.info(f"✅ Virus scan passed: {file_hash} ({scan_time:.2f}s)")
-                return True, {
-                    "scan_result": "clean",
-                    "scan_time": scan_time,
-                    "scanner": "clamav",
-                    "file_hash": file_hash,
-                    "file_size": file_size,
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-
-            else:
-                # Threat detected
-                file_path_result = scan_result.get(file_path, "UNKNOWN")
-                threat_name = file_path_result.split('FOUND')[0].strip() if 'FOUND' in file_path_result else file_path_result
+                return self._remember_scan(signature_version, file_hash,
+                                           {"scan_result": "clean", "scan_time": scan_time, **scan_details})
 
+            if reply.endswith("FOUND"):
+                threat_name = reply[:-len("FOUND")].split(":", 1)[-1].strip()
                 logger.warning(f"🚨 Virus detected: {file_hash} - {threat_name}")
-                return False, {
+                return self._remember_scan(signature_version, file_hash, {
                     "scan_result": "infected",
                     "scan_time": scan_time,
-                    "scanner": "clamav",
-                    "file_hash": file_hash,
-                    "file_size": file_size,
                     "threat_name": threat_name,
-                    "timestamp": datetime.utcnow().isoformat()
-                }
+                    **scan_details
+                })
+
+            raise Exception(f"Unexpected clamd reply: {reply}")
+
+        except ScanQueueFullError:
+            raise
 
         except Exception as e:
             scan_time = time.time() - start_time
             logger.error(f"❌ Virus scan failed for {file_hash}: {e}")
-            return False, {
-                "scan_result": "error",
-                "scan_time": scan_time,
-                "scanner": "clamav",
-                "file_hash": file_hash,
-                "file_size": file_size,
-                "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            return False, {"scan_result": "error", "scan_time": scan_time, "error": str(e), **scan_details}
 
     def health_check(self) -> Dict[str, Any]:
         """Check virus scanner health."""
@@ -177,13 +359,87 @@ class VirusScanner:
             return {"status": "unhealthy", "error": str(e)}
 
 
+# Trims, counts and (when both keys are within limits and recording is asked
+# for) records a request against the user and account windows atomically.
+# KEYS: user key, account key
+# ARGV: now, window start, trim before, user limit, account limit, member, ttl, record
+RATE_LIMIT_SCRIPT = """
+local counts = {}
+for i, key in ipairs(KEYS) do
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', '(' .. ARGV[3])
+    counts[i] = redis.call('ZCOUNT', key, ARGV[2], '+inf')
+end
+
+local recorded = 0
+if ARGV[8] == '1' and counts[1] < tonumber(ARGV[4]) and counts[2] < tonumber(ARGV[5]) then
+    for _, key in ipairs(KEYS) do
+        redis.call('ZADD', key, ARGV[1], ARGV[6])
+        redis.call('EXPIRE', key, ARGV[7])
+    end
+    recorded = 1
+end
+
+return {counts[1], counts[2], recorded}
+"""
+
+
+# Sliding-window estimate from per-bucket counters in one hash per key; buckets
+# that fell out of the retained range are deleted, so each hash stays at most
+# `keep` fields. The oldest bucket is weighted by how much of it is still
+# inside the window.
+# KEYS: user key, account key
+# ARGV: now, window seconds, bucket seconds, buckets kept, user limit, account limit, ttl, record
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window_start = now - tonumber(ARGV[2])
+local bucket_seconds = tonumber(ARGV[3])
+local current = math.floor(now / bucket_seconds)
+local oldest_kept = current - tonumber(ARGV[4]) + 1
+
+local counts = {}
+for i, key in ipairs(KEYS) do
+    local total = 0
+    local fields = redis.call('HGETALL', key)
+    for j = 1, #fields, 2 do
+        local bucket = tonumber(fields[j])
+        if bucket < oldest_kept then
+            redis.call('HDEL', key, fields[j])
+        else
+            local bucket_end = (bucket + 1) * bucket_seconds
+            if bucket_end > window_start then
+                local overlap = math.min(1, (bucket_end - window_start) / bucket_seconds)
+                total = total + tonumber(fields[j + 1]) * overlap
+            end
+        end
+    end
+    counts[i] = math.floor(total)
+end
+
+local recorded = 0
+if ARGV[8] == '1' and counts[1] < tonumber(ARGV[5]) and counts[2] < tonumber(ARGV[6]) then
+    for _, key in ipairs(KEYS) do
+        redis.call('HINCRBY', key, current, 1)
+        redis.call('EXPIRE', key, ARGV[7])
+    end
+    recorded = 1
+end
+
+return {counts[1], counts[2], recorded}
+"""
+
+
 class RateLimiter:
     """Rate limiting using Redis."""
 
+    backend = "sorted_set"
+    key_prefix = "rate_limit"
+    script = RATE_LIMIT_SCRIPT
+
     def __init__(self, redis_client):
         """Initialize rate limiter."""
         self.redis_client = redis_client
         self.config = Config.get_rate_limit_config()
+        self._script = redis_client.register_script(self.script) if redis_client else None
 
     def check_rate_limit(self, user_id: str, account_id: str,
                         window_hours: int = None) -> Tuple[bool, Dict[str, Any]]:
@@ -198,6 +454,29 @@ class RateLimiter:
         Returns:
             Tuple of (within_limit, limit_info)
         """
+        return self._run_script(user_id, account_id, window_hours, record=False)
+
+    def check_and_record(self, user_id: str, account_id: str,
+                         window_hours: int = None) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Check rate limits and, if within them, record the request in one atomic step.
+
+        Concurrent requests can't all pass the check before any of them is
+        recorded, which separate check_rate_limit/record_request calls allow.
+
+        Args:
+            user_id: User identifier
+            account_id: Account identifier
+            window_hours: Time window (defaults to config)
+
+        Returns:
+            Tuple of (within_limit, limit_info)
+        """
+        return self._run_script(user_id, account_id, window_hours, record=True)
+
+    def _run_script(self, user_id: str, account_id: str, window_hours: Optional[int],
+                    record: bool) -> Tuple[bool, Dict[str, Any]]:
+        """Evaluate the rate limit script for both keys in a single round trip."""
         if not self.redis_client:
             return True, {
                 "within_limit": True,
@@ -207,22 +486,13 @@ class RateLimiter:
             }
 
         window_hours = window_hours or self.config["window_hours"]
-        window_seconds = window_hours * 3600
-        current_time = int(time.time())
-        window_start = current_time - window_seconds
+        user_limit = self.config["per_user_per_day"]
+        account_limit = self.config["per_account_per_day"]
 
         try:
-            # Check user rate limit
-            user_key = f"rate_limit:user:{user_id}"
-            user_count = self._count_requests(user_key, window_start, current_time)
-
-            # Check account rate limit
-            account_key = f"rate_limit:account:{account_id}"
-            account_count = self._count_requests(account_key, window_start, current_time)
-
-            # Check against limits
-            user_limit = self.config["per_user_per_day"]
-            account_limit = self.config["per_account_per_day"]
+            user_count, account_count, recorded = self._evaluate(
+                self._keys(user_id, account_id), window_hours, user_limit, account_limit, record
+            )
 
             within_user_limit = user_count < user_limit
             within_account_limit = account_count < account_limit
@@ -238,6 +508,9 @@ class RateLimiter:
                 "timestamp": datetime.utcnow().isoformat()
             }
 
+            if record:
+                result["recorded"] = bool(recorded)
+
             if not within_limit:
                 if not within_user_limit:
                     result["violation"] = "user_limit_exceeded"
@@ -254,38 +527,48 @@ class RateLimiter:
                 "error": str(e)
             }
 
+    def _keys(self, user_id: str, account_id: str) -> List[str]:
+        return [f"{self.key_prefix}:user:{user_id}", f"{self.key_prefix}:account:{account_id}"]
+
+    def _evaluate(self, keys: List[str], window_hours: int, user_limit: int,
+                  account_limit: int, record: bool) -> List[int]:
+        """Run the script; returns [user_count, account_count, recorded]."""
+        current_time = time.time()
+        window_start = current_time - window_hours * 3600
+        # Only trim what the configured window no longer needs, so a short ad-hoc
+        # window doesn't discard requests the daily limit still counts
+        trim_before = min(window_start, current_time - self.config["window_hours"] * 3600)
+
+        return self._script(
+            keys=keys,
+            args=[current_time, window_start, trim_before, user_limit, account_limit,
+                  self._member(current_time), self.config["cache_ttl"], 1 if record else 0]
+        )
+
     def record_request(self, user_id: str, account_id: str):
         """Record a request for rate limiting."""
         if not self.redis_client:
             return
 
         try:
-            current_time = int(time.time())
+            current_time = time.time()
+            member = self._member(current_time)
             ttl = self.config["cache_ttl"]
 
-            # Record user request
-            user_key = f"rate_limit:user:{user_id}"
-            self.redis_client.zadd(user_key, {str(current_time): current_time})
-            self.redis_client.expire(user_key, ttl)
-
-            # Record account request
-            account_key = f"rate_limit:account:{account_id}"
-            self.redis_client.zadd(account_key, {str(current_time): current_time})
-            self.redis_client.expire(account_key, ttl)
+            # Record user and account requests in one round trip
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in self._keys(user_id, account_id):
+                pipe.zadd(key, {member: current_time})
+                pipe.expire(key, ttl)
+            pipe.execute()
 
         except Exception as e:
             logger.error(f"Failed to record rate limit request: {e}")
 
-    def _count_requests(self, key: str, window_start: int, window_end: int) -> int:
-        """Count requests in time window."""
-        try:
-            # Remove old entries
-            self.redis_client.zremrangebyscore(key, 0, window_start)
-            # Count current entries
-            return self.redis_client.zcount(key, window_start, window_end)
-        except Exception as e:
-            logger.error(f"Failed to count requests for {key}: {e}")
-            return 0
+    @staticmethod
+    def _member(current_time: float) -> str:
+        """Unique sorted-set member, so requests in the same instant aren't merged."""
+        return f"{current_time:.6f}-{uuid.uuid4().hex}"
 
     def health_check(self) -> Dict[str, Any]:
         """Check rate limiter health."""
@@ -295,11 +578,69 @@ class RateLimiter:
         try:
             # Test Redis connection
             self.redis_client.ping()
-            return {"status": "healthy", "redis_available": True}
+            return {"status": "healthy", "redis_available": True, "backend": self.backend}
         except Exception as e:
             return {"status": "unhealthy", "redis_available": False, "error": str(e)}
 
 
+class SlidingWindowRateLimiter(RateLimiter):
+    """Approximate rate limiting with bucketed sliding-window counters.
+
+    Each user and account is one Redis hash of at most ``buckets + 1``
+    counters, instead of one sorted-set member per request, so memory per
+    key is constant. Counts are exact except for the oldest bucket, which is
+    prorated by how much of it is still inside the window.
+    """
+
+    backend = "sliding_window"
+    key_prefix = "rate_limit_sw"
+    script = SLIDING_WINDOW_SCRIPT
+
+    def __init__(self, redis_client):
+        """Initialize sliding-window rate limiter."""
+        super().__init__(redis_client)
+        self.buckets = self.config["buckets"]
+        self.bucket_seconds = self.config["window_hours"] * 3600 / self.buckets
+
+    def _evaluate(self, keys: List[str], window_hours: int, user_limit: int,
+                  account_limit: int, record: bool) -> List[int]:
+        """Run the script; returns [user_count, account_count, recorded]."""
+        return self._script(
+            keys=keys,
+            args=[time.time(), window_hours * 3600, self.bucket_seconds, self.buckets + 1,
+                  user_limit, account_limit, self.config["cache_ttl"], 1 if record else 0]
+        )
+
+    def record_request(self, user_id: str, account_id: str):
+        """Record a request for rate limiting."""
+        if not self.redis_client:
+            return
+
+        try:
+            bucket = int(time.time() // self.bucket_seconds)
+            ttl = self.config["cache_ttl"]
+
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in self._keys(user_id, account_id):
+                pipe.hincrby(key, bucket, 1)
+                pipe.expire(key, ttl)
+            pipe.execute()
+
+        except Exception as e:
+            logger.error(f"Failed to record rate limit request: {e}")
+
+
+RATE_LIMITER_BACKENDS = {
+    RateLimiter.backend: RateLimiter,
+    SlidingWindowRateLimiter.backend: SlidingWindowRateLimiter
+}
+
+
+def create_rate_limiter(redis_client) -> RateLimiter:
+    """Create the rate limiter selected by RATE_LIMIT_BACKEND."""
+    return RATE_LIMITER_BACKENDS[Config.RATE_LIMIT_BACKEND](redis_client)
+
+
 class FileValidator:
     """Main file validation coordinator."""
 
@@ -307,14 +648,68 @@ class FileValidator:
         """Initialize file validator."""
         self.config = Config.get_validation_config()
         self.redis_client = redis_client
-        self.virus_scanner = VirusScanner()
-        self.rate_limiter = RateLimiter(redis_client) if redis_client else None
+        self.virus_scanner = VirusScanner(redis_client)
+        self.rate_limiter = create_rate_limiter(redis_client) if redis_client else None
+
+    def create_upload_sink(self, filename: str, inspect: bool = True,
+                           spool: bool = True) -> UploadInspector:
+        """Create the sink an upload is streamed into.
+
+        Uploads whose extension will be rejected are hashed but never sent to
+        ClamAV; only formats validated beyond their header are spooled.
+        """
+        file_ext = Path(filename or "").suffix.lower().lstrip('.')
+        inspect = inspect and file_ext in self.config["allowed_extensions"]
+        return UploadInspector(
+            filename,
+            max_size=self.config["max_file_size_bytes"],
+            virus_scanner=self.virus_scanner if inspect else None,
+            spool=inspect and spool and file_ext in SPOOLED_EXTENSIONS,
+            spool_max_memory=self.config["upload_spool_memory_bytes"]
+        )
+
+    def check_upload_rate_limit(self, user_id: str = None,
+                                account_id: str = None) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Check and record an upload against the rate limits before its body is read.
+
+        Lets the caller turn a limited client away before any scan session is
+        opened; pass the returned info to validate_upload as rate_limit_info.
+
+        Args:
+            user_id: User ID for rate limiting
+            account_id: Account ID for rate limiting
+
+        Returns:
+            Tuple of (within_limit, rate_info)
+        """
+        if not (user_id and account_id and self.rate_limiter):
+            return True, {}
+        return self.rate_limiter.check_and_record(user_id, account_id)
+
+    def rate_limited_result(self, rate_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Validation result for an upload refused before its body was read."""
+        return {
+            "validation_timestamp": datetime.utcnow().isoformat(),
+            "steps_completed": [],
+            "steps_failed": ["rate_limit"],
+            "final_status": "rate_limited",
+            "errors": [{
+                "step": "rate_limit",
+                "error": "Rate limit exceeded",
+                "details": rate_info
+            }],
+            "warnings": []
+        }
 
     def validate_file(self, file_path: str, original_filename: str,
                      user_id: str = None, account_id: str = None,
                      skip_rate_limit: bool = False) -> Dict[str, Any]:
         """
-        Perform complete file validation.
+        Perform complete file validation of a file on disk.
+
+        The file is read once, feeding the hash, MIME sniffing and virus scan
+        together; image checks reopen it by path.
 
         Args:
             file_path: Path to file to validate
@@ -323,15 +718,48 @@ class FileValidator:
             account_id: Account ID for rate limiting
             skip_rate_limit: Skip rate limiting check
 
+        Returns:
+            Validation result dictionary
+        """
+        upload = self.create_upload_sink(original_filename, spool=False)
+        try:
+            with open(file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(64 * 1024), b""):
+                    upload.write(chunk)
+        except Exception:
+            upload.close()
+            raise
+
+        return self.validate_upload(upload, original_filename, user_id, account_id,
+                                    skip_rate_limit, file_path=file_path)
+
+    def validate_upload(self, upload: UploadInspector, original_filename: str,
+                        user_id: str = None, account_id: str = None,
+                        skip_rate_limit: bool = False,
+                        file_path: Optional[str] = None,
+                        rate_limit_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Perform complete file validation of an upload already written to a sink.
+
+        Args:
+            upload: Inspector holding the hash, header and open scan of the upload
+            original_filename: Original filename
+            user_id: User ID for rate limiting
+            account_id: Account ID for rate limiting
+            skip_rate_limit: Skip rate limiting check
+            file_path: Path of the file on disk, if any
+            rate_limit_info: Result of a check_upload_rate_limit call already
+                made for this upload; the check is not repeated
+
         Returns:
             Validation result dictionary
         """
         validation_start = time.time()
-        file_hash = self._calculate_file_hash(file_path)
+        file_hash = upload.file_hash
 
         try:
             # Get file info
-            file_size = os.path.getsize(file_path)
+            file_size = upload.size
             file_ext = Path(original_filename).suffix.lower().lstrip('.')
 
             # Initialize result
@@ -350,8 +778,13 @@ class FileValidator:
             }
 
             # Step 1: Check rate limiting
-            if not skip_rate_limit and user_id and account_id and self.rate_limiter:
-                within_limit, rate_info = self.rate_limiter.check_rate_limit(user_id, account_id)
+            if rate_limit_info is not None:
+                result["steps_completed"].append("rate_limit")
+                result["rate_limit_info"] = rate_limit_info
+
+            elif not skip_rate_limit and user_id and account_id and self.rate_limiter:
+                # Checks and records this request atomically
+                within_limit, rate_info = self.rate_limiter.check_and_record(user_id, account_id)
                 if not within_limit:
                     result["steps_failed"].append("rate_limit")
                     result["errors"].append({
@@ -365,9 +798,6 @@ class FileValidator:
                 result["steps_completed"].append("rate_limit")
                 result["rate_limit_info"] = rate_info
 
-                # Record this request
-                self.rate_limiter.record_request(user_id, account_id)
-
             # Step 2: File size validation
             if file_size > self.config["max_file_size_bytes"]:
                 result["steps_failed"].append("file_size")
@@ -397,7 +827,7 @@ class FileValidator:
             result["steps_completed"].append("file_extension")
 
             # Step 4: MIME type validation
-            mime_type = self._get_mime_type(file_path)
+            mime_type = self._get_mime_type(upload.header, original_filename)
             if mime_type not in self.config["allowed_mimetypes"]:
                 result["steps_failed"].append("mime_type")
                 result["errors"].append({
@@ -413,7 +843,7 @@ class FileValidator:
             result["mime_type"] = mime_type
 
             # Step 5: Virus scanning
-            is_clean, scan_result = self.virus_scanner.scan_file(file_path, file_hash, file_size)
+            is_clean, scan_result = self.virus_scanner.scan_stream(upload)
             if not is_clean:
                 result["steps_failed"].append("virus_scan")
                 result["errors"].append({
@@ -428,7 +858,9 @@ class FileValidator:
             result["virus_scan_result"] = scan_result
 
             # Step 6: Format-specific validation
-            format_valid, format_result = self._validate_format_specific(file_path, file_ext)
+            format_valid, format_result = self._validate_format_specific(
+                upload.header, file_path or upload.spool, file_ext
+            )
             if not format_valid:
                 result["steps_failed"].append("format_validation")
                 result["errors"].append({
@@ -448,6 +880,9 @@ class FileValidator:
 
             return result
 
+        except ScanQueueFullError:
+            raise
+
         except Exception as e:
             result["final_status"] = "error"
             result["errors"].append({
@@ -457,24 +892,20 @@ class FileValidator:
             })
             return result
 
-    def _calculate_file_hash(self, file_path: str) -> str:
-        """Calculate SHA256 hash of file."""
-        sha256_hash = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(chunk)
-        return f"sha256:{sha256_hash.hexdigest()}"
+        finally:
+            # Drops an unfinished scan (early rejections never cost clamd a scan) and the spool
+            upload.close()
 
-    def _get_mime_type(self, file_path: str) -> str:
-        """Get MIME type of file."""
+    def _get_mime_type(self, header: bytes, original_filename: str) -> str:
+        """Get MIME type from the file's leading bytes."""
         if MAGIC_AVAILABLE:
             try:
-                return magic.from_file(file_path, mime=True)
+                return magic.from_buffer(header, mime=True)
             except:
                 pass
 
         # Fallback to extension-based detection
-        ext = Path(file_path).suffix.lower()
+        ext = Path(original_filename).suffix.lower()
         mime_map = {
             '.pdf': 'application/pdf',
             '.png': 'image/png',
@@ -485,40 +916,43 @@ class FileValidator:
         }
         return mime_map.get(ext, 'application/octet-stream')
 
-    def _validate_format_specific(self, file_path: str, file_ext: str) -> Tuple[bool, Dict[str, Any]]:
-        """Perform format-specific validation."""
+    def _validate_format_specific(self, header: bytes, source: Any,
+                                  file_ext: str) -> Tuple[bool, Dict[str, Any]]:
+        """Perform format-specific validation.
+
+        ``source`` is a path or file object with the whole file; only image
+        checks read it.
+        """
         try:
             if file_ext == 'pdf':
-                return self._validate_pdf(file_path)
+                return self._validate_pdf(header)
             elif file_ext in ['png', 'jpg', 'jpeg', 'tiff', 'tif']:
-                return self._validate_image(file_path)
+                return self._validate_image(source)
             else:
                 return True, {"message": "No format-specific validation for this extension"}
 
         except Exception as e:
             return False, {"error": str(e)}
 
-    def _validate_pdf(self, file_path: str) -> Tuple[bool, Dict[str, Any]]:
+    def _validate_pdf(self, header: bytes) -> Tuple[bool, Dict[str, Any]]:
         """Validate PDF file structure."""
         try:
             # Simple PDF validation - check file signature
-            with open(file_path, 'rb') as f:
-                header = f.read(5)
-                if not header.startswith(b'%PDF-'):
-                    return False, {"error": "Invalid PDF signature"}
+            if not header.startswith(b'%PDF-'):
+                return False, {"error": "Invalid PDF signature"}
 
             return True, {"message": "PDF signature valid"}
 
         except Exception as e:
             return False, {"error": f"PDF validation failed: {e}"}
 
-    def _validate_image(self, file_path: str) -> Tuple[bool, Dict[str, Any]]:
-        """Validate image file."""
+    def _validate_image(self, source: Any) -> Tuple[bool, Dict[str, Any]]:
+        """Validate image file from a path or file object."""
         try:
             # Check image dimensions if PIL is available
             try:
                 from PIL import Image
-                with Image.open(file_path) as img:
+                with Image.open(source) as img:
                     width, height = img.size
                     max_width = self.config["image_max_width"]
                     max_height = self.config["image_max_height"]
@@ -10,6 +10,7 @@ from .engine import OrchestrationEngine
 from .state_manager import StateManager
 from .event_publisher import EventPublisher
 from .service_connector import ServiceConnector
+from .health_monitor import HealthMonitor
 
 __version__ = "1.0.0"
 __author__ = "DOX Automation Team"
@@ -19,5 +20,6 @@ __all__ = [
     "OrchestrationEngine",
     "StateManager",
     "EventPublisher",
-    "ServiceConnector"
+    "ServiceConnector",
+    "HealthMonitor"
 ]
\ No newline at end of file
@@ -5,10 +5,15 @@ Provides REST API endpoints for workflow orchestration, state management,
 and team coordination.
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 import os
 import sys
+import json
+import queue
+import time
+import atexit
+import threading
 from pathlib import Path
 from datetime import datetime
 import uuid
@@ -17,11 +22,18 @@ import uuid
 workflow_core_path = Path(__file__).parent.parent.parent / "libraries"
 sys.path.insert(0, str(workflow_core_path))
 
-from dox_workflow_core import WorkflowRunner, WorkflowState, RuleRegistry
+from dox_workflow_core import WorkflowRunner, AsyncWorkflowRunner, WorkflowState, RuleRegistry, RuleWatcher
 from .engine import OrchestrationEngine
 from .state_manager import StateManager as OrchestratorStateManager
 from .event_publisher import EventPublisher
+from .event_stream import EventStreamHub, CheckpointEventPublisher, TERMINAL_EVENTS
 from .service_connector import ServiceConnector
+from .health_monitor import HealthMonitor
+
+# Statuses after which a workflow publishes no further events
+TERMINAL_STATUSES = frozenset(
+    state.value for state in (WorkflowState.SUCCESS, WorkflowState.FAILED, WorkflowState.CANCELLED)
+)
 
 
 def create_app(config_name: str = "default"):
@@ -34,13 +46,51 @@ def create_app(config_name: str = "default"):
         "SERVICE_PORT": int(os.environ.get("SERVICE_PORT", 5000)),
         "MEMORY_BANK_PATH": os.environ.get("MEMORY_BANK_PATH", "strategy/memory-banks"),
         "WORKFLOW_RULES_PATH": os.environ.get("WORKFLOW_RULES_PATH", "strategy/workflows"),
+        "RULE_BUNDLE_PATH": os.environ.get("RULE_BUNDLE_PATH"),
+        "WORKFLOW_RECOVERY_ENABLED": os.environ.get("WORKFLOW_RECOVERY_ENABLED", "true").lower() == "true",
+        "WORKFLOW_RECOVERY_INTERVAL": float(os.environ.get("WORKFLOW_RECOVERY_INTERVAL", 60)),
+        "WORKFLOW_LEASE_SECONDS": int(os.environ.get("WORKFLOW_LEASE_SECONDS", 300)),
+        "WORKFLOW_INSTANCE_ID": os.environ.get("WORKFLOW_INSTANCE_ID"),
+        "RULES_HOT_RELOAD": os.environ.get("RULES_HOT_RELOAD", "false").lower() == "true",
+        "RULES_RELOAD_INTERVAL": float(os.environ.get("RULES_RELOAD_INTERVAL", 5)),
+        "WORKFLOW_RUNNER_MODE": os.environ.get("WORKFLOW_RUNNER_MODE", "sync").lower(),
+        "WORKFLOW_MAX_CONNECTIONS": int(os.environ.get("WORKFLOW_MAX_CONNECTIONS", 1000)),
+        "WORKFLOW_LIST_MAX_LIMIT": int(os.environ.get("WORKFLOW_LIST_MAX_LIMIT", 500)),
+        "HTTP_POOL_MAXSIZE": int(os.environ.get("HTTP_POOL_MAXSIZE", 20)),
+        "HTTP_POOL_BLOCK": os.environ.get("HTTP_POOL_BLOCK", "false").lower() == "true",
+        "HTTP_CONNECT_TIMEOUT": float(os.environ.get("HTTP_CONNECT_TIMEOUT", 3.05)),
+        "HTTP_READ_TIMEOUT": float(os.environ.get("HTTP_READ_TIMEOUT", 30)),
+        "HTTP2_ENABLED": os.environ.get("HTTP2_ENABLED", "false").lower() == "true",
+        "CIRCUIT_BREAKER_THRESHOLD": int(os.environ.get("CIRCUIT_BREAKER_THRESHOLD", 5)),
+        "CIRCUIT_BREAKER_RESET_TIMEOUT": float(os.environ.get("CIRCUIT_BREAKER_RESET_TIMEOUT", 30)),
+        "SERVICE_MAX_CONCURRENCY": int(os.environ.get("SERVICE_MAX_CONCURRENCY", 20)),
+        "SERVICE_BULKHEAD_WAIT": float(os.environ.get("SERVICE_BULKHEAD_WAIT", 0.25)),
+        "SERVICE_RESPONSE_CACHE_TTL": float(os.environ.get("SERVICE_RESPONSE_CACHE_TTL", 0)),
+        "SERVICE_RESPONSE_CACHE_SIZE": int(os.environ.get("SERVICE_RESPONSE_CACHE_SIZE", 1024)),
+        "HEALTH_PROBE_INTERVAL": float(os.environ.get("HEALTH_PROBE_INTERVAL", 15)),
+        "HEALTH_SNAPSHOT_TTL": float(os.environ.get("HEALTH_SNAPSHOT_TTL", 45)),
+        "EVENT_LOG_SEGMENT_BYTES": int(os.environ.get("EVENT_LOG_SEGMENT_BYTES", 1024 * 1024)),
+        "EVENT_LOG_RETAINED_SEGMENTS": int(os.environ.get("EVENT_LOG_RETAINED_SEGMENTS", 10)),
+        "EVENT_DELIVERY_MODE": os.environ.get("EVENT_DELIVERY_MODE", "best_effort").lower(),
+        "EVENT_QUEUE_SIZE": int(os.environ.get("EVENT_QUEUE_SIZE", 10000)),
+        "EVENT_BATCH_SIZE": int(os.environ.get("EVENT_BATCH_SIZE", 100)),
+        "EVENT_STREAM_QUEUE_SIZE": int(os.environ.get("EVENT_STREAM_QUEUE_SIZE", 100)),
+        "EVENT_STREAM_HEARTBEAT": float(os.environ.get("EVENT_STREAM_HEARTBEAT", 15)),
+        "EVENT_STREAM_SUBSCRIBE_TIMEOUT": float(os.environ.get("EVENT_STREAM_SUBSCRIBE_TIMEOUT", 5)),
         "REDIS_HOST": os.environ.get("REDIS_HOST", "localhost"),
         "REDIS_PORT": int(os.environ.get("REDIS_PORT", 6379)),
+        "STATE_CACHE_TTL": int(os.environ.get("STATE_CACHE_TTL", 86400)),
+        "STATE_NEGATIVE_CACHE_TTL": int(os.environ.get("STATE_NEGATIVE_CACHE_TTL", 10)),
         "POSTGRES_HOST": os.environ.get("POSTGRES_HOST", "localhost"),
         "POSTGRES_PORT": int(os.environ.get("POSTGRES_PORT", 5432)),
         "POSTGRES_DB": os.environ.get("POSTGRES_DB", "dox_workflows"),
         "POSTGRES_USER": os.environ.get("POSTGRES_USER", "dox_user"),
         "POSTGRES_PASSWORD": os.environ.get("POSTGRES_PASSWORD", "dox_password"),
+        "POSTGRES_POOL_MIN": int(os.environ.get("POSTGRES_POOL_MIN", 1)),
+        "POSTGRES_POOL_MAX": int(os.environ.get("POSTGRES_POOL_MAX", 10)),
+        "WRITE_BATCH_SIZE": int(os.environ.get("WRITE_BATCH_SIZE", 500)),
+        "WRITE_FLUSH_INTERVAL_MS": int(os.environ.get("WRITE_FLUSH_INTERVAL_MS", 200)),
+        "WRITE_MAX_PENDING": int(os.environ.get("WRITE_MAX_PENDING", 10000)),
         "DEBUG": os.environ.get("DEBUG", "false").lower() == "true"
     })
 
@@ -48,26 +98,77 @@ def create_app(config_name: str = "default"):
     CORS(app)
 
     # Initialize components
-    workflow_runner = WorkflowRunner(
-        service_name=app.config["SERVICE_NAME"],
-        memory_bank_path=app.config["MEMORY_BANK_PATH"]
-    )
-
+    service_connector = ServiceConnector(app.config)
     state_manager = OrchestratorStateManager(app.config)
+    # Flush write-behind buffers before the worker exits
+    atexit.register(state_manager.close)
     event_publisher = EventPublisher(app.config)
-    service_connector = ServiceConnector(app.config)
+    atexit.register(event_publisher.close)
+    # Checkpoints double as the progress feed for streaming clients
+    checkpoint_store = CheckpointEventPublisher(state_manager, event_publisher)
+
+    if app.config["WORKFLOW_RUNNER_MODE"] == "async":
+        # Workflows run on a background event loop; requests return once started
+        workflow_runner = AsyncWorkflowRunner(
+            service_name=app.config["SERVICE_NAME"],
+            memory_bank_path=app.config["MEMORY_BANK_PATH"],
+            max_connections=app.config["WORKFLOW_MAX_CONNECTIONS"],
+            checkpoint_store=checkpoint_store
+        )
+    else:
+        # Share the connector's keep-alive pools with API_CALL steps
+        workflow_runner = WorkflowRunner(
+            service_name=app.config["SERVICE_NAME"],
+            memory_bank_path=app.config["MEMORY_BANK_PATH"],
+            http_client=service_connector.http_pool,
+            checkpoint_store=checkpoint_store
+        )
+    event_stream_hub = EventStreamHub(event_publisher.redis_client, app.config)
+    if event_publisher.redis_client is not None:
+        # Subscribe at startup so the first stream request doesn't wait on it
+        event_stream_hub.start()
+    atexit.register(event_stream_hub.close)
+    health_monitor = HealthMonitor(service_connector, app.config, event_publisher)
     orchestration_engine = OrchestrationEngine(
         workflow_runner=workflow_runner,
         state_manager=state_manager,
         event_publisher=event_publisher,
-        service_connector=service_connector
+        service_connector=service_connector,
+        health_monitor=health_monitor
     )
 
+    # Probe downstream services in the background; handlers read the snapshot
+    health_monitor.start()
+
     # Load workflow rules
     rules_path = Path(__file__).parent.parent.parent / app.config["WORKFLOW_RULES_PATH"]
-    loaded_rules = workflow_runner.load_rules_from_directory(str(rules_path))
+    loaded_rules = workflow_runner.load_rules_from_directory(str(rules_path), app.config["RULE_BUNDLE_PATH"])
     app.logger.info(f"Loaded {loaded_rules} workflow rules from {rules_path}")
 
+    if app.config["WORKFLOW_RECOVERY_ENABLED"]:
+        # Resume workflows from their last checkpoint once their owner stops renewing its lease
+        def recover_workflows():
+            while True:
+                try:
+                    resumed = workflow_runner.recover_workflows()
+                    if resumed:
+                        app.logger.info(f"Resumed {len(resumed)} workflows from checkpoints")
+                except Exception as e:
+                    app.logger.error(f"Workflow recovery pass failed: {e}")
+                time.sleep(app.config["WORKFLOW_RECOVERY_INTERVAL"])
+
+        threading.Thread(target=recover_workflows, name="workflow-recovery", daemon=True).start()
+
+    if app.config["RULES_HOT_RELOAD"]:
+        # Swap in changed rules without a restart; running workflows keep their rule version
+        rule_watcher = RuleWatcher(
+            workflow_runner.rule_registry,
+            str(rules_path),
+            interval_seconds=app.config["RULES_RELOAD_INTERVAL"],
+            bundle_path=app.config["RULE_BUNDLE_PATH"]
+        )
+        rule_watcher.start()
+
     # Error handlers
     @app.errorhandler(400)
     def bad_request(error):
@@ -106,7 +207,7 @@ def create_app(config_name: str = "default"):
                 "workflow_engine": "healthy",
                 "state_manager": state_manager.health_check(),
                 "event_publisher": event_publisher.health_check(),
-                "service_connector": service_connector.health_check()
+                "service_connector": health_monitor.health_check()
             }
         })
 
@@ -182,6 +283,67 @@ def create_app(config_name: str = "default"):
                 "timestamp": datetime.utcnow().isoformat()
             }), 500
 
+    @app.route('/api/v1/workflows/<workflow_id>/events', methods=['GET'])
+    def stream_workflow_events(workflow_id):
+        """Stream workflow status updates as Server-Sent Events."""
+        if event_publisher.redis_client is None:
+            return jsonify({
+                "error": "Event streaming unavailable",
+                "message": "Redis is not connected",
+                "timestamp": datetime.utcnow().isoformat()
+            }), 503
+
+        # Subscribe before reading the status so no update falls in between
+        try:
+            subscriber = event_stream_hub.subscribe(workflow_id)
+        except RuntimeError as e:
+            return jsonify({
+                "error": "Event streaming unavailable",
+                "message": str(e),
+                "timestamp": datetime.utcnow().isoformat()
+            }), 503
+        try:
+            status = orchestration_engine.get_workflow_status(workflow_id)
+        except Exception:
+            event_stream_hub.unsubscribe(workflow_id, subscriber)
+            raise
+
+        if not status:
+            event_stream_hub.unsubscribe(workflow_id, subscriber)
+            return jsonify({
+                "error": "Workflow not found",
+                "workflow_id": workflow_id,
+                "timestamp": datetime.utcnow().isoformat()
+            }), 404
+
+        heartbeat = app.config["EVENT_STREAM_HEARTBEAT"]
+
+        def generate():
+            try:
+                yield f"event: workflow_status\ndata: {json.dumps(status, default=str)}\n\n"
+                if status.get("status") in TERMINAL_STATUSES:
+                    return
+
+                while True:
+                    try:
+                        event = subscriber.get(timeout=heartbeat)
+                    except queue.Empty:
+                        # Comment line keeps proxies from closing an idle stream
+                        yield ": heartbeat\n\n"
+                        continue
+
+                    yield f"event: {event['event_type']}\ndata: {json.dumps(event, default=str)}\n\n"
+                    if event["event_type"] in TERMINAL_EVENTS:
+                        return
+            finally:
+                event_stream_hub.unsubscribe(workflow_id, subscriber)
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
     @app.route('/api/v1/workflows/<workflow_id>/pause', methods=['POST'])
     def pause_workflow(workflow_id):
         """Pause a running workflow."""
@@ -265,27 +427,49 @@ def create_app(config_name: str = "default"):
 
     @app.route('/api/v1/workflows', methods=['GET'])
     def list_workflows():
-        """List all workflows with optional filtering."""
+        """List workflows with optional filtering, a page at a time or streamed as NDJSON."""
         try:
             status_filter = request.args.get("status")
             service_filter = request.args.get("service")
-            limit = int(request.args.get("limit", 50))
-            offset = int(request.args.get("offset", 0))
 
-            workflows = orchestration_engine.list_workflows(
+            if "offset" in request.args:
+                return jsonify({
+                    "error": "Invalid listing parameters",
+                    "message": "offset is no longer supported; pass the previous page's next_cursor as cursor",
+                    "timestamp": datetime.utcnow().isoformat()
+                }), 400
+
+            if request.args.get("format") == "ndjson":
+                # One workflow per line, read a keyset page at a time as the client consumes it
+                def generate():
+                    for workflow in orchestration_engine.iter_workflows(status_filter, service_filter):
+                        yield json.dumps(workflow) + "\n"
+
+                return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+            limit = max(1, min(int(request.args.get("limit", 50)), app.config["WORKFLOW_LIST_MAX_LIMIT"]))
+            page = orchestration_engine.list_workflows(
                 status_filter=status_filter,
                 service_filter=service_filter,
                 limit=limit,
-                offset=offset
+                cursor=request.args.get("cursor")
             )
 
             return jsonify({
                 "success": True,
-                "workflows": workflows,
-                "count": len(workflows),
+                "workflows": page["workflows"],
+                "count": len(page["workflows"]),
+                "next_cursor": page["next_cursor"],
                 "timestamp": datetime.utcnow().isoformat()
             })
 
+        except ValueError as e:
+            return jsonify({
+                "error": "Invalid listing parameters",
+                "message": str(e),
+                "timestamp": datetime.utcnow().isoformat()
+            }), 400
+
         except Exception as e:
             app.logger.error(f"Failed to list workflows: {e}")
             return jsonify({
@@ -334,14 +518,38 @@ def create_app(config_name: str = "default"):
                 "timestamp": datetime.utcnow().isoformat()
             }), 500
 
+    @app.route('/api/v1/rules/reload', methods=['POST'])
+    def reload_workflow_rules():
+        """Re-read workflow rules from disk and swap them in."""
+        try:
+            result = workflow_runner.rule_registry.reload_from_directory(
+                str(rules_path), app.config["RULE_BUNDLE_PATH"]
+            )
+            return jsonify({
+                "success": True,
+                **result,
+                "timestamp": datetime.utcnow().isoformat()
+            })
+
+        except Exception as e:
+            app.logger.error(f"Failed to reload workflow rules: {e}")
+            return jsonify({
+                "error": "Failed to reload workflow rules",
+                "message": str(e),
+                "timestamp": datetime.utcnow().isoformat()
+            }), 500
+
     @app.route('/api/v1/services/health', methods=['GET'])
     def check_services_health():
         """Check health of all connected services."""
         try:
             services_health = orchestration_engine.check_services_health()
+            snapshot = health_monitor.get_snapshot()
             return jsonify({
                 "success": True,
                 "services": services_health,
+                "refreshed_at": snapshot["refreshed_at"],
+                "stale": snapshot["stale"],
                 "timestamp": datetime.utcnow().isoformat()
             })
 
@@ -353,6 +561,26 @@ def create_app(config_name: str = "default"):
                 "timestamp": datetime.utcnow().isoformat()
             }), 500
 
+    @app.route('/api/v1/metrics', methods=['GET'])
+    def get_orchestration_metrics():
+        """Get orchestration engine metrics."""
+        try:
+            metrics = orchestration_engine.get_orchestration_metrics()
+            metrics["event_streams"] = event_stream_hub.get_statistics()
+            return jsonify({
+                "success": True,
+                "metrics": metrics,
+                "timestamp": datetime.utcnow().isoformat()
+            })
+
+        except Exception as e:
+            app.logger.error(f"Failed to get orchestration metrics: {e}")
+            return jsonify({
+                "error": "Failed to get orchestration metrics",
+                "message": str(e),
+                "timestamp": datetime.utcnow().isoformat()
+            }), 500
+
     return app
 
 
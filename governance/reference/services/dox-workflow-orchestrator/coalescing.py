@@ -0,0 +1,100 @@
+"""
+Request coalescing for Workflow Orchestrator.
+
+Identical concurrent calls share one in-flight request (single flight), and
+successful results can optionally be served from a short-TTL cache.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Hashable, Optional, Tuple
+
+
+class _Call:
+    """An in-flight call that followers wait on."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Runs one call per key at a time and hands its result to every waiter."""
+
+    def __init__(self, cache_ttl: float = 0.0, cache_size: int = 1024,
+                 cacheable: Optional[Callable[[Any], bool]] = None):
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.cacheable = cacheable or (lambda result: True)
+        self.stats = {"calls": 0, "coalesced": 0, "cache_hits": 0}
+        self._calls: Dict[Hashable, _Call] = {}
+        # LRU of key -> (expires_at, result)
+        self._cache: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Return fn()'s result, sharing it with identical calls made meanwhile."""
+        with self._lock:
+            cached = self._get_cached(key)
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                return copy.deepcopy(cached)
+
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats["calls"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # Followers get their own copy so callers can't mutate each other's results
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.error is None and self.cache_ttl > 0 and self.cacheable(call.result):
+                    self._cache[key] = (time.monotonic() + self.cache_ttl, call.result)
+                    self._cache.move_to_end(key)
+                    while len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+            call.done.set()
+
+        # call.result is what followers copy and the cache serves; the leader gets its own copy too
+        return copy.deepcopy(call.result)
+
+    def _get_cached(self, key: Hashable) -> Any:
+        """Get an unexpired cached result; caller holds the lock."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry[1]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get call, coalescing and cache counters."""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "cached": len(self._cache),
+                "cache_ttl_seconds": self.cache_ttl,
+                **self.stats
+            }
@@ -4,28 +4,32 @@ Orchestration Engine Core.
 Manages complex multi-service workflows, state transitions, and coordination.
 """
 
+import heapq
 import uuid
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 from datetime import datetime
 import json
 from pathlib import Path
 
 from ..libraries.dox_workflow_core import WorkflowRunner, WorkflowState
-from .state_manager import StateManager
+from .state_manager import StateManager, encode_list_cursor, decode_list_cursor
 from .event_publisher import EventPublisher
 from .service_connector import ServiceConnector
+from .health_monitor import HealthMonitor
 
 
 class OrchestrationEngine:
     """Core orchestration engine for multi-service workflows."""
 
     def __init__(self, workflow_runner: WorkflowRunner, state_manager: StateManager,
-                 event_publisher: EventPublisher, service_connector: ServiceConnector):
+                 event_publisher: EventPublisher, service_connector: ServiceConnector,
+                 health_monitor: Optional[HealthMonitor] = None):
         """Initialize orchestration engine."""
         self.workflow_runner = workflow_runner
         self.state_manager = state_manager
         self.event_publisher = event_publisher
         self.service_connector = service_connector
+        self.health_monitor = health_monitor
         self.active_orchestrations: Dict[str, Dict[str, Any]] = {}
 
     def start_workflow(self, rule_name: str, context: Dict[str, Any],
@@ -56,7 +60,7 @@ class OrchestrationEngine:
             # Publish workflow started event
             self.event_publisher.publish_event(
                 event_type="workflow_started",
-                data={
+                event_data={
                     "workflow_id": workflow_id,
                     "rule_name": rule_name,
                     "service": self.workflow_runner.service_name,
@@ -111,7 +115,7 @@ class OrchestrationEngine:
                 # Publish workflow paused event
                 self.event_publisher.publish_event(
                     event_type="workflow_paused",
-                    data={
+                    event_data={
                         "workflow_id": workflow_id,
                         "timestamp": datetime.utcnow().isoformat()
                     }
@@ -135,7 +139,7 @@ class OrchestrationEngine:
                 # Publish workflow resumed event
                 self.event_publisher.publish_event(
                     event_type="workflow_resumed",
-                    data={
+                    event_data={
                         "workflow_id": workflow_id,
                         "timestamp": datetime.utcnow().isoformat()
                     }
@@ -163,7 +167,7 @@ class OrchestrationEngine:
                 # Publish workflow cancelled event
                 self.event_publisher.publish_event(
                     event_type="workflow_cancelled",
-                    data={
+                    event_data={
                         "workflow_id": workflow_id,
                         "timestamp": datetime.utcnow().isoformat()
                     }
@@ -176,12 +180,72 @@ class OrchestrationEngine:
 
     def list_workflows(self, status_filter: Optional[str] = None,
                       service_filter: Optional[str] = None,
-                      limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
-        """List workflows with filtering."""
-        workflows = []
-
-        # Get active workflows
-        for workflow_id, orchestration in self.active_orchestrations.items():
+                      limit: int = 50, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """List one page of workflows, newest first.
+
+        Filters and keyset pagination run in PostgreSQL; pass the returned
+        ``next_cursor`` back to get the following page.
+        """
+        if not self.state_manager.postgres_pool:
+            return self._list_workflows_in_memory(status_filter, service_filter, limit, cursor)
+
+        workflows, next_cursor = self.state_manager.list_workflow_states(
+            status_filter, service_filter, limit, cursor
+        )
+        for workflow in workflows:
+            workflow["active"] = workflow["workflow_id"] in self.active_orchestrations
+
+        return {"workflows": workflows, "next_cursor": next_cursor}
+
+    def iter_workflows(self, status_filter: Optional[str] = None,
+                       service_filter: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Stream all matching workflows without materializing the listing."""
+        if not self.state_manager.postgres_pool:
+            yield from self._iter_workflows_in_memory(status_filter, service_filter)
+            return
+
+        for workflow in self.state_manager.iter_workflow_states(status_filter, service_filter):
+            workflow["active"] = workflow["workflow_id"] in self.active_orchestrations
+            yield workflow
+
+    def _list_workflows_in_memory(self, status_filter: Optional[str], service_filter: Optional[str],
+                                  limit: int, cursor: Optional[str]) -> Dict[str, Any]:
+        """Page through the in-process workflow indexes when PostgreSQL is unavailable.
+
+        Uses the same (created_at, workflow_id) keyset cursor as the PostgreSQL
+        listing, so cursors mean the same thing on either path.
+        """
+        after = decode_list_cursor(cursor) if cursor else None
+
+        def sort_key(workflow: Dict[str, Any]):
+            start_time = workflow.get("start_time")
+            return (datetime.fromisoformat(start_time) if start_time else datetime.min,
+                    workflow["workflow_id"])
+
+        candidates = (
+            (sort_key(workflow), workflow)
+            for workflow in self._iter_workflows_in_memory(status_filter, service_filter)
+        )
+        if after is not None:
+            candidates = ((key, workflow) for key, workflow in candidates if key < after)
+
+        # Newest first; one extra row tells us whether another page exists
+        page = heapq.nlargest(limit + 1, candidates, key=lambda item: item[0])
+
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = encode_list_cursor(*page[-1][0])
+
+        return {"workflows": [workflow for _, workflow in page], "next_cursor": next_cursor}
+
+    def _iter_workflows_in_memory(self, status_filter: Optional[str],
+                                  service_filter: Optional[str]) -> Iterator[Dict[str, Any]]:
+        """Yield active then completed workflows from the in-process indexes."""
+        runner_state = self.workflow_runner.state_manager
+
+        # Copy the keys: workflows may finish while the listing is consumed
+        for workflow_id, orchestration in list(self.active_orchestrations.items()):
             status = orchestration.get("status")
             service = orchestration.get("service", self.workflow_runner.service_name)
 
@@ -191,41 +255,35 @@ class OrchestrationEngine:
             if service_filter and service != service_filter:
                 continue
 
-            workflows.append({
+            yield {
                 "workflow_id": workflow_id,
                 "rule_name": orchestration.get("rule_name"),
                 "status": status,
                 "service": service,
                 "start_time": orchestration.get("start_time"),
                 "active": True
-            })
+            }
 
-        # Get completed workflows from state manager
-        for workflow_id, state in self.workflow_runner.state_manager.current_states.items():
-            if workflow_id in self.active_orchestrations:
-                continue  # Already included
+        if service_filter:  # Completed workflows don't track their service in memory
+            return
 
-            if state in [WorkflowState.SUCCESS, WorkflowState.FAILED, WorkflowState.CANCELLED]:
-                # Apply filters
-                if status_filter and state.value != status_filter:
-                    continue
-                if service_filter:  # Would need to track service per workflow
-                    continue
+        for state in (WorkflowState.SUCCESS, WorkflowState.FAILED, WorkflowState.CANCELLED):
+            if status_filter and state.value != status_filter:
+                continue
 
-                history = self.workflow_runner.state_manager.get_state_history(workflow_id)
-                start_time = history[0]["timestamp"] if history else None
+            for workflow_id in runner_state.get_workflows_by_state(state):
+                if workflow_id in self.active_orchestrations:
+                    continue  # Already included
 
-                workflows.append({
+                transitions = runner_state.get_state_transitions(workflow_id)
+                yield {
                     "workflow_id": workflow_id,
                     "status": state.value,
                     "service": "unknown",  # Would need to be tracked
-                    "start_time": start_time,
+                    "start_time": transitions[0].to_dict()["timestamp"] if transitions else None,
                     "active": False,
                     "completed": True
-                })
-
-        # Apply pagination
-        return workflows[offset:offset + limit]
+                }
 
     def trigger_team_coordination(self) -> Dict[str, Any]:
         """Trigger manual team coordination workflow."""
@@ -261,24 +319,24 @@ class OrchestrationEngine:
 
     def list_rules(self) -> List[Dict[str, Any]]:
         """List all available workflow rules."""
-        rules_info = []
-        for rule_name in self.workflow_runner.rule_registry.list_rules():
-            rule = self.workflow_runner.rule_registry.get_rule(rule_name)
-            if rule:
-                rules_info.append({
-                    "name": rule.name,
-                    "service": rule.service,
-                    "version": rule.version,
-                    "priority": rule.priority,
-                    "description": rule.description,
-                    "steps_count": len(rule.steps),
-                    "trigger_type": rule.trigger.type.value
-                })
-
-        return rules_info
+        # Read one snapshot so a concurrent reload can't mix rule versions
+        snapshot = self.workflow_runner.rule_registry.snapshot()
+        return [{
+            "name": rule.name,
+            "service": rule.service,
+            "version": rule.version,
+            "priority": rule.priority,
+            "description": rule.description,
+            "steps_count": len(rule.steps),
+            "trigger_type": rule.trigger.type.value
+        } for rule in snapshot.rules.values()]
 
     def check_services_health(self) -> Dict[str, Dict[str, Any]]:
-        """Check health of all connected services."""
+        """Check health of all connected services.
+
+        Served from the health monitor snapshot when one is attached, so the
+        call never waits on downstream services.
+        """
         services = [
             "dox-tmpl-pdf-upload",
             "dox-tmpl-pdf-recognizer",
@@ -290,22 +348,32 @@ class OrchestrationEngine:
             "dox-validation-service"
         ]
 
+        if self.health_monitor:
+            probe_results = self.health_monitor.get_snapshot()["services"]
+        else:
+            probe_results = self.service_connector.check_all_services_health(services)
+
         health_results = {}
 
         for service in services:
-            try:
-                health_status = self.service_connector.check_service_health(service)
+            health_status = probe_results.get(service)
+            if health_status is None:
                 health_results[service] = {
-                    "status": "healthy" if health_status else "unhealthy",
-                    "last_check": datetime.utcnow().isoformat(),
-                    "response_time_ms": health_status.get("response_time_ms", 0) if isinstance(health_status, dict) else 0
+                    "status": "unknown",
+                    "last_check": None
                 }
-            except Exception as e:
+            elif "error" in health_status and "status" not in health_status:
                 health_results[service] = {
                     "status": "error",
-                    "error": str(e),
+                    "error": health_status["error"],
                     "last_check": datetime.utcnow().isoformat()
                 }
+            else:
+                health_results[service] = {
+                    "status": "healthy" if health_status.get("status") == "healthy" else "unhealthy",
+                    "last_check": health_status.get("timestamp"),
+                    "response_time_ms": health_status.get("response_time_ms", 0)
+                }
 
         return health_results
 
@@ -315,15 +383,13 @@ class OrchestrationEngine:
 
     def get_orchestration_metrics(self) -> Dict[str, Any]:
         """Get orchestration engine metrics."""
-        state_counts = {}
-        for state in WorkflowState:
-            count = len(self.workflow_runner.state_manager.get_workflows_by_state(state))
-            state_counts[state.value] = count
-
         return {
             "active_orchestrations": len(self.active_orchestrations),
-            "workflow_states": state_counts,
+            "workflow_states": self.workflow_runner.state_manager.state_counts(),
             "total_rules": len(self.workflow_runner.rule_registry.list_rules()),
             "services_connected": len(self.check_services_health()),
+            "event_delivery": self.event_publisher.get_delivery_statistics(),
+            "service_resilience": self.service_connector.http_pool.get_resilience_statistics(),
+            "request_coalescing": self.service_connector.single_flight.get_statistics(),
             "timestamp": datetime.utcnow().isoformat()
         }
\ No newline at end of file
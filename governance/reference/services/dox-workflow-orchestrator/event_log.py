@@ -0,0 +1,163 @@
+"""
+Append-only event log for Workflow Orchestrator.
+
+Stores events as JSON Lines in size-rotated segments. Appends are single
+O_APPEND writes, sealed segments are summarized in a compact index, and
+readers tail or aggregate without parsing the whole history.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterator
+import logging
+
+
+SEGMENT_PREFIX = "events-"
+SEGMENT_SUFFIX = ".jsonl"
+INDEX_FILE = "index.json"
+
+
+class EventLog:
+    """Segment-rotated JSON Lines log with a per-segment summary index."""
+
+    def __init__(self, directory: str, segment_max_bytes: int = 1024 * 1024,
+                 retained_segments: int = 10):
+        """Initialize event log, resuming the newest segment on disk."""
+        self.directory = Path(directory)
+        self.segment_max_bytes = segment_max_bytes
+        self.retained_segments = retained_segments
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._index = self._load_index()
+        segments = self._segment_numbers()
+        self._active = segments[-1] if segments else 1
+
+    def append(self, event: Dict[str, Any]) -> None:
+        """Append one event as a single atomic line."""
+        line = (json.dumps(event, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+        with self._lock:
+            fd = os.open(self._segment_path(self._active), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                # One write() per line so concurrent appenders never interleave
+                os.write(fd, line)
+                size = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+
+            if size >= self.segment_max_bytes:
+                self._rotate()
+
+    def tail(self, limit: int, event_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get up to ``limit`` newest events, newest first."""
+        events = []
+
+        for number in reversed(self._segment_numbers()):
+            summary = self._index.get(str(number))
+            # Sealed segments without the requested type are skipped unread
+            if summary and event_type and event_type not in summary["event_types"]:
+                continue
+
+            for event in reversed(list(self._read_segment(number))):
+                if event_type and event.get("event_type") != event_type:
+                    continue
+                events.append(event)
+                if len(events) >= limit:
+                    return events
+
+        return events
+
+    def statistics(self) -> Dict[str, Any]:
+        """Aggregate counts from the index plus a scan of the active segment."""
+        with self._lock:
+            summaries = [self._index[key] for key in sorted(self._index, key=int)]
+            active = self._active
+
+        summaries.append(self._summarize(active))
+
+        event_types: Dict[str, int] = {}
+        for summary in summaries:
+            for event_type, count in summary["event_types"].items():
+                event_types[event_type] = event_types.get(event_type, 0) + count
+
+        timestamps = [s["last_timestamp"] for s in summaries if s["last_timestamp"]]
+        return {
+            "total_events": sum(summary["count"] for summary in summaries),
+            "event_types": event_types,
+            "latest_event": timestamps[-1] if timestamps else None,
+            "segments": len(summaries)
+        }
+
+    def _rotate(self) -> None:
+        """Seal the active segment, index it and apply retention."""
+        self._index[str(self._active)] = self._summarize(self._active)
+        self._active += 1
+
+        sealed = sorted(self._index, key=int)
+        for key in sealed[:-self.retained_segments] if self.retained_segments else sealed:
+            self._index.pop(key, None)
+            try:
+                self._segment_path(int(key)).unlink()
+            except FileNotFoundError:
+                pass
+
+        self._save_index()
+
+    def _summarize(self, number: int) -> Dict[str, Any]:
+        """Compute count, per-type counts and time range for one segment."""
+        summary = {"count": 0, "event_types": {}, "first_timestamp": None, "last_timestamp": None}
+
+        for event in self._read_segment(number):
+            event_type = event.get("event_type")
+            summary["count"] += 1
+            summary["event_types"][event_type] = summary["event_types"].get(event_type, 0) + 1
+            if summary["first_timestamp"] is None:
+                summary["first_timestamp"] = event.get("timestamp")
+            summary["last_timestamp"] = event.get("timestamp")
+
+        return summary
+
+    def _read_segment(self, number: int) -> Iterator[Dict[str, Any]]:
+        """Yield events from a segment, skipping a torn trailing line."""
+        try:
+            with open(self._segment_path(number), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+        except FileNotFoundError:
+            return
+
+    def _segment_numbers(self) -> List[int]:
+        """Segment numbers present on disk, oldest first."""
+        numbers = []
+        for path in self.directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"):
+            try:
+                numbers.append(int(path.name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]))
+            except ValueError:
+                continue
+        return sorted(numbers)
+
+    def _segment_path(self, number: int) -> Path:
+        return self.directory / f"{SEGMENT_PREFIX}{number:08d}{SEGMENT_SUFFIX}"
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Load the sealed segment index, or start empty."""
+        try:
+            with open(self.directory / INDEX_FILE, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_index(self) -> None:
+        """Atomically replace the index file."""
+        index_path = self.directory / INDEX_FILE
+        tmp_path = index_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, index_path)
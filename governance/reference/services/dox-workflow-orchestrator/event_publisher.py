@@ -5,11 +5,20 @@ Publishes workflow events to Redis pub/sub and other notification systems.
 """
 
 import json
+import queue
+import threading
+import time
 import redis
+from pathlib import Path
 from typing import Dict, Any, Optional
 from datetime import datetime
 import logging
 
+from .event_log import EventLog
+
+
+DELIVERY_MODES = ("sync", "best_effort", "at_least_once")
+
 
 class EventPublisher:
     """Publishes workflow events to various channels."""
@@ -19,8 +28,25 @@ class EventPublisher:
         self.config = config
         self.redis_client = None
         self.logger = logging.getLogger(__name__)
+        self.event_log = EventLog(
+            Path(config.get("MEMORY_BANK_PATH", "strategy/memory-banks")) / "workflow_events",
+            segment_max_bytes=int(config.get("EVENT_LOG_SEGMENT_BYTES", 1024 * 1024)),
+            retained_segments=int(config.get("EVENT_LOG_RETAINED_SEGMENTS", 10))
+        )
+        self.delivery_mode = config.get("EVENT_DELIVERY_MODE", "best_effort")
+        if self.delivery_mode not in DELIVERY_MODES:
+            raise ValueError(f"EVENT_DELIVERY_MODE must be one of {DELIVERY_MODES}, got {self.delivery_mode}")
+        self.batch_size = int(config.get("EVENT_BATCH_SIZE", 100))
+        self.delivery_stats = {"published": 0, "dropped": 0, "failed_batches": 0}
+        self._queue: "queue.Queue" = queue.Queue(maxsize=int(config.get("EVENT_QUEUE_SIZE", 10000)))
+        self._stop_event = threading.Event()
+        self._worker = None
         self._initialize_redis()
 
+        if self.redis_client and self.delivery_mode != "sync":
+            self._worker = threading.Thread(target=self._run_publisher, name="event-publisher", daemon=True)
+            self._worker.start()
+
     def _initialize_redis(self):
         """Initialize Redis connection for pub/sub."""
         try:
@@ -57,15 +83,12 @@ class EventPublisher:
 
         # Publish to Redis pub/sub
         if self.redis_client:
-            for channel in channels:
-                try:
-                    message = json.dumps(event)
-                    self.redis_client.publish(channel, message)
-                    self.logger.debug(f"Published event {event_type} to channel {channel}")
-
-                except Exception as e:
-                    self.logger.error(f"Failed to publish to Redis channel {channel}: {e}")
-                    success = False
+            # Serialize once for all channels
+            message = json.dumps(event)
+            if self.delivery_mode == "sync":
+                success = self._publish_batch([(channels, message)])
+            else:
+                success = self._enqueue(channels, message)
         else:
             self.logger.warning("Redis not available, event not published")
             success = False
@@ -76,12 +99,69 @@ class EventPublisher:
 
         return success
 
+    def _enqueue(self, channels: list, message: str) -> bool:
+        """Hand an event to the background publisher."""
+        try:
+            if self.delivery_mode == "at_least_once":
+                # Apply backpressure rather than lose the event
+                self._queue.put((channels, message))
+            else:
+                self._queue.put_nowait((channels, message))
+            return True
+
+        except queue.Full:
+            self.delivery_stats["dropped"] += 1
+            self.logger.error("Event publish queue full, dropping event")
+            return False
+
+    def _run_publisher(self) -> None:
+        """Drain the queue, publishing each burst in a single pipelined round trip."""
+        while not self._stop_event.is_set() or not self._queue.empty():
+            try:
+                batch = [self._queue.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            retry_delay = 0.1
+            while not self._publish_batch(batch) and self.delivery_mode == "at_least_once":
+                if self._stop_event.wait(retry_delay):
+                    # Shutting down: one last attempt, then give up
+                    if not self._publish_batch(batch):
+                        self.delivery_stats["dropped"] += len(batch)
+                    break
+                retry_delay = min(retry_delay * 2, 5.0)
+
+    def _publish_batch(self, batch: list) -> bool:
+        """Publish (channels, message) pairs in one pipeline execution."""
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for channels, message in batch:
+                for channel in channels:
+                    pipe.publish(channel, message)
+            pipe.execute()
+            self.delivery_stats["published"] += len(batch)
+            return True
+
+        except Exception as e:
+            self.delivery_stats["failed_batches"] += 1
+            if self.delivery_mode != "at_least_once":
+                self.delivery_stats["dropped"] += len(batch)
+            self.logger.error(f"Failed to publish {len(batch)} event(s) to Redis: {e}")
+            return False
+
     def _get_default_channels(self, event_type: str) -> list:
         """Get default channels for event type."""
         channel_mapping = {
             "workflow_started": ["workflows", "workflows:started"],
             "workflow_completed": ["workflows", "workflows:completed"],
             "workflow_failed": ["workflows", "workflows:failed"],
+            "workflow_progress": ["workflows", "workflows:progress"],
             "workflow_paused": ["workflows", "workflows:paused"],
             "workflow_resumed": ["workflows", "workflows:resumed"],
             "workflow_cancelled": ["workflows", "workflows:cancelled"],
@@ -97,23 +177,9 @@ class EventPublisher:
         return channel_mapping.get(event_type, ["workflows"])
 
     def _store_in_memory_bank(self, event: Dict[str, Any]):
-        """Store significant events in memory bank."""
+        """Append significant events to the memory bank event log."""
         try:
-            from pathlib import Path
-            memory_bank_path = Path(self.config.get("MEMORY_BANK_PATH", "strategy/memory-banks"))
-            events_log_path = memory_bank_path / "WORKFLOW_EVENTS.json"
-
-            # Load existing events log
-            events_log = {"events": []}
-            if events_log_path.exists():
-                with open(events_log_path, 'r') as f:
-                    try:
-                        events_log = json.load(f)
-                    except json.JSONDecodeError:
-                        events_log = {"events": []}
-
-            # Add new event
-            events_log["events"].append({
+            self.event_log.append({
                 "event_id": f"evt_{datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f')}",
                 "event_type": event["event_type"],
                 "event_data": event["event_data"],
@@ -121,14 +187,6 @@ class EventPublisher:
                 "publisher": event["publisher"]
             })
 
-            # Keep only last 1000 events
-            if len(events_log["events"]) > 1000:
-                events_log["events"] = events_log["events"][-1000:]
-
-            # Save updated log
-            with open(events_log_path, 'w') as f:
-                json.dump(events_log, f, indent=2)
-
         except Exception as e:
             self.logger.error(f"Failed to store event in memory bank: {e}")
 
@@ -206,27 +264,9 @@ class EventPublisher:
 
     def get_recent_events(self, event_type: Optional[str] = None,
                          limit: int = 50) -> list:
-        """Get recent events from memory bank."""
+        """Get recent events from memory bank, newest first."""
         try:
-            from pathlib import Path
-            memory_bank_path = Path(self.config.get("MEMORY_BANK_PATH", "strategy/memory-banks"))
-            events_log_path = memory_bank_path / "WORKFLOW_EVENTS.json"
-
-            if not events_log_path.exists():
-                return []
-
-            with open(events_log_path, 'r') as f:
-                events_log = json.load(f)
-
-            events = events_log.get("events", [])
-
-            # Filter by event type if specified
-            if event_type:
-                events = [e for e in events if e["event_type"] == event_type]
-
-            # Sort by timestamp (newest first) and limit
-            events.sort(key=lambda x: x["timestamp"], reverse=True)
-            return events[:limit]
+            return self.event_log.tail(limit, event_type)
 
         except Exception as e:
             self.logger.error(f"Failed to get recent events: {e}")
@@ -235,33 +275,27 @@ class EventPublisher:
     def get_event_statistics(self) -> Dict[str, Any]:
         """Get event publishing statistics."""
         try:
-            from pathlib import Path
-            memory_bank_path = Path(self.config.get("MEMORY_BANK_PATH", "strategy/memory-banks"))
-            events_log_path = memory_bank_path / "WORKFLOW_EVENTS.json"
-
-            if not events_log_path.exists():
-                return {"total_events": 0, "event_types": {}}
-
-            with open(events_log_path, 'r') as f:
-                events_log = json.load(f)
-
-            events = events_log.get("events", [])
-            event_types = {}
-
-            for event in events:
-                event_type = event["event_type"]
-                event_types[event_type] = event_types.get(event_type, 0) + 1
-
-            return {
-                "total_events": len(events),
-                "event_types": event_types,
-                "latest_event": events[-1]["timestamp"] if events else None
-            }
+            return self.event_log.statistics()
 
         except Exception as e:
             self.logger.error(f"Failed to get event statistics: {e}")
             return {"error": str(e)}
 
+    def get_delivery_statistics(self) -> Dict[str, Any]:
+        """Get Redis delivery counters and queue depth."""
+        return {
+            "delivery_mode": self.delivery_mode,
+            "queue_depth": self._queue.qsize(),
+            **self.delivery_stats
+        }
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Publish queued events and stop the background publisher."""
+        self._stop_event.set()
+        if self._worker:
+            self._worker.join(timeout)
+            self._worker = None
+
     def health_check(self) -> str:
         """Check health of event publisher."""
         if self.redis_client:
@@ -0,0 +1,190 @@
+"""
+Workflow event streaming for Workflow Orchestrator.
+
+One Redis pub/sub subscription per process receives workflow events and
+fans them out to per-workflow subscriber queues, which the SSE endpoint
+drains. Watching N workflows costs one Redis connection, not N.
+"""
+
+import json
+import queue
+import threading
+from collections import defaultdict
+from typing import Dict, Any, Optional, Set
+import logging
+
+
+# Every workflow lifecycle and step event reaches one of these channels exactly once
+STREAM_CHANNELS = ("workflows", "workflows:steps")
+
+TERMINAL_EVENTS = frozenset({"workflow_completed", "workflow_failed", "workflow_cancelled"})
+
+
+class EventStreamHub:
+    """Multiplexes a single Redis subscription across workflow event subscribers."""
+
+    def __init__(self, redis_client: Any, config: Dict[str, Any]):
+        """Initialize event stream hub."""
+        self.redis_client = redis_client
+        self.logger = logging.getLogger(__name__)
+        self.queue_size = int(config.get("EVENT_STREAM_QUEUE_SIZE", 100))
+        self.subscribe_timeout = float(config.get("EVENT_STREAM_SUBSCRIBE_TIMEOUT", 5))
+        self.stats = {"received": 0, "delivered": 0, "dropped": 0}
+        self._subscribers: Dict[str, Set["queue.Queue"]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        # Set while Redis has confirmed the shared subscription
+        self._live = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the shared subscription thread if it is not already running."""
+        if self.redis_client is None:
+            raise RuntimeError("Event streaming requires Redis")
+
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="event-stream-hub", daemon=True)
+                self._thread.start()
+
+    def subscribe(self, workflow_id: str) -> "queue.Queue":
+        """Register a subscriber for a workflow's events and return its queue.
+
+        Returns only once the shared subscription is live, so any event
+        published after this call reaches the queue.
+        """
+        self.start()
+
+        subscriber: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers[workflow_id].add(subscriber)
+
+        if not self._live.wait(self.subscribe_timeout):
+            self.unsubscribe(workflow_id, subscriber)
+            raise RuntimeError("Event stream subscription is not live")
+        return subscriber
+
+    def unsubscribe(self, workflow_id: str, subscriber: "queue.Queue") -> None:
+        """Remove a subscriber queue."""
+        with self._lock:
+            subscribers = self._subscribers.get(workflow_id)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[workflow_id]
+
+    def _run(self) -> None:
+        """Listen on the shared subscription, reconnecting with backoff on errors."""
+        retry_delay = 0.5
+        while not self._stop_event.is_set():
+            pubsub = None
+            try:
+                pubsub = self.redis_client.pubsub()
+                pubsub.subscribe(*STREAM_CHANNELS)
+                retry_delay = 0.5
+
+                confirmed = 0
+                while not self._stop_event.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is None:
+                        continue
+                    if message["type"] == "subscribe":
+                        confirmed += 1
+                        if confirmed == len(STREAM_CHANNELS):
+                            self._live.set()
+                    elif message["type"] == "message":
+                        self._dispatch(message["data"])
+
+            except Exception as e:
+                self._live.clear()
+                self.logger.error(f"Event stream subscription failed: {e}")
+                self._stop_event.wait(retry_delay)
+                retry_delay = min(retry_delay * 2, 10.0)
+
+            finally:
+                self._live.clear()
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def _dispatch(self, data: str) -> None:
+        """Hand a published event to the subscribers of its workflow."""
+        with self._lock:
+            self.stats["received"] += 1
+        try:
+            event = json.loads(data)
+            workflow_id = (event.get("event_data") or {}).get("workflow_id")
+        except (ValueError, AttributeError):
+            return
+
+        with self._lock:
+            subscribers = list(self._subscribers.get(workflow_id, ()))
+
+        delivered = dropped = 0
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+                delivered += 1
+            except queue.Full:
+                # A stalled client loses events rather than holding up everyone else
+                dropped += 1
+
+        with self._lock:
+            self.stats["delivered"] += delivered
+            self.stats["dropped"] += dropped
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get subscriber counts and fan-out counters."""
+        with self._lock:
+            return {
+                "workflows_watched": len(self._subscribers),
+                "subscribers": sum(len(subscribers) for subscribers in self._subscribers.values()),
+                **self.stats
+            }
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the shared subscription."""
+        self._stop_event.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread:
+            thread.join(timeout)
+
+
+class CheckpointEventPublisher:
+    """Checkpoint store wrapper that publishes each checkpoint as a workflow event.
+
+    The runner checkpoints at every step boundary, so this is the progress
+    feed for streaming clients without adding hooks to the runner.
+    """
+
+    def __init__(self, checkpoint_store: Any, event_publisher: Any):
+        self.checkpoint_store = checkpoint_store
+        self.event_publisher = event_publisher
+
+    def save_checkpoint(self, checkpoint: Dict[str, Any]) -> bool:
+        """Persist the checkpoint, then publish the workflow's progress."""
+        saved = self.checkpoint_store.save_checkpoint(checkpoint)
+
+        state = checkpoint["state"]
+        if state == "success":
+            event_type = "workflow_completed"
+        elif state == "failed":
+            event_type = "workflow_failed"
+        else:
+            event_type = "workflow_progress"
+
+        self.event_publisher.publish_event(event_type, {
+            "workflow_id": checkpoint["workflow_id"],
+            "rule_name": checkpoint["rule_name"],
+            "status": state,
+            "next_step": checkpoint["next_step"],
+            "steps_completed": len(checkpoint["step_results"])
+        })
+        return saved
+
+    def load_checkpoints(self, service: str) -> list:
+        """Load checkpoints from the wrapped store."""
+        return self.checkpoint_store.load_checkpoints(service)
@@ -0,0 +1,108 @@
+"""
+Health Monitor for Workflow Orchestrator.
+
+Probes downstream services concurrently in the background and serves the
+latest results from a TTL'd snapshot, so request handlers never wait on a
+slow or dead service.
+"""
+
+import threading
+import time
+from typing import Dict, Any, Optional
+from datetime import datetime
+import logging
+
+from .service_connector import ServiceConnector
+
+
+class HealthMonitor:
+    """Background service health prober with a cached snapshot."""
+
+    def __init__(self, service_connector: ServiceConnector, config: Dict[str, Any],
+                 event_publisher: Optional[Any] = None):
+        """Initialize health monitor."""
+        self.service_connector = service_connector
+        self.event_publisher = event_publisher
+        self.logger = logging.getLogger(__name__)
+        self.interval_seconds = float(config.get("HEALTH_PROBE_INTERVAL", 15))
+        self.ttl_seconds = float(config.get("HEALTH_SNAPSHOT_TTL", 45))
+        self._snapshot: Dict[str, Dict[str, Any]] = {}
+        self._refreshed_at: Optional[str] = None
+        self._refreshed_monotonic: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the background probe loop."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="service-health-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background probe loop."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        """Refresh the snapshot every interval until stopped."""
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                self.logger.error(f"Service health refresh failed: {e}")
+            self._stop_event.wait(self.interval_seconds)
+
+    def refresh(self) -> Dict[str, Dict[str, Any]]:
+        """Probe all services concurrently and swap in the new snapshot."""
+        results = self.service_connector.check_all_services_health()
+
+        with self._lock:
+            previous = self._snapshot
+            self._snapshot = results
+            self._refreshed_at = datetime.utcnow().isoformat()
+            self._refreshed_monotonic = time.monotonic()
+
+        self._publish_changes(previous, results)
+        return results
+
+    def _publish_changes(self, previous: Dict[str, Dict[str, Any]],
+                         current: Dict[str, Dict[str, Any]]) -> None:
+        """Publish health change events for services whose status changed."""
+        if not self.event_publisher or not previous:
+            return
+
+        for service_name, health in current.items():
+            old_status = previous.get(service_name, {}).get("status")
+            new_status = health.get("status")
+            if old_status != new_status:
+                self.event_publisher.publish_service_health_event(
+                    service_name, new_status, health.get("response_time_ms", 0)
+                )
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """Get the latest health snapshot without probing."""
+        with self._lock:
+            services = self._snapshot
+            refreshed_at = self._refreshed_at
+            refreshed_monotonic = self._refreshed_monotonic
+
+        age_seconds = time.monotonic() - refreshed_monotonic if refreshed_monotonic is not None else None
+        return {
+            "services": services,
+            "refreshed_at": refreshed_at,
+            "age_seconds": age_seconds,
+            "stale": age_seconds is None or age_seconds > self.ttl_seconds
+        }
+
+    def health_check(self) -> str:
+        """Check health of the monitor itself."""
+        snapshot = self.get_snapshot()
+        if snapshot["stale"]:
+            return "degraded"
+        return "healthy"
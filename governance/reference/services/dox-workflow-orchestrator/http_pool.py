@@ -0,0 +1,229 @@
+"""
+Pooled HTTP client layer for Workflow Orchestrator.
+
+Keeps one keep-alive connection pool per downstream service, shared by the
+ServiceConnector and the workflow runner.
+"""
+
+import threading
+from typing import Dict, Any, Optional, Tuple, Union
+from urllib.parse import urlsplit
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .resilience import CircuitBreaker, Bulkhead, CircuitOpenError, BulkheadFullError
+
+try:
+    import httpx
+    import h2  # noqa: F401 - required by httpx for HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HTTPClientPool:
+    """Per-service HTTP connection pools with keep-alive, default timeouts,
+    circuit breakers and bulkheads."""
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize HTTP client pool."""
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        self.pool_maxsize = int(config.get("HTTP_POOL_MAXSIZE", 20))
+        self.pool_block = bool(config.get("HTTP_POOL_BLOCK", False))
+        self.connect_timeout = float(config.get("HTTP_CONNECT_TIMEOUT", 3.05))
+        self.read_timeout = float(config.get("HTTP_READ_TIMEOUT", 30))
+        self.http2_enabled = bool(config.get("HTTP2_ENABLED", False))
+        self.breaker_threshold = int(config.get("CIRCUIT_BREAKER_THRESHOLD", 5))
+        self.breaker_reset_timeout = float(config.get("CIRCUIT_BREAKER_RESET_TIMEOUT", 30))
+        self.bulkhead_size = int(config.get("SERVICE_MAX_CONCURRENCY", self.pool_maxsize))
+        self.bulkhead_wait = float(config.get("SERVICE_BULKHEAD_WAIT", 0.25))
+        self._clients: Dict[str, Any] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._bulkheads: Dict[str, Bulkhead] = {}
+        self._lock = threading.Lock()
+
+        if self.http2_enabled and not HTTP2_AVAILABLE:
+            self.logger.warning("HTTP/2 requested but httpx[http2] not installed, using HTTP/1.1 pools")
+            self.http2_enabled = False
+
+    def request(self, method: str, url: str, timeout: Union[None, float, Tuple[float, float]] = None,
+                service_name: Optional[str] = None, guarded: bool = True, **kwargs) -> Any:
+        """Send a request through the pool for the target service.
+
+        Accepts the same arguments as ``requests.request`` and raises
+        ``requests`` exceptions regardless of the underlying transport.
+        Guarded calls go through the service's bulkhead and circuit breaker
+        and raise ``BulkheadFullError`` / ``CircuitOpenError`` when refused;
+        health probes pass ``guarded=False`` so they still reach the service.
+        """
+        pool_key = service_name or urlsplit(url).hostname or url
+        if not guarded:
+            return self._send(pool_key, method, url, timeout, **kwargs)
+
+        breaker, bulkhead = self._get_guards(pool_key)
+        if not bulkhead.acquire():
+            raise BulkheadFullError(f"Too many concurrent calls to {pool_key} ({bulkhead.max_concurrent} in flight)")
+
+        try:
+            if not breaker.allow_request():
+                raise CircuitOpenError(
+                    f"Circuit open for {pool_key}, retry in {breaker.retry_after():.1f}s"
+                )
+
+            try:
+                response = self._send(pool_key, method, url, timeout, **kwargs)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+                breaker.record_failure()
+                raise
+            except Exception:
+                # Not the service's fault (bad URL, encoding); don't hold a half-open probe
+                breaker.record_success()
+                raise
+
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            return response
+
+        finally:
+            bulkhead.release()
+
+    def _send(self, pool_key: str, method: str, url: str,
+              timeout: Union[None, float, Tuple[float, float]], **kwargs) -> Any:
+        """Send a request on the service's pooled client."""
+        client = self._get_client(pool_key)
+        connect_timeout, read_timeout = self._resolve_timeout(timeout)
+
+        if not self.http2_enabled:
+            return client.request(method=method, url=url, timeout=(connect_timeout, read_timeout), **kwargs)
+
+        try:
+            response = client.request(
+                method, url,
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                **kwargs
+            )
+            return _HTTPXResponse(response)
+
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e))
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e))
+        except httpx.HTTPError as e:
+            raise requests.exceptions.RequestException(str(e))
+
+    def get(self, url: str, **kwargs) -> Any:
+        """Send a GET request through the pool."""
+        return self.request("GET", url, **kwargs)
+
+    def _resolve_timeout(self, timeout: Union[None, float, Tuple[float, float]]) -> Tuple[float, float]:
+        """Split a timeout into (connect, read) using pool defaults."""
+        if timeout is None:
+            return self.connect_timeout, self.read_timeout
+        if isinstance(timeout, tuple):
+            return timeout
+        return min(self.connect_timeout, timeout), timeout
+
+    def _get_client(self, pool_key: str) -> Any:
+        """Get or create the client that owns the pool for a service."""
+        client = self._clients.get(pool_key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(pool_key)
+            if client is None:
+                client = self._create_client()
+                self._clients[pool_key] = client
+            return client
+
+    def _create_client(self) -> Any:
+        """Create a keep-alive client with per-host pool limits."""
+        if self.http2_enabled:
+            return httpx.Client(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=self.pool_maxsize,
+                    max_keepalive_connections=self.pool_maxsize
+                )
+            )
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+            max_retries=0
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _get_guards(self, pool_key: str) -> Tuple[CircuitBreaker, Bulkhead]:
+        """Get or create the circuit breaker and bulkhead for a service."""
+        breaker = self._breakers.get(pool_key)
+        if breaker is not None:
+            return breaker, self._bulkheads[pool_key]
+
+        with self._lock:
+            if pool_key not in self._breakers:
+                # Bulkhead first: readers only check the breaker dict
+                self._bulkheads[pool_key] = Bulkhead(pool_key, self.bulkhead_size, self.bulkhead_wait)
+                self._breakers[pool_key] = CircuitBreaker(
+                    pool_key, self.breaker_threshold, self.breaker_reset_timeout
+                )
+            return self._breakers[pool_key], self._bulkheads[pool_key]
+
+    def get_resilience_statistics(self) -> Dict[str, Any]:
+        """Get circuit breaker and bulkhead state per service."""
+        return {
+            pool_key: {
+                "circuit_breaker": breaker.get_statistics(),
+                "bulkhead": self._bulkheads[pool_key].get_statistics()
+            }
+            for pool_key, breaker in list(self._breakers.items())
+        }
+
+    def get_pool_statistics(self) -> Dict[str, Any]:
+        """Get pool configuration and the services with open pools."""
+        return {
+            "pools": sorted(self._clients.keys()),
+            "pool_maxsize": self.pool_maxsize,
+            "pool_block": self.pool_block,
+            "connect_timeout": self.connect_timeout,
+            "read_timeout": self.read_timeout,
+            "http2": self.http2_enabled
+        }
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        with self._lock:
+            clients, self._clients = self._clients, {}
+
+        for client in clients.values():
+            client.close()
+
+
+class _HTTPXResponse:
+    """Adapts an httpx response to the subset of the requests API we use."""
+
+    def __init__(self, response: "httpx.Response"):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.content = response.content
+        self.text = response.text
+
+    def json(self) -> Any:
+        return self._response.json()
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(
+                f"{self.status_code} Error for url: {self._response.url}",
+                response=self
+            )
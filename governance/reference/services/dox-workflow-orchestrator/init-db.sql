@@ -13,7 +13,11 @@ CREATE TABLE IF NOT EXISTS workflow_states (
     context JSONB,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-    completed_at TIMESTAMP WITH TIME ZONE
+    completed_at TIMESTAMP WITH TIME ZONE,
+    version BIGINT NOT NULL DEFAULT 1,
+    checkpoint JSONB,
+    lease_owner VARCHAR(255),
+    lease_expires_at TIMESTAMP WITH TIME ZONE
 );
 
 -- Create workflow step results table
@@ -42,6 +46,15 @@ CREATE TABLE IF NOT EXISTS workflow_events (
 CREATE INDEX IF NOT EXISTS idx_workflow_states_status ON workflow_states(current_state);
 CREATE INDEX IF NOT EXISTS idx_workflow_states_updated ON workflow_states(updated_at);
 CREATE INDEX IF NOT EXISTS idx_workflow_states_service ON workflow_states(service);
+-- Keyset pagination for workflow listings: ORDER BY created_at DESC, workflow_id DESC
+CREATE INDEX IF NOT EXISTS idx_workflow_states_created_listing
+    ON workflow_states(created_at DESC, workflow_id DESC);
+CREATE INDEX IF NOT EXISTS idx_workflow_states_state_created_listing
+    ON workflow_states(current_state, created_at DESC, workflow_id DESC);
+CREATE INDEX IF NOT EXISTS idx_workflow_states_service_created_listing
+    ON workflow_states(service, created_at DESC, workflow_id DESC);
+CREATE INDEX IF NOT EXISTS idx_workflow_states_recovery ON workflow_states(service, current_state)
+    WHERE current_state IN ('running', 'retry');
 CREATE INDEX IF NOT EXISTS idx_step_results_workflow ON workflow_step_results(workflow_id);
 CREATE INDEX IF NOT EXISTS idx_step_results_executed ON workflow_step_results(executed_at);
 CREATE INDEX IF NOT EXISTS idx_events_workflow ON workflow_events(workflow_id);
@@ -0,0 +1,128 @@
+"""
+Per-service circuit breakers and bulkheads for Workflow Orchestrator.
+
+A circuit breaker fails calls fast once a service keeps failing and lets a
+single probe through after a cool-down; a bulkhead caps concurrent in-flight
+calls per service so one slow dependency cannot tie up every worker.
+"""
+
+import threading
+import time
+from typing import Dict, Any
+
+import requests
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of calling a service whose circuit is open."""
+
+
+class BulkheadFullError(requests.exceptions.RequestException):
+    """Raised when a service already has its maximum calls in flight."""
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker driven by consecutive failures."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failure_count = 0
+        self.stats = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Check whether a call may go out; in half-open only one probe is admitted."""
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+
+            self.stats["rejected"] += 1
+            return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self.stats["successes"] += 1
+            self.failure_count = 0
+            self._probe_in_flight = False
+            self.state = self.CLOSED
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold or on a failed probe."""
+        with self._lock:
+            self.stats["failures"] += 1
+            self.failure_count += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.failure_count >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.stats["opened"] += 1
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit admits a probe."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get circuit state and counters."""
+        return {
+            "state": self.state,
+            "failure_count": self.failure_count,
+            "retry_after_seconds": round(self.retry_after(), 3),
+            **self.stats
+        }
+
+
+class Bulkhead:
+    """Caps concurrent calls to a service with a bounded semaphore."""
+
+    def __init__(self, name: str, max_concurrent: int = 20, max_wait: float = 0.25):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self.rejected = 0
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        """Take a slot, waiting at most max_wait seconds for one to free up."""
+        if not self._semaphore.acquire(timeout=self.max_wait):
+            with self._lock:
+                self.rejected += 1
+            return False
+
+        with self._lock:
+            self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        """Return a slot taken by acquire."""
+        with self._lock:
+            self.in_flight -= 1
+        self._semaphore.release()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get slot usage and rejection count."""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected
+        }
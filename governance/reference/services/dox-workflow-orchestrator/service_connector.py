@@ -5,11 +5,20 @@ Handles HTTP communication with other DOX services.
 """
 
 import requests
+import hashlib
 import json
 from typing import Dict, Any, Optional, List
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import logging
 
+from .http_pool import HTTPClientPool
+from .resilience import CircuitOpenError, BulkheadFullError
+from .coalescing import SingleFlight
+
+
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+
 
 class ServiceConnector:
     """Connects to and manages communication with other services."""
@@ -19,6 +28,13 @@ class ServiceConnector:
         self.config = config
         self.logger = logging.getLogger(__name__)
         self.service_registry = self._load_service_registry()
+        self.http_pool = HTTPClientPool(config)
+        # Only successful responses are worth replaying from the cache
+        self.single_flight = SingleFlight(
+            cache_ttl=float(config.get("SERVICE_RESPONSE_CACHE_TTL", 0)),
+            cache_size=int(config.get("SERVICE_RESPONSE_CACHE_SIZE", 1024)),
+            cacheable=lambda response: 200 <= response.get("status_code", 0) < 300
+        )
 
     def _load_service_registry(self) -> Dict[str, Dict[str, Any]]:
         """Load service registry with default endpoints."""
@@ -97,9 +113,12 @@ class ServiceConnector:
         start_time = datetime.utcnow()
 
         try:
-            response = requests.get(
+            response = self.http_pool.get(
                 health_url,
+                service_name=service_name,
                 timeout=5,
+                # Probes bypass the breaker so recovery is still observed while it is open
+                guarded=False,
                 headers={"User-Agent": "dox-workflow-orchestrator/1.0.0"}
             )
 
@@ -159,11 +178,38 @@ class ServiceConnector:
                         data: Optional[Dict[str, Any]] = None,
                         params: Optional[Dict[str, Any]] = None,
                         headers: Optional[Dict[str, str]] = None,
-                        timeout: int = 30) -> Dict[str, Any]:
-        """Make API call to a service."""
+                        timeout: int = 30, idempotent: Optional[bool] = None) -> Dict[str, Any]:
+        """Make API call to a service.
+
+        Idempotent calls (GET/HEAD/OPTIONS by default, or ``idempotent=True``)
+        are coalesced with identical calls already in flight and may be
+        answered from the short-TTL response cache.
+        """
         if service_name not in self.service_registry:
             raise ValueError(f"Service {service_name} not found in registry")
 
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        if not idempotent:
+            return self._send_api_call(service_name, method, endpoint, data, params, headers, timeout)
+
+        key = self._request_key(service_name, method, endpoint, data, params, headers)
+        return self.single_flight.do(
+            key, lambda: self._send_api_call(service_name, method, endpoint, data, params, headers, timeout)
+        )
+
+    def _request_key(self, service_name: str, method: str, endpoint: str,
+                     data: Optional[Dict[str, Any]], params: Optional[Dict[str, Any]],
+                     headers: Optional[Dict[str, str]]) -> tuple:
+        """Key identical calls by service, method, endpoint and a canonical payload hash."""
+        # Headers are part of the payload: callers with different credentials never share
+        payload = json.dumps([data, params, headers], sort_keys=True, separators=(",", ":"), default=str)
+        return service_name, method.upper(), endpoint, hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _send_api_call(self, service_name: str, method: str, endpoint: str,
+                       data: Optional[Dict[str, Any]], params: Optional[Dict[str, Any]],
+                       headers: Optional[Dict[str, str]], timeout: int) -> Dict[str, Any]:
+        """Send an API call and convert the response or failure into a result dict."""
         service_config = self.service_registry[service_name]
         base_url = f"http://{service_config['host']}:{service_config['port']}"
         api_url = base_url + service_config["api_prefix"] + endpoint
@@ -177,9 +223,10 @@ class ServiceConnector:
             default_headers.update(headers)
 
         try:
-            response = requests.request(
+            response = self.http_pool.request(
                 method=method.upper(),
                 url=api_url,
+                service_name=service_name,
                 json=data if method.upper() in ["POST", "PUT", "PATCH"] else None,
                 params=params,
                 headers=default_headers,
@@ -199,6 +246,22 @@ class ServiceConnector:
 
             return response_data
 
+        except CircuitOpenError as e:
+            return {
+                "error": "Service temporarily unavailable",
+                "error_code": "CIRCUIT_BREAKER_OPEN",
+                "details": str(e),
+                "timestamp": datetime.utcnow().isoformat()
+            }
+
+        except BulkheadFullError as e:
+            return {
+                "error": "Service concurrency limit reached",
+                "error_code": "BULKHEAD_FULL",
+                "details": str(e),
+                "timestamp": datetime.utcnow().isoformat()
+            }
+
         except requests.exceptions.Timeout:
             return {
                 "error": "Request timed out",
@@ -235,7 +298,9 @@ class ServiceConnector:
             service_name="dox-tmpl-pdf-recognizer",
             method="POST",
             endpoint="/recognize/template",
-            data=document_data
+            data=document_data,
+            # Recognition is a pure function of the document payload
+            idempotent=True
         )
 
     def call_storage_service(self, storage_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -254,7 +319,9 @@ class ServiceConnector:
             service_name="dox-validation-service",
             method="POST",
             endpoint=endpoint,
-            data=validation_data
+            data=validation_data,
+            # Validation results depend only on the submitted data
+            idempotent=True
         )
 
     def call_auth_service(self, auth_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -275,14 +342,17 @@ class ServiceConnector:
             data=template_data
         )
 
-    def check_all_services_health(self) -> Dict[str, Dict[str, Any]]:
-        """Check health of all registered services."""
-        health_results = {}
-
-        for service_name in self.service_registry.keys():
-            health_results[service_name] = self.check_service_health(service_name)
+    def check_all_services_health(self, service_names: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Check health of registered services concurrently."""
+        service_names = list(service_names or self.service_registry.keys())
+        if not service_names:
+            return {}
 
-        return health_results
+        # Probe in parallel so the sweep takes as long as the slowest service
+        with ThreadPoolExecutor(max_workers=len(service_names),
+                                thread_name_prefix="health-probe") as executor:
+            results = executor.map(self.check_service_health, service_names)
+            return dict(zip(service_names, results))
 
     def get_service_metrics(self, service_name: str) -> Dict[str, Any]:
         """Get metrics from a specific service."""
@@ -369,5 +439,8 @@ class ServiceConnector:
             "registered_services": len(self.service_registry),
             "service_list": list(self.service_registry.keys()),
             "health_status": self.health_check(),
+            "http_pool": self.http_pool.get_pool_statistics(),
+            "resilience": self.http_pool.get_resilience_statistics(),
+            "coalescing": self.single_flight.get_statistics(),
             "timestamp": datetime.utcnow().isoformat()
         }
\ No newline at end of file
@@ -4,14 +4,69 @@ State Manager for Orchestrator.
 Handles persistent state storage and retrieval for orchestrated workflows.
 """
 
+import base64
 import json
+import socket
+import threading
+import uuid
 import redis
 import psycopg2
 from psycopg2.extras import Json
-from typing import Dict, Any, Optional, List
+from psycopg2.pool import ThreadedConnectionPool
+from typing import Dict, Any, Optional, List, Iterator, Tuple
 from datetime import datetime, timedelta
 from contextlib import contextmanager
 
+from dox_workflow_core import LeaseLostError
+
+from .write_batcher import WriteBehindBatcher
+
+
+# Compare-and-set cache write: only replace an entry with a newer version.
+# Version 0 is the negative-cache marker for unknown workflow IDs.
+CACHE_CAS_SCRIPT = """
+local current = redis.call('HGET', KEYS[1], 'version')
+if current and tonumber(current) >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'version', ARGV[1], 'data', ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+
+STATE_COLUMNS = """
+    workflow_id, rule_name, service, current_state, context,
+    created_at, updated_at, completed_at, version
+"""
+
+
+# Listing columns: no context or checkpoint, so pages stay small
+LIST_COLUMNS = """
+    workflow_id, rule_name, service, current_state,
+    created_at, updated_at, completed_at
+"""
+
+
+def encode_list_cursor(created_at: datetime, workflow_id: str) -> str:
+    """Encode the (created_at, workflow_id) keyset position of the last listed row."""
+    raw = json.dumps([created_at.isoformat(), workflow_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_list_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a listing cursor; raises ValueError if it is malformed."""
+    try:
+        created_at, workflow_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), str(workflow_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _dumps_lenient(value: Any) -> str:
+    """Serialize checkpoint data, stringifying values JSON can't represent."""
+    return json.dumps(value, default=str)
+
 
 class StateManager:
     """Persistent state management for orchestration engine."""
@@ -20,7 +75,16 @@ class StateManager:
         """Initialize state manager with configuration."""
         self.config = config
         self.redis_client = None
-        self.postgres_conn = None
+        self.cache_cas = None
+        self.cache_ttl = int(config.get("STATE_CACHE_TTL", 86400))
+        self.negative_cache_ttl = int(config.get("STATE_NEGATIVE_CACHE_TTL", 10))
+        self.cache_stats = {"hits": 0, "negative_hits": 0, "misses": 0, "stale_writes_rejected": 0}
+        self.postgres_pool = None
+        self.write_batcher = None
+        self._pool_slots = None
+        # Checkpoint writes hold a lease on the workflow; recovery only claims expired leases
+        self.instance_id = config.get("WORKFLOW_INSTANCE_ID") or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self.lease_seconds = int(config.get("WORKFLOW_LEASE_SECONDS", 300))
         self._initialize_connections()
 
     def _initialize_connections(self):
@@ -36,6 +100,7 @@ class StateManager:
             )
             # Test connection
             self.redis_client.ping()
+            self.cache_cas = self.redis_client.register_script(CACHE_CAS_SCRIPT)
             print("✅ Redis connection established")
 
         except Exception as e:
@@ -43,8 +108,11 @@ class StateManager:
             self.redis_client = None
 
         try:
-            # PostgreSQL connection
-            self.postgres_conn = psycopg2.connect(
+            # PostgreSQL connection pool shared by all request threads
+            max_connections = int(self.config.get("POSTGRES_POOL_MAX", 10))
+            self.postgres_pool = ThreadedConnectionPool(
+                int(self.config.get("POSTGRES_POOL_MIN", 1)),
+                max_connections,
                 host=self.config.get("POSTGRES_HOST", "localhost"),
                 port=self.config.get("POSTGRES_PORT", 5432),
                 database=self.config.get("POSTGRES_DB", "dox_workflows"),
@@ -52,21 +120,41 @@ class StateManager:
                 password=self.config.get("POSTGRES_PASSWORD", "dox_password"),
                 connect_timeout=5
             )
+            # ThreadedConnectionPool raises when exhausted; callers wait for a slot instead
+            self._pool_slots = threading.BoundedSemaphore(max_connections)
             # Test connection
-            with self.postgres_conn.cursor() as cur:
-                cur.execute("SELECT 1")
-            print("✅ PostgreSQL connection established")
+            with self._postgres_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+            print("✅ PostgreSQL connection pool established")
 
         except Exception as e:
             print(f"❌ PostgreSQL connection failed: {e}")
-            self.postgres_conn = None
+            self.postgres_pool = None
 
         # Initialize database tables
         self._initialize_database()
 
+        if self.postgres_pool:
+            self.write_batcher = WriteBehindBatcher(self._postgres_connection, self.config)
+
+    @contextmanager
+    def _postgres_connection(self):
+        """Borrow a pooled connection; commit on success, roll back on error."""
+        with self._pool_slots:
+            conn = self.postgres_pool.getconn()
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                self.postgres_pool.putconn(conn)
+
     def _initialize_database(self):
         """Initialize database tables if they don't exist."""
-        if not self.postgres_conn:
+        if not self.postgres_pool:
             return
 
         create_tables_sql = """
@@ -78,9 +166,18 @@ class StateManager:
             context JSONB,
             created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
             updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-            completed_at TIMESTAMP WITH TIME ZONE
+            completed_at TIMESTAMP WITH TIME ZONE,
+            version BIGINT NOT NULL DEFAULT 1,
+            checkpoint JSONB,
+            lease_owner VARCHAR(255),
+            lease_expires_at TIMESTAMP WITH TIME ZONE
         );
 
+        ALTER TABLE workflow_states ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 1;
+        ALTER TABLE workflow_states ADD COLUMN IF NOT EXISTS checkpoint JSONB;
+        ALTER TABLE workflow_states ADD COLUMN IF NOT EXISTS lease_owner VARCHAR(255);
+        ALTER TABLE workflow_states ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP WITH TIME ZONE;
+
         CREATE TABLE IF NOT EXISTS workflow_step_results (
             id SERIAL PRIMARY KEY,
             workflow_id VARCHAR(255) REFERENCES workflow_states(workflow_id),
@@ -102,68 +199,161 @@ class StateManager:
         );
 
         CREATE INDEX IF NOT EXISTS idx_workflow_states_status ON workflow_states(current_state);
+        CREATE INDEX IF NOT EXISTS idx_workflow_states_recovery ON workflow_states(service, current_state)
+            WHERE current_state IN ('running', 'retry');
         CREATE INDEX IF NOT EXISTS idx_workflow_states_updated ON workflow_states(updated_at);
+        -- Listings page on created_at, which unlike updated_at never changes
+        DROP INDEX IF EXISTS idx_workflow_states_listing;
+        DROP INDEX IF EXISTS idx_workflow_states_state_listing;
+        DROP INDEX IF EXISTS idx_workflow_states_service_listing;
+        CREATE INDEX IF NOT EXISTS idx_workflow_states_created_listing
+            ON workflow_states(created_at DESC, workflow_id DESC);
+        CREATE INDEX IF NOT EXISTS idx_workflow_states_state_created_listing
+            ON workflow_states(current_state, created_at DESC, workflow_id DESC);
+        CREATE INDEX IF NOT EXISTS idx_workflow_states_service_created_listing
+            ON workflow_states(service, created_at DESC, workflow_id DESC);
         CREATE INDEX IF NOT EXISTS idx_step_results_workflow ON workflow_step_results(workflow_id);
         CREATE INDEX IF NOT EXISTS idx_events_workflow ON workflow_events(workflow_id);
         """
 
         try:
-            with self.postgres_conn.cursor() as cur:
-                cur.execute(create_tables_sql)
-            self.postgres_conn.commit()
+            with self._postgres_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(create_tables_sql)
             print("✅ Database tables initialized")
 
         except Exception as e:
             print(f"❌ Database initialization failed: {e}")
 
     def store_workflow_state(self, workflow_id: str, rule_name: str, service: str,
-                           current_state: str, context: Dict[str, Any]) -> bool:
-        """Store workflow state in persistent storage."""
-        if not self.postgres_conn:
+                           current_state: str, context: Dict[str, Any],
+                           checkpoint: Optional[Dict[str, Any]] = None) -> bool:
+        """Store workflow state in persistent storage and write through to the cache.
+
+        ``checkpoint`` (resume position and step results) replaces the stored
+        one when given; it is kept out of the cache. Checkpoint writes also
+        take or renew this instance's lease on the workflow, and raise
+        LeaseLostError if another instance holds an unexpired lease.
+        """
+        if not self.postgres_pool:
             return self._store_workflow_state_fallback(workflow_id, rule_name, service, current_state, context)
 
         try:
-            with self.postgres_conn.cursor() as cur:
-                # UPSERT workflow state
-                cur.execute("""
-                    INSERT INTO workflow_states (workflow_id, rule_name, service, current_state, context, updated_at)
-                    VALUES (%s, %s, %s, %s, %s, NOW())
+            with self._postgres_connection() as conn, conn.cursor() as cur:
+                # UPSERT workflow state; every write bumps the version. Finished
+                # workflows keep their owner but their lease no longer expires.
+                cur.execute(f"""
+                    INSERT INTO workflow_states
+                    (workflow_id, rule_name, service, current_state, context, checkpoint,
+                     lease_owner, lease_expires_at, updated_at)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s,
+                            CASE WHEN %s THEN NOW() + make_interval(secs => %s) END, NOW())
                     ON CONFLICT (workflow_id)
                     DO UPDATE SET
                         current_state = EXCLUDED.current_state,
                         context = EXCLUDED.context,
+                        checkpoint = COALESCE(EXCLUDED.checkpoint, workflow_states.checkpoint),
+                        lease_owner = COALESCE(EXCLUDED.lease_owner, workflow_states.lease_owner),
+                        lease_expires_at = CASE
+                            WHEN EXCLUDED.checkpoint IS NULL THEN workflow_states.lease_expires_at
+                            WHEN EXCLUDED.current_state IN ('success', 'failed', 'cancelled') THEN NULL
+                            ELSE EXCLUDED.lease_expires_at
+                        END,
                         updated_at = NOW(),
+                        version = workflow_states.version + 1,
                         completed_at = CASE
                             WHEN EXCLUDED.current_state IN ('success', 'failed', 'cancelled')
                             THEN NOW()
                             ELSE workflow_states.completed_at
                         END
-                """, (workflow_id, rule_name, service, current_state, Json(context)))
-
-            self.postgres_conn.commit()
-
-            # Also cache in Redis for fast access
-            if self.redis_client:
-                cache_key = f"workflow_state:{workflow_id}"
-                self.redis_client.setex(
-                    cache_key,
-                    timedelta(hours=24),
-                    json.dumps({
-                        "workflow_id": workflow_id,
-                        "rule_name": rule_name,
-                        "service": service,
-                        "current_state": current_state,
-                        "context": context,
-                        "timestamp": datetime.utcnow().isoformat()
-                    })
-                )
-
+                    WHERE EXCLUDED.checkpoint IS NULL
+                        OR workflow_states.lease_owner IS NULL
+                        OR workflow_states.lease_owner = EXCLUDED.lease_owner
+                        OR workflow_states.lease_expires_at < NOW()
+                    RETURNING {STATE_COLUMNS}
+                """, (workflow_id, rule_name, service, current_state, Json(context),
+                      Json(checkpoint, dumps=_dumps_lenient) if checkpoint is not None else None,
+                      self.instance_id if checkpoint is not None else None,
+                      checkpoint is not None, self.lease_seconds))
+                row = cur.fetchone()
+                if row is None:
+                    raise LeaseLostError("Workflow is leased by another instance", workflow_id=workflow_id)
+                state = self._row_to_state(row)
+
+            self._cache_states([state])
             return True
 
+        except LeaseLostError:
+            raise
+
         except Exception as e:
             print(f"Failed to store workflow state: {e}")
             return False
 
+    def save_checkpoint(self, checkpoint: Dict[str, Any]) -> bool:
+        """Persist a workflow runner checkpoint together with the workflow state.
+
+        Renews this instance's lease on the workflow; raises LeaseLostError
+        if another instance has claimed it.
+        """
+        resume_point = {key: value for key, value in checkpoint.items()
+                        if key not in ("workflow_id", "rule_name", "service", "state", "context")}
+        return self.store_workflow_state(
+            checkpoint["workflow_id"], checkpoint["rule_name"], checkpoint["service"],
+            checkpoint["state"], checkpoint["context"], checkpoint=resume_point
+        )
+
+    def load_checkpoints(self, service: str, states: tuple = ("running", "retry")) -> List[Dict[str, Any]]:
+        """Claim unfinished workflows of a service for recovery and return their checkpoints.
+
+        A workflow is claimed only once its lease has expired, so workflows
+        still running on a live replica are left alone. The running replica
+        renews its lease at every checkpoint, so WORKFLOW_LEASE_SECONDS must
+        exceed the longest step timeout plus the longest retry backoff. Rows
+        from before leases existed are claimed once idle that long. Claims use
+        SKIP LOCKED, so replicas recovering together don't claim the same row.
+        """
+        if not self.postgres_pool:
+            return []
+
+        try:
+            with self._postgres_connection() as conn, conn.cursor() as cur:
+                cur.execute(f"""
+                    UPDATE workflow_states
+                    SET lease_owner = %s,
+                        lease_expires_at = NOW() + make_interval(secs => %s),
+                        updated_at = NOW(),
+                        version = version + 1
+                    WHERE workflow_id IN (
+                        SELECT workflow_id FROM workflow_states
+                        WHERE service = %s
+                        AND current_state = ANY(%s)
+                        AND checkpoint IS NOT NULL
+                        AND (lease_expires_at < NOW()
+                             OR (lease_expires_at IS NULL
+                                 AND updated_at < NOW() - make_interval(secs => %s)))
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING {STATE_COLUMNS}, checkpoint
+                """, (self.instance_id, self.lease_seconds, service, list(states), self.lease_seconds))
+                rows = cur.fetchall()
+
+            # The claim is a write; push the new version so cached reads don't go stale
+            self._cache_states([self._row_to_state(row) for row in rows])
+
+            return [{
+                **(row[9] or {}),
+                "workflow_id": row[0],
+                "rule_name": row[1],
+                "service": row[2],
+                "state": row[3],
+                "context": row[4] or {}
+            } for row in rows]
+
+        except Exception as e:
+            print(f"Failed to load workflow checkpoints: {e}")
+            return []
+
     def _store_workflow_state_fallback(self, workflow_id: str, rule_name: str, service: str,
                                      current_state: str, context: Dict[str, Any]) -> bool:
         """Fallback storage using only Redis."""
@@ -171,16 +361,21 @@ class StateManager:
             return False
 
         try:
-            cache_key = f"workflow_state:{workflow_id}"
             state_data = {
                 "workflow_id": workflow_id,
                 "rule_name": rule_name,
                 "service": service,
                 "current_state": current_state,
                 "context": context,
-                "timestamp": datetime.utcnow().isoformat()
+                "updated_at": datetime.utcnow().isoformat()
             }
-            self.redis_client.setex(cache_key, timedelta(days=7), json.dumps(state_data))
+            # Without PostgreSQL the cache entry is the record, so bump its version in place
+            pipe = self.redis_client.pipeline(transaction=True)
+            cache_key = self._cache_key(workflow_id)
+            pipe.hincrby(cache_key, "version", 1)
+            pipe.hset(cache_key, "data", json.dumps(state_data))
+            pipe.expire(cache_key, timedelta(days=7))
+            pipe.execute()
             return True
 
         except Exception as e:
@@ -189,60 +384,119 @@ class StateManager:
 
     def get_workflow_state(self, workflow_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve workflow state from storage."""
-        # Try Redis cache first
-        if self.redis_client:
+        return self.get_workflow_states([workflow_id]).get(workflow_id)
+
+    def get_workflow_states(self, workflow_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Retrieve several workflow states with one cache round trip and one query."""
+        states: Dict[str, Dict[str, Any]] = {}
+        missing = list(dict.fromkeys(workflow_ids))
+
+        # Try Redis cache first, pipelined across all IDs
+        if self.redis_client and missing:
             try:
-                cache_key = f"workflow_state:{workflow_id}"
-                cached_data = self.redis_client.get(cache_key)
-                if cached_data:
-                    return json.loads(cached_data)
+                pipe = self.redis_client.pipeline(transaction=False)
+                for workflow_id in missing:
+                    pipe.hmget(self._cache_key(workflow_id), "version", "data")
+                cached = pipe.execute()
+
+                still_missing = []
+                for workflow_id, (version, data) in zip(missing, cached):
+                    if version == "0":
+                        self.cache_stats["negative_hits"] += 1
+                    elif data is not None:
+                        self.cache_stats["hits"] += 1
+                        states[workflow_id] = json.loads(data)
+                    else:
+                        self.cache_stats["misses"] += 1
+                        still_missing.append(workflow_id)
+                missing = still_missing
+
             except Exception as e:
                 print(f"Redis cache read failed: {e}")
 
-        # Fallback to PostgreSQL
-        if self.postgres_conn:
+        # Fallback to PostgreSQL, repopulating the cache from what we find
+        if self.postgres_pool and missing:
             try:
-                with self.postgres_conn.cursor() as cur:
-                    cur.execute("""
-                        SELECT workflow_id, rule_name, service, current_state, context,
-                               created_at, updated_at, completed_at
+                with self._postgres_connection() as conn, conn.cursor() as cur:
+                    cur.execute(f"""
+                        SELECT {STATE_COLUMNS}
                         FROM workflow_states
-                        WHERE workflow_id = %s
-                    """, (workflow_id,))
-                    row = cur.fetchone()
-                    if row:
-                        return {
-                            "workflow_id": row[0],
-                            "rule_name": row[1],
-                            "service": row[2],
-                            "current_state": row[3],
-                            "context": row[4],
-                            "created_at": row[5].isoformat() if row[5] else None,
-                            "updated_at": row[6].isoformat() if row[6] else None,
-                            "completed_at": row[7].isoformat() if row[7] else None
-                        }
+                        WHERE workflow_id = ANY(%s)
+                    """, (missing,))
+                    found = [self._row_to_state(row) for row in cur.fetchall()]
+
+                for state in found:
+                    states[state["workflow_id"]] = state
+                self._cache_states(found, [wid for wid in missing if wid not in states])
+
             except Exception as e:
                 print(f"PostgreSQL read failed: {e}")
 
-        return None
+        return states
+
+    def _cache_key(self, workflow_id: str) -> str:
+        """Redis key holding the cached state hash for a workflow."""
+        return f"workflow_state:{workflow_id}"
+
+    def _cache_states(self, states: List[Dict[str, Any]], unknown_ids: List[str] = ()) -> None:
+        """Write states (and negative markers) to the cache in one pipelined round trip.
+
+        Writes are compare-and-set on version, so a reader repopulating from an
+        older PostgreSQL row can never overwrite a newer write-through.
+        """
+        if not self.redis_client or not (states or unknown_ids):
+            return
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for state in states:
+                self.cache_cas(
+                    keys=[self._cache_key(state["workflow_id"])],
+                    args=[state["version"], json.dumps(state), self.cache_ttl],
+                    client=pipe
+                )
+            for workflow_id in unknown_ids:
+                self.cache_cas(
+                    keys=[self._cache_key(workflow_id)],
+                    args=[0, "", self.negative_cache_ttl],
+                    client=pipe
+                )
+            self.cache_stats["stale_writes_rejected"] += pipe.execute().count(0)
+
+        except Exception as e:
+            print(f"Redis cache write failed: {e}")
+            # Drop entries we could not update rather than leave them stale
+            try:
+                self.redis_client.delete(*[self._cache_key(state["workflow_id"]) for state in states])
+            except Exception:
+                pass
+
+    def _row_to_state(self, row: tuple) -> Dict[str, Any]:
+        """Convert a workflow_states row selected with STATE_COLUMNS to a dict."""
+        return {
+            "workflow_id": row[0],
+            "rule_name": row[1],
+            "service": row[2],
+            "current_state": row[3],
+            "context": row[4],
+            "created_at": row[5].isoformat() if row[5] else None,
+            "updated_at": row[6].isoformat() if row[6] else None,
+            "completed_at": row[7].isoformat() if row[7] else None,
+            "version": row[8]
+        }
 
     def store_step_result(self, workflow_id: str, step_name: str, step_action: str,
                          status: str, result: Dict[str, Any] = None,
                          error_message: str = None, duration_ms: int = 0) -> bool:
-        """Store workflow step execution result."""
-        if not self.postgres_conn:
+        """Queue workflow step execution result for batched insert."""
+        if not self.write_batcher:
             return False
 
         try:
-            with self.postgres_conn.cursor() as cur:
-                cur.execute("""
-                    INSERT INTO workflow_step_results
-                    (workflow_id, step_name, step_action, status, result, error_message, duration_ms)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """, (workflow_id, step_name, step_action, status,
-                      Json(result) if result else None, error_message, duration_ms))
-
-            self.postgres_conn.commit()
+            self.write_batcher.add("workflow_step_results", (
+                workflow_id, step_name, step_action, status,
+                Json(result) if result else None, error_message, duration_ms
+            ))
             return True
 
         except Exception as e:
@@ -251,18 +505,12 @@ class StateManager:
 
     def store_workflow_event(self, workflow_id: str, event_type: str,
                            event_data: Dict[str, Any]) -> bool:
-        """Store workflow event."""
-        if not self.postgres_conn:
+        """Queue workflow event for batched insert."""
+        if not self.write_batcher:
             return False
 
         try:
-            with self.postgres_conn.cursor() as cur:
-                cur.execute("""
-                    INSERT INTO workflow_events (workflow_id, event_type, event_data)
-                    VALUES (%s, %s, %s)
-                """, (workflow_id, event_type, Json(event_data)))
-
-            self.postgres_conn.commit()
+            self.write_batcher.add("workflow_events", (workflow_id, event_type, Json(event_data)))
             return True
 
         except Exception as e:
@@ -271,11 +519,11 @@ class StateManager:
 
     def get_workflows_by_state(self, state: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Get workflows in specific state."""
-        if not self.postgres_conn:
+        if not self.postgres_pool:
             return []
 
         try:
-            with self.postgres_conn.cursor() as cur:
+            with self._postgres_connection() as conn, conn.cursor() as cur:
                 cur.execute("""
                     SELECT workflow_id, rule_name, service, current_state, context,
                            created_at, updated_at
@@ -300,13 +548,87 @@ class StateManager:
             print(f"Failed to get workflows by state: {e}")
             return []
 
+    def _listing_filters(self, state: Optional[str], service: Optional[str]) -> Tuple[List[str], List[Any]]:
+        """Build WHERE clauses for a workflow listing."""
+        clauses, params = [], []
+        if state:
+            clauses.append("current_state = %s")
+            params.append(state)
+        if service:
+            clauses.append("service = %s")
+            params.append(service)
+        return clauses, params
+
+    def list_workflow_states(self, state: Optional[str] = None, service: Optional[str] = None,
+                             limit: int = 50, cursor: Optional[str] = None
+                             ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get one page of workflows, newest first.
+
+        Pages are keyset-paginated on (created_at, workflow_id), so each page is
+        an index range scan no matter how deep it is, and a workflow never moves
+        between pages as it progresses. Returns the page and the cursor for the
+        next one (None on the last page).
+        """
+        if not self.postgres_pool:
+            return [], None
+
+        clauses, params = self._listing_filters(state, service)
+        if cursor:
+            clauses.append("(created_at, workflow_id) < (%s, %s)")
+            params.extend(decode_list_cursor(cursor))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._postgres_connection() as conn, conn.cursor() as cur:
+            # One extra row tells us whether another page exists
+            cur.execute(f"""
+                SELECT {LIST_COLUMNS}
+                FROM workflow_states
+                {where}
+                ORDER BY created_at DESC, workflow_id DESC
+                LIMIT %s
+            """, (*params, limit + 1))
+            rows = cur.fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_list_cursor(rows[-1][4], rows[-1][0])
+
+        return [self._list_row_to_dict(row) for row in rows], next_cursor
+
+    def iter_workflow_states(self, state: Optional[str] = None, service: Optional[str] = None,
+                             batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Stream every matching workflow, ``batch_size`` rows at a time.
+
+        Each batch is a keyset page read in its own short connection checkout,
+        so memory stays flat and a slow reader never holds a pooled connection.
+        """
+        cursor = None
+        while True:
+            workflows, cursor = self.list_workflow_states(state, service, batch_size, cursor)
+            yield from workflows
+            if cursor is None:
+                return
+
+    def _list_row_to_dict(self, row: tuple) -> Dict[str, Any]:
+        """Convert a workflow_states row selected with LIST_COLUMNS to a dict."""
+        return {
+            "workflow_id": row[0],
+            "rule_name": row[1],
+            "service": row[2],
+            "status": row[3],
+            "start_time": row[4].isoformat() if row[4] else None,
+            "updated_at": row[5].isoformat() if row[5] else None,
+            "completed_at": row[6].isoformat() if row[6] else None
+        }
+
     def cleanup_old_workflows(self, days: int = 30) -> int:
         """Clean up old completed workflows."""
-        if not self.postgres_conn:
+        if not self.postgres_pool:
             return 0
 
         try:
-            with self.postgres_conn.cursor() as cur:
+            with self._postgres_connection() as conn, conn.cursor() as cur:
                 # Delete old completed workflows
                 cur.execute("""
                     DELETE FROM workflow_states
@@ -326,7 +648,6 @@ class StateManager:
                     WHERE published_at < NOW() - INTERVAL '%s days'
                 """, (days,))
 
-            self.postgres_conn.commit()
             return deleted_count
 
         except Exception as e:
@@ -347,9 +668,9 @@ class StateManager:
                 pass
 
         # Check PostgreSQL
-        if self.postgres_conn:
+        if self.postgres_pool:
             try:
-                with self.postgres_conn.cursor() as cur:
+                with self._postgres_connection() as conn, conn.cursor() as cur:
                     cur.execute("SELECT 1")
                 postgres_healthy = True
             except:
@@ -366,10 +687,19 @@ class StateManager:
         """Get state manager metrics."""
         metrics = {
             "redis_connected": self.redis_client is not None,
-            "postgres_connected": self.postgres_conn is not None,
+            "postgres_connected": self.postgres_pool is not None,
             "health": self.health_check()
         }
 
+        if self.redis_client:
+            metrics["state_cache"] = dict(self.cache_stats)
+
+        if self.write_batcher:
+            metrics["write_batcher"] = {
+                "pending_rows": self.write_batcher.pending_count(),
+                **self.write_batcher.stats
+            }
+
         if self.redis_client:
             try:
                 info = self.redis_client.info()
@@ -378,9 +708,9 @@ class StateManager:
             except:
                 pass
 
-        if self.postgres_conn:
+        if self.postgres_pool:
             try:
-                with self.postgres_conn.cursor() as cur:
+                with self._postgres_connection() as conn, conn.cursor() as cur:
                     # Count workflows by state
                     cur.execute("""
                         SELECT current_state, COUNT(*)
@@ -400,4 +730,20 @@ class StateManager:
             except Exception as e:
                 metrics["postgres_error"] = str(e)
 
-        return metrics
\ No newline at end of file
+        return metrics
+
+    def flush(self) -> int:
+        """Flush buffered step results and events immediately."""
+        if not self.write_batcher:
+            return 0
+        return self.write_batcher.flush()
+
+    def close(self) -> None:
+        """Flush pending writes and close all pooled connections."""
+        if self.write_batcher:
+            self.write_batcher.close()
+            self.write_batcher = None
+
+        if self.postgres_pool:
+            self.postgres_pool.closeall()
+            self.postgres_pool = None
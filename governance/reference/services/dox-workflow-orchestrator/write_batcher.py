@@ -0,0 +1,130 @@
+"""
+Write-behind batcher for Orchestrator persistence.
+
+Buffers append-only rows (step results, workflow events) and flushes them
+as multi-row INSERTs with a bounded flush latency.
+"""
+
+import threading
+from typing import Dict, Any, List, Tuple, Callable, ContextManager
+import logging
+
+from psycopg2.extras import execute_values
+
+
+# Insert statements for each buffered table; rows must match the column order
+BATCH_INSERTS = {
+    "workflow_step_results": """
+        INSERT INTO workflow_step_results
+        (workflow_id, step_name, step_action, status, result, error_message, duration_ms)
+        VALUES %s
+    """,
+    "workflow_events": """
+        INSERT INTO workflow_events (workflow_id, event_type, event_data)
+        VALUES %s
+    """
+}
+
+
+class WriteBehindBatcher:
+    """Groups buffered rows per table and writes them in few round trips."""
+
+    def __init__(self, connection_factory: Callable[[], ContextManager], config: Dict[str, Any]):
+        """Initialize batcher.
+
+        ``connection_factory`` returns a context manager yielding a pooled
+        connection that commits on success and rolls back on error.
+        """
+        self.connection_factory = connection_factory
+        self.logger = logging.getLogger(__name__)
+        self.batch_size = int(config.get("WRITE_BATCH_SIZE", 500))
+        self.flush_interval = int(config.get("WRITE_FLUSH_INTERVAL_MS", 200)) / 1000.0
+        self.max_pending = int(config.get("WRITE_MAX_PENDING", 10000))
+        self._pending: Dict[str, List[Tuple]] = {table: [] for table in BATCH_INSERTS}
+        self._pending_count = 0
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._stopped = False
+        self.stats = {"rows_written": 0, "batches_written": 0, "rows_dropped": 0}
+        self._thread = threading.Thread(target=self._run, name="postgres-write-behind", daemon=True)
+        self._thread.start()
+
+    def add(self, table: str, row: Tuple) -> None:
+        """Buffer a row for the given table."""
+        with self._condition:
+            self._pending[table].append(row)
+            self._pending_count += 1
+            over_limit = self._pending_count >= self.max_pending
+            if self._pending_count >= self.batch_size:
+                self._condition.notify()
+
+        # Backpressure: writers flush inline instead of growing the buffer
+        if over_limit:
+            self.flush()
+
+    def _run(self) -> None:
+        """Flush whenever a batch fills up or the flush interval elapses."""
+        while True:
+            with self._condition:
+                if not self._stopped and self._pending_count < self.batch_size:
+                    self._condition.wait(self.flush_interval)
+                stopped = self._stopped
+
+            self.flush()
+
+            if stopped:
+                return
+
+    def flush(self) -> int:
+        """Write all buffered rows now; returns the number of rows written."""
+        with self._flush_lock:
+            with self._condition:
+                batches = {table: rows for table, rows in self._pending.items() if rows}
+                self._pending = {table: [] for table in BATCH_INSERTS}
+                self._pending_count = 0
+
+            written = 0
+            for table, rows in batches.items():
+                written += self._write_rows(table, rows)
+            return written
+
+    def _write_rows(self, table: str, rows: List[Tuple]) -> int:
+        """Write rows as multi-row INSERTs, isolating bad rows on failure."""
+        statement = BATCH_INSERTS[table]
+
+        try:
+            with self.connection_factory() as conn:
+                with conn.cursor() as cur:
+                    execute_values(cur, statement, rows, page_size=self.batch_size)
+            self.stats["rows_written"] += len(rows)
+            self.stats["batches_written"] += 1
+            return len(rows)
+
+        except Exception as e:
+            self.logger.error(f"Batched insert into {table} failed, retrying row by row: {e}")
+
+        # One bad row (e.g. unknown workflow_id) must not drop the whole batch
+        written = 0
+        for row in rows:
+            try:
+                with self.connection_factory() as conn:
+                    with conn.cursor() as cur:
+                        execute_values(cur, statement, [row])
+                written += 1
+            except Exception as e:
+                self.stats["rows_dropped"] += 1
+                self.logger.error(f"Dropping row for {table}: {e}")
+
+        self.stats["rows_written"] += written
+        return written
+
+    def pending_count(self) -> int:
+        """Number of rows waiting to be flushed."""
+        return self._pending_count
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Flush remaining rows and stop the background thread."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join(timeout)
@@ -0,0 +1,24 @@
+"""Tests for the workflow orchestrator's request coalescing."""
+
+import importlib.util
+from pathlib import Path
+
+# Service directories aren't importable package names, so load the module by path
+_spec = importlib.util.spec_from_file_location(
+    "coalescing",
+    Path(__file__).resolve().parent.parent / "services" / "dox-workflow-orchestrator" / "coalescing.py"
+)
+coalescing = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(coalescing)
+
+
+def test_leader_mutation_does_not_leak_into_cache():
+    flight = coalescing.SingleFlight(cache_ttl=60)
+
+    leader_result = flight.do("key", lambda: {"status": "ok", "items": [1]})
+    leader_result["status"] = "mutated"
+    leader_result["items"].append(2)
+
+    cached = flight.do("key", lambda: {"status": "fresh"})
+    assert cached == {"status": "ok", "items": [1]}
+    assert flight.get_statistics()["cache_hits"] == 1